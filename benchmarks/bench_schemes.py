@@ -0,0 +1,59 @@
+"""
+Сравнивает схемы подписи: генерацию ключей, подпись, проверку и размер подписи.
+
+Запуск из корневой директории проекта:
+
+    python benchmarks/bench_schemes.py [--iterations N] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import SIGNATURE_SCHEMES
+
+MESSAGE = b"0" * 64 # Размер hex SHA256, который подписывает Transaction
+
+
+def _rate(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return iterations / (time.perf_counter() - started)
+
+
+def bench_scheme(scheme, iterations: int) -> dict:
+    private_key, public_key = scheme.generate_keys()
+    signature = scheme.sign(private_key, MESSAGE)
+    # Генерация RSA ключей на порядки медленнее, поэтому число итераций ограничено.
+    keygen_iterations = max(1, iterations // 20) if scheme.name == "rsa-pss" else iterations
+    return {
+        "scheme": scheme.name,
+        "keygen_per_sec": _rate(scheme.generate_keys, keygen_iterations),
+        "sign_per_sec": _rate(lambda: scheme.sign(private_key, MESSAGE), iterations),
+        "verify_per_sec": _rate(lambda: scheme.verify(public_key, signature, MESSAGE), iterations),
+        "signature_bytes": len(signature),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="вывести результаты в JSON")
+    args = parser.parse_args()
+
+    results = [bench_scheme(scheme, args.iterations) for scheme in SIGNATURE_SCHEMES.values()]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'схема':<18}{'keygen/с':>12}{'sign/с':>12}{'verify/с':>12}{'подпись, Б':>12}")
+    for result in results:
+        print(f"{result['scheme']:<18}{result['keygen_per_sec']:>12.0f}{result['sign_per_sec']:>12.0f}"
+              f"{result['verify_per_sec']:>12.0f}{result['signature_bytes']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Измеряет устойчивую скорость вставки в SQLiteTransactionStore и время запросов по индексам.
+
+Запуск из корневой директории проекта:
+
+    python benchmarks/bench_sqlite.py [--transactions N] [--batch-size N] [--path FILE] [--json]
+
+Каждая транзакция содержит --inputs входов и --outputs выходов, поэтому при
+значениях по умолчанию (1 000 000 транзакций, 2 входа, 2 выхода) в таблицы
+записывается 5 миллионов строк. Скорость выводится по каждой десятой части
+данных, чтобы было видно, сохраняется ли она по мере роста индексов.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    SQLiteTransactionStore, Transaction, TransactionInput, TransactionOutput
+)
+
+DEFAULT_SEED = 1234
+ADDRESS_COUNT = 10_000
+
+
+def make_batch(rng: random.Random, start: int, count: int, n_inputs: int, n_outputs: int):
+    """
+    Синтетические транзакции через доверенный путь: tx_id задается явно,
+    чтобы замер не включал хеширование. Входы ссылаются на выходы
+    предыдущих транзакций.
+    """
+    batch = []
+    for number in range(start, start + count):
+        inputs = [TransactionInput.from_trusted(format(rng.randrange(max(number, 1)), '064x'), rng.randrange(n_outputs))
+                  for _ in range(n_inputs)] if number else []
+        outputs = [TransactionOutput.from_units(f"addr_{rng.randrange(ADDRESS_COUNT)}", rng.randrange(1, 10**10))
+                   for _ in range(n_outputs)]
+        batch.append(Transaction.from_trusted(inputs, outputs, 1678886400.0 + number,
+                                              signature=b"\x00" * 256, tx_id=format(number, '064x')))
+    return batch
+
+
+def run(path: str, transactions: int, batch_size: int, n_inputs: int, n_outputs: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rows_per_tx = 1 + n_inputs + n_outputs
+    report_every = max(batch_size, transactions // 10)
+    segments = []
+    insert_seconds = 0.0
+    segment_seconds = 0.0
+    segment_rows = 0
+
+    with SQLiteTransactionStore(path) as store:
+        for start in range(0, transactions, batch_size):
+            batch = make_batch(rng, start, min(batch_size, transactions - start), n_inputs, n_outputs)
+            started = time.perf_counter()
+            store.add_many(batch)
+            seconds = time.perf_counter() - started
+            insert_seconds += seconds
+            segment_seconds += seconds
+            segment_rows += len(batch) * rows_per_tx
+            done = start + len(batch)
+            if done % report_every < batch_size or done == transactions:
+                segments.append({"transactions": done, "rows_per_sec": segment_rows / segment_seconds})
+                print(f"{done:>10} транзакций: {segment_rows / segment_seconds:>12.0f} строк/с", file=sys.stderr)
+                segment_seconds = 0.0
+                segment_rows = 0
+
+        lookups = 1000
+        started = time.perf_counter()
+        for _ in range(lookups):
+            store.spender_of(format(rng.randrange(transactions), '064x'), rng.randrange(n_outputs))
+        spender_ms = (time.perf_counter() - started) / lookups * 1000
+        started = time.perf_counter()
+        for _ in range(lookups // 10):
+            store.unspent_outputs(f"addr_{rng.randrange(ADDRESS_COUNT)}")
+        unspent_ms = (time.perf_counter() - started) / (lookups // 10) * 1000
+
+    total_rows = transactions * rows_per_tx
+    return {
+        "transactions": transactions,
+        "rows": total_rows,
+        "insert_seconds": insert_seconds,
+        "rows_per_sec": total_rows / insert_seconds if insert_seconds > 0 else 0.0,
+        "segments": segments,
+        "spender_of_ms": spender_ms,
+        "unspent_outputs_ms": unspent_ms,
+        "database_mb": os.path.getsize(path) / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--inputs", type=int, default=2)
+    parser.add_argument("--outputs", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--path", help="файл базы (по умолчанию временный)")
+    parser.add_argument("--json", action="store_true", help="вывести результат в JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path or os.path.join(directory, "bench.db")
+        result = run(path, args.transactions, args.batch_size, args.inputs, args.outputs, args.seed)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Вставлено {result['rows']} строк за {result['insert_seconds']:.1f} с: "
+              f"{result['rows_per_sec']:.0f} строк/с")
+        print(f"spender_of: {result['spender_of_ms']:.3f} мс, unspent_outputs: {result['unspent_outputs_ms']:.3f} мс")
+        print(f"Размер базы: {result['database_mb']:.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
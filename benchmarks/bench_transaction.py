@@ -0,0 +1,264 @@
+"""
+Набор бенчмарков Transaction: создание, хеширование, подпись, проверка и сериализация.
+
+Запуск из корневой директории проекта:
+
+    python benchmarks/bench_transaction.py --output results.json
+    python benchmarks/bench_transaction.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_transaction.py --baseline benchmarks/baseline.json --threshold 0.15
+
+Размеры задаются параметрами --io-sizes (число входов и выходов в транзакции,
+1..1000) и --batch-sizes (число транзакций в пакете, 1..1000000). Данные
+генерируются с фиксированным seed, ключи создаются до начала замеров.
+Каждая запись измеряется как в timeit: число вызовов в серии подбирается так,
+чтобы серия длилась не меньше --min-time секунд, выполняется --repeat серий,
+и в результат попадает медиана времени одного вызова.
+При сравнении с базовой линией результаты, ставшие медленнее более чем на
+threshold, выводятся как регрессии, и скрипт завершается с кодом 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, Signer, sign_many,
+    generate_rsa_keys, serialize_private_key, serialize_public_key, verification_cache
+)
+
+DEFAULT_SEED = 1234
+DEFAULT_IO_SIZES = "1,10,100,1000"
+DEFAULT_BATCH_SIZES = "1,100,10000"
+# Подпись и проверка RSA слишком медленны для пакетов в миллион транзакций.
+MAX_CRYPTO_BATCH = 10_000
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.2
+
+
+class Fixture:
+    """Заранее сгенерированные ключи и детерминированные данные транзакций."""
+    def __init__(self, seed: int):
+        self.seed = seed
+        private_key, public_key = generate_rsa_keys()
+        self.private_pem = serialize_private_key(private_key)
+        self.public_pem = serialize_public_key(public_key)
+        self.recipients = [serialize_public_key(generate_rsa_keys()[1]) for _ in range(4)]
+
+    def make_transaction(self, rng: random.Random, n_io: int) -> Transaction:
+        inputs = [TransactionInput(format(rng.getrandbits(256), '064x'), rng.randrange(16))
+                  for _ in range(n_io)]
+        outputs = [TransactionOutput(rng.choice(self.recipients), rng.randrange(1, 10**6) / 100)
+                   for _ in range(n_io)]
+        return Transaction(inputs, outputs, timestamp=1678886400.0 + rng.randrange(10**6))
+
+    def make_batch(self, n_io: int, count: int) -> List[Transaction]:
+        rng = random.Random(self.seed)
+        return [self.make_transaction(rng, n_io) for _ in range(count)]
+
+
+def _measure(function: Callable[[], None], repeat: int, min_time: float) -> Dict:
+    """
+    Подбирает число вызовов в серии (1, 2, 5, 10, 20, ...), при котором серия
+    длится не меньше min_time, затем выполняет repeat серий. Возвращает
+    медиану, минимум и максимум времени одного вызова и число вызовов в серии.
+    Подбор заодно служит прогревом. Сборщик мусора не отключается: его работа
+    входит в стоимость создания объектов.
+    """
+    timer = timeit.Timer(function, setup="gc.enable()")
+    number = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            if timer.timeit(number * multiplier) >= min_time:
+                number *= multiplier
+                break
+        else:
+            number *= 10
+            continue
+        break
+    samples = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return {
+        "seconds": statistics.median(samples),
+        "min_seconds": min(samples),
+        "max_seconds": max(samples),
+        "number": number,
+    }
+
+
+def run_benchmarks(fixture: Fixture, io_sizes: List[int], batch_sizes: List[int],
+                   repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME) -> List[Dict]:
+    """
+    Кэш проверок подписи отключается на время замеров: иначе повторные запуски
+    verify измеряли бы попадания в кэш. Попадания измеряются отдельными
+    записями verify_cached и batch_verify_cached.
+    """
+    cache_enabled = verification_cache.enabled
+    verification_cache.disable()
+    try:
+        return _run_benchmarks(fixture, io_sizes, batch_sizes, repeat, min_time)
+    finally:
+        if cache_enabled:
+            verification_cache.enable()
+
+
+def _record_cached(record: Callable, name: str, params: Dict, operations: int, function: Callable[[], None]):
+    """Замер с включенным и заранее заполненным кэшем проверок."""
+    verification_cache.enable()
+    try:
+        function()
+        record(name, params, operations, function)
+    finally:
+        verification_cache.disable()
+
+
+def _unsign(transactions: List[Transaction]):
+    """Снимает подписи, чтобы одни и те же транзакции можно было подписать повторно."""
+    for tx in transactions:
+        tx.signature = None
+
+
+def _run_benchmarks(fixture: Fixture, io_sizes: List[int], batch_sizes: List[int],
+                    repeat: int, min_time: float) -> List[Dict]:
+    results = []
+
+    def record(name: str, params: Dict, operations: int, function: Callable[[], None]):
+        timing = _measure(function, repeat, min_time)
+        seconds = timing["seconds"]
+        results.append({
+            "name": name,
+            "params": params,
+            "key": name + "".join(f"[{k}={v}]" for k, v in sorted(params.items())),
+            "operations": operations,
+            **timing,
+            "ops_per_sec": operations / seconds if seconds > 0 else 0.0,
+        })
+        print(f"{results[-1]['key']:<48} {results[-1]['ops_per_sec']:>14.1f} оп/с", file=sys.stderr)
+
+    # Размер транзакции: одна транзакция с n входами и n выходами.
+    for n_io in io_sizes:
+        rng = random.Random(fixture.seed)
+        tx = fixture.make_transaction(rng, n_io)
+        params = {"io": n_io}
+        record("construct", params, 1, lambda: Transaction(tx.inputs, tx.outputs, timestamp=tx.timestamp))
+        record("hash", params, 1, tx._calculate_initial_hash)
+        # Перед каждой подписью подпись снимается; это на порядки дешевле подписи RSA.
+        unsigned = Transaction(tx.inputs, tx.outputs, timestamp=tx.timestamp)
+        record("sign", params, 1, lambda: (_unsign([unsigned]), unsigned.sign(fixture.private_pem)))
+        signed = Transaction(tx.inputs, tx.outputs, timestamp=tx.timestamp)
+        signed.sign(fixture.private_pem)
+        record("verify", params, 1, lambda: signed.verify_signature(fixture.public_pem))
+        _record_cached(record, "verify_cached", params, 1, lambda: signed.verify_signature(fixture.public_pem))
+        tx_dict = signed.to_dict()
+        record("to_dict", params, 1, signed.to_dict)
+        record("from_dict", params, 1, lambda: Transaction.from_dict(tx_dict))
+        tx_bytes = signed.to_bytes()
+        record("to_bytes", params, 1, signed.to_bytes)
+        record("from_bytes", params, 1, lambda: Transaction.from_bytes(tx_bytes))
+
+    # Размер пакета: count транзакций с одним входом и одним выходом.
+    for count in batch_sizes:
+        batch = fixture.make_batch(1, count)
+        params = {"batch": count}
+        record("batch_construct", params, count,
+               lambda: [Transaction(tx.inputs, tx.outputs, timestamp=tx.timestamp) for tx in batch])
+        dicts = [tx.to_dict() for tx in batch]
+        record("batch_from_dict", params, count, lambda: [Transaction.from_dict(d) for d in dicts])
+        record("batch_from_trusted_dict", params, count,
+               lambda: [Transaction.from_trusted_dict(d) for d in dicts])
+        if count <= MAX_CRYPTO_BATCH:
+            unsigned_batch = fixture.make_batch(1, count)
+
+            def sign_batch():
+                _unsign(unsigned_batch)
+                for tx in unsigned_batch:
+                    tx.sign(fixture.private_pem)
+            record("batch_sign", params, count, sign_batch)
+            signer = Signer(fixture.private_pem)
+            record("batch_sign_many", params, count,
+                   lambda: (_unsign(unsigned_batch), sign_many(unsigned_batch, signer)))
+            for tx in batch:
+                if tx.signature is None:
+                    tx.sign(fixture.private_pem)
+            record("batch_verify", params, count,
+                   lambda: [tx.verify_signature(fixture.public_pem) for tx in batch])
+            _record_cached(record, "batch_verify_cached", params, count,
+                           lambda: [tx.verify_signature(fixture.public_pem) for tx in batch])
+    return results
+
+
+def compare_with_baseline(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """Возвращает описания регрессий относительно базовой линии."""
+    baseline_by_key = {result["key"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        reference = baseline_by_key.get(result["key"])
+        if reference is None or reference["ops_per_sec"] <= 0:
+            continue
+        change = result["ops_per_sec"] / reference["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append(f"{result['key']}: {reference['ops_per_sec']:.1f} -> "
+                               f"{result['ops_per_sec']:.1f} оп/с ({change:+.1%})")
+    return regressions
+
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--io-sizes", type=_parse_sizes, default=_parse_sizes(DEFAULT_IO_SIZES))
+    parser.add_argument("--batch-sizes", type=_parse_sizes, default=_parse_sizes(DEFAULT_BATCH_SIZES))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="число серий, из которых берется медиана")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="минимальная длительность одной серии в секундах")
+    parser.add_argument("--output", help="файл для результатов в JSON (по умолчанию stdout)")
+    parser.add_argument("--baseline", help="файл базовой линии для сравнения")
+    parser.add_argument("--save-baseline", help="сохранить результаты как базовую линию")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="допустимое замедление относительно базовой линии (доля)")
+    args = parser.parse_args()
+
+    fixture = Fixture(args.seed)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+        },
+        "results": run_benchmarks(fixture, args.io_sizes, args.batch_sizes, args.repeat, args.min_time),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report["results"], baseline, args.threshold)
+        for regression in regressions:
+            print(f"РЕГРЕССИЯ {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Измеряет память, занимаемую миллионом входов и выходов транзакций.
+
+Запуск из корневой директории проекта:
+
+    python benchmarks/memory_footprint.py [--count N]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import TransactionInput, TransactionOutput
+
+OUTPUTS_PER_TX = 4
+
+
+def measure(count: int) -> dict:
+    # Строки создаются заново для каждого входа, как при разборе JSON или двоичных данных.
+    tx_ids = [format(i // OUTPUTS_PER_TX, '064x').encode('ascii') for i in range(count)]
+    recipient = "-----BEGIN PUBLIC KEY-----\n" + "A" * 400 + "\n-----END PUBLIC KEY-----\n"
+
+    tracemalloc.start()
+    inputs = [TransactionInput(tx_ids[i].decode('ascii'), i % OUTPUTS_PER_TX) for i in range(count)]
+    inputs_bytes = tracemalloc.get_traced_memory()[0]
+    outputs = [TransactionOutput(recipient.encode('ascii').decode('ascii'), 1.5) for _ in range(count)]
+    outputs_bytes = tracemalloc.get_traced_memory()[0] - inputs_bytes
+    tracemalloc.stop()
+
+    assert len(inputs) == len(outputs) == count
+    return {"count": count, "inputs_mb": inputs_bytes / 1e6, "outputs_mb": outputs_bytes / 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+    result = measure(args.count)
+    print(f"{result['count']} входов:  {result['inputs_mb']:.1f} МБ")
+    print(f"{result['count']} выходов: {result['outputs_mb']:.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
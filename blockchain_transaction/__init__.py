@@ -1,21 +1,111 @@
 from .keys import (
     generate_rsa_keys,
+    generate_keys,
     serialize_private_key,
     serialize_public_key,
     deserialize_private_key,
-    deserialize_public_key
+    deserialize_public_key,
+    KeyCache,
+    public_key_cache,
+    private_key_cache,
+    SignatureScheme,
+    RSAPSSScheme,
+    Ed25519Scheme,
+    ECDSASecp256k1Scheme,
+    SIGNATURE_SCHEMES,
+    DEFAULT_SCHEME,
+    get_scheme,
+    scheme_for_key,
+    Signer
 )
+from .address import (
+    AddressRegistry,
+    address_from_public_key,
+    is_fingerprint_address,
+    default_registry
+)
+from .metrics import Instrumentation, metrics
+from .verification_cache import VerificationCache, verification_cache
 from .transaction_input import TransactionInput
-from .transaction_output import TransactionOutput
+from .transaction_output import TransactionOutput, AMOUNT_SCALE, to_units, from_units
 from .transaction import Transaction
+from .parallel import verify_many, iter_verify_many, sign_many, shutdown_pools
+from .utxo import UTXOSet, UndoRecord
+from .archive import ArchiveStats, iter_jsonl, write_jsonl
+from .merkle import MerkleTree
+from .views import TransactionView, TransactionInputView, TransactionOutputView
+from .filters import BloomFilter, CuckooFilter
+from .store import TransactionStore
+from .sqlite_store import SQLiteTransactionStore
+from .keypool import KeyPool
+from .service import ValidationService, ValidationResult, run_load_test
+from .columnar import OutputColumns
+from .batch_validation import BatchReport, TransactionVerdict, dependency_waves, validate_batch_in_waves
+from .graph import TransactionGraph
+from .mempool import Mempool, FeePriority, age_priority, transaction_fee
 
 __all__ = [
     "generate_rsa_keys",
+    "generate_keys",
     "serialize_private_key",
     "serialize_public_key",
     "deserialize_private_key",
     "deserialize_public_key",
+    "KeyCache",
+    "public_key_cache",
+    "private_key_cache",
+    "SignatureScheme",
+    "RSAPSSScheme",
+    "Ed25519Scheme",
+    "ECDSASecp256k1Scheme",
+    "SIGNATURE_SCHEMES",
+    "DEFAULT_SCHEME",
+    "get_scheme",
+    "scheme_for_key",
+    "Signer",
+    "AddressRegistry",
+    "address_from_public_key",
+    "is_fingerprint_address",
+    "default_registry",
+    "Instrumentation",
+    "metrics",
+    "VerificationCache",
+    "verification_cache",
     "TransactionInput",
     "TransactionOutput",
+    "AMOUNT_SCALE",
+    "to_units",
+    "from_units",
     "Transaction",
-]
\ No newline at end of file
+    "verify_many",
+    "iter_verify_many",
+    "sign_many",
+    "shutdown_pools",
+    "UTXOSet",
+    "UndoRecord",
+    "Mempool",
+    "FeePriority",
+    "age_priority",
+    "transaction_fee",
+    "OutputColumns",
+    "BatchReport",
+    "TransactionVerdict",
+    "dependency_waves",
+    "validate_batch_in_waves",
+    "TransactionGraph",
+    "ArchiveStats",
+    "iter_jsonl",
+    "write_jsonl",
+    "MerkleTree",
+    "TransactionView",
+    "TransactionInputView",
+    "TransactionOutputView",
+    "BloomFilter",
+    "CuckooFilter",
+    "TransactionStore",
+    "SQLiteTransactionStore",
+    "KeyPool",
+    "ValidationService",
+    "ValidationResult",
+    "run_load_test",
+]
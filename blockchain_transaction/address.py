@@ -0,0 +1,74 @@
+import hashlib
+import sys
+import threading
+from typing import Dict, Optional
+
+from cryptography.hazmat.primitives import serialization
+
+from .keys import public_key_cache
+
+# Адрес - SHA256 от DER публичного ключа в виде 64 шестнадцатеричных символов.
+ADDRESS_LENGTH = 64
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def is_fingerprint_address(value: str) -> bool:
+    """Проверяет, является ли строка адресом-отпечатком (а не PEM ключом)."""
+    return (isinstance(value, str) and len(value) == ADDRESS_LENGTH
+            and _HEX_DIGITS.issuperset(value))
+
+
+def address_from_public_key(public_key_pem: str) -> str:
+    """Вычисляет адрес-отпечаток: SHA256 от DER представления публичного ключа."""
+    public_key = public_key_cache.get(public_key_pem)
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return sys.intern(hashlib.sha256(der).hexdigest())
+
+
+class AddressRegistry:
+    """
+    Потокобезопасный реестр соответствия адрес -> публичный ключ PEM.
+    Адреса и ключи интернируются, поэтому все выходы на один адрес
+    разделяют одну и ту же строку.
+    """
+    def __init__(self):
+        self._keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, public_key_pem: str) -> str:
+        """Регистрирует публичный ключ и возвращает его адрес."""
+        address = address_from_public_key(public_key_pem)
+        with self._lock:
+            self._keys.setdefault(address, sys.intern(public_key_pem))
+        return address
+
+    def resolve(self, address: str) -> Optional[str]:
+        """Возвращает PEM ключа по адресу или None, если адрес неизвестен."""
+        return self._keys.get(address)
+
+    def resolve_key(self, address_or_pem: str) -> Optional[str]:
+        """
+        Возвращает PEM ключа для адреса-отпечатка; любая другая строка
+        считается PEM и возвращается без изменений.
+        """
+        if is_fingerprint_address(address_or_pem):
+            return self.resolve(address_or_pem)
+        return address_or_pem
+
+    def remove(self, address: str) -> bool:
+        """Удаляет адрес из реестра. Возвращает True, если он там был."""
+        with self._lock:
+            return self._keys.pop(address, None) is not None
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# Общий реестр, используемый Transaction.verify_signature для адресов-отпечатков.
+default_registry = AddressRegistry()
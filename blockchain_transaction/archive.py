@@ -0,0 +1,88 @@
+import gzip
+import io
+import json
+import time
+from typing import IO, Iterable, Iterator, Optional
+
+from .transaction import Transaction
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+class ArchiveStats:
+    """Счетчики потокового чтения или записи архива транзакций."""
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def tx_per_second(self) -> float:
+        """Пропускная способность в транзакциях в секунду."""
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f"ArchiveStats(count={self.count}, seconds={self.seconds:.3f}, "
+                f"tx_per_second={self.tx_per_second:.1f})")
+
+
+def _open_text(path: str, mode: str, compress: Optional[bool], buffer_size: int) -> IO[str]:
+    """
+    Открывает файл архива в текстовом режиме с буферизацией.
+    compress=None включает gzip для файлов с расширением .gz.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        raw = gzip.open(path, mode + "b")
+        raw = io.BufferedReader(raw, buffer_size) if mode == "r" else io.BufferedWriter(raw, buffer_size)
+    else:
+        raw = open(path, mode + "b", buffering=buffer_size)
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="\n")
+
+
+def write_jsonl(path: str, transactions: Iterable[Transaction], compress: Optional[bool] = None,
+                buffer_size: int = DEFAULT_BUFFER_SIZE) -> ArchiveStats:
+    """
+    Записывает транзакции в файл JSONL (одна транзакция to_dict() на строку).
+    Транзакции могут поступать из генератора: в памяти одновременно
+    находится только одна из них. Возвращает статистику записи.
+    """
+    stats = ArchiveStats()
+    started = time.perf_counter()
+    with _open_text(path, "w", compress, buffer_size) as f:
+        for tx in transactions:
+            f.write(json.dumps(tx.to_dict(), separators=(',', ':')))
+            f.write("\n")
+            stats.count += 1
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def iter_jsonl(path: str, trusted: bool = False, compress: Optional[bool] = None,
+               buffer_size: int = DEFAULT_BUFFER_SIZE,
+               stats: Optional[ArchiveStats] = None) -> Iterator[Transaction]:
+    """
+    Лениво читает транзакции из файла JSONL. Потребление памяти не зависит
+    от размера файла. При trusted=True транзакции создаются через
+    Transaction.from_trusted_dict: без проверок и пересчета tx_id.
+    Если передан stats, в него накапливаются счетчики чтения.
+    """
+    if stats is None:
+        stats = ArchiveStats()
+    started = time.perf_counter()
+    try:
+        with _open_text(path, "r", compress, buffer_size) as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    tx_data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Некорректная строка {line_number} в архиве {path}") from e
+                if trusted:
+                    yield Transaction.from_trusted_dict(tx_data)
+                else:
+                    yield Transaction.from_dict(tx_data)
+                stats.count += 1
+    finally:
+        stats.seconds = time.perf_counter() - started
@@ -0,0 +1,206 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .address import default_registry
+from .keys import public_key_cache
+from .parallel import DEFAULT_SERIAL_THRESHOLD, verify_many
+from .transaction import Transaction
+from .transaction_output import TransactionOutput
+from .utxo import Outpoint, UTXOSet
+
+
+class TransactionVerdict(NamedTuple):
+    """Результат проверки одной транзакции пакета."""
+    tx_id: str
+    valid: bool
+    error: Optional[str]
+    wave: Optional[int] # Номер волны; None, если транзакция не попала ни в одну волну
+
+
+class BatchReport(NamedTuple):
+    """
+    Результат проверки пакета: вердикты в порядке входного пакета и
+    волны (списки индексов транзакций пакета) в топологическом порядке.
+    """
+    verdicts: List[TransactionVerdict]
+    waves: List[List[int]]
+
+    @property
+    def valid(self) -> bool:
+        """True, если все транзакции пакета корректны."""
+        return all(verdict.valid for verdict in self.verdicts)
+
+    def errors(self) -> Dict[str, str]:
+        """Ошибки некорректных транзакций: tx_id -> описание."""
+        return {verdict.tx_id: verdict.error for verdict in self.verdicts if not verdict.valid}
+
+
+def dependency_waves(transactions: List[Transaction]) -> Tuple[List[List[int]], List[int]]:
+    """
+    Строит граф зависимостей внутри пакета (вход ссылается на выход другой
+    транзакции пакета) и делит его на топологические волны: транзакции
+    одной волны не зависят друг от друга, а их родители из пакета находятся
+    в предыдущих волнах. Возвращает (волны, индексы транзакций, входящих
+    в цикл или зависящих от него). Повторяющиеся tx_id учитываются по
+    первому вхождению.
+    """
+    index_by_id: Dict[str, int] = {}
+    for index, tx in enumerate(transactions):
+        index_by_id.setdefault(tx.tx_id, index)
+
+    children: List[List[int]] = [[] for _ in transactions]
+    pending_parents = [0] * len(transactions)
+    for index, tx in enumerate(transactions):
+        parents = {index_by_id[inp.previous_tx_id] for inp in tx.inputs
+                   if inp.previous_tx_id in index_by_id}
+        for parent in parents:
+            children[parent].append(index)
+        pending_parents[index] = len(parents)
+
+    waves: List[List[int]] = []
+    wave = [index for index, count in enumerate(pending_parents) if count == 0]
+    while wave:
+        waves.append(wave)
+        next_wave = []
+        for parent in wave:
+            for child in children[parent]:
+                pending_parents[child] -= 1
+                if pending_parents[child] == 0:
+                    next_wave.append(child)
+        wave = sorted(next_wave)
+    blocked = [index for index, count in enumerate(pending_parents) if count > 0]
+    return waves, blocked
+
+
+class _UTXOOverlay:
+    """Изменения пакета поверх UTXO-множества; само множество не изменяется."""
+    def __init__(self, utxo_set: UTXOSet):
+        self._utxo_set = utxo_set
+        self._created: Dict[Outpoint, TransactionOutput] = {}
+        self._spent: Set[Outpoint] = set()
+
+    def get(self, outpoint: Outpoint) -> Optional[TransactionOutput]:
+        if outpoint in self._spent:
+            return None
+        output = self._created.get(outpoint)
+        return output if output is not None else self._utxo_set.get(*outpoint)
+
+    def apply(self, tx: Transaction):
+        for inp in tx.inputs:
+            self._spent.add(inp.outpoint)
+        for index, output in enumerate(tx.outputs):
+            self._created[(tx.tx_id, index)] = output
+
+
+def _check_spending(tx: Transaction, overlay: _UTXOOverlay) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Проверяет входы транзакции по UTXO и сохранение суммы.
+    Двойные траты внутри волны здесь не проверяются (см. validate_batch_in_waves).
+    Возвращает (ошибка, ключ владельца тратимых выходов).
+    """
+    if tx.is_coinbase():
+        return None, None
+    owner = None
+    total_in = 0
+    outpoints = [inp.outpoint for inp in tx.inputs]
+    if len(set(outpoints)) != len(outpoints):
+        return "Транзакция тратит один выход дважды", None
+    for tx_id, index in outpoints:
+        output = overlay.get((tx_id, index))
+        if output is None:
+            return f"Выход {tx_id}:{index} отсутствует или уже потрачен", None
+        if owner is None:
+            owner = output.recipient_address_pubkey_pem
+        elif output.recipient_address_pubkey_pem != owner:
+            return "Входы транзакции принадлежат разным владельцам", None
+        total_in += output.units
+    if sum(out.units for out in tx.outputs) > total_in:
+        return "Сумма выходов превышает сумму входов", None
+
+    public_key_pem = default_registry.resolve_key(owner)
+    if public_key_pem is None:
+        return f"Публичный ключ владельца {owner} не найден", None
+    try:
+        public_key_cache.get(public_key_pem)
+    except (ValueError, TypeError):
+        return "Получатель тратимых выходов не является публичным ключом", None
+    return None, public_key_pem
+
+
+def validate_batch_in_waves(transactions: Iterable[Transaction], utxo_set: UTXOSet,
+                            workers: Optional[int] = None,
+                            serial_threshold: int = DEFAULT_SERIAL_THRESHOLD) -> BatchReport:
+    """
+    Проверяет пакет транзакций, в котором транзакции могут тратить выходы
+    друг друга. Пакет делится на топологические волны (dependency_waves);
+    в каждой волне для каждой транзакции проверяются существование тратимых
+    выходов (в utxo_set или среди выходов корректных транзакций предыдущих
+    волн) и сохранение суммы, затем подписи всей волны проверяются
+    параллельно через verify_many. Подпись должна принадлежать владельцу
+    тратимых выходов. Двойная трата внутри волны определяется только среди
+    транзакций с верной подписью: выход достается первой из них по порядку
+    пакета, и транзакция с неверной подписью не может заблокировать
+    корректную трату.
+
+    Транзакции в цикле, с некорректным родителем из пакета или
+    повторяющимся tx_id отмечаются как некорректные. utxo_set не
+    изменяется; корректные транзакции можно применить в порядке волн.
+    """
+    transactions = list(transactions)
+    verdicts: List[Optional[TransactionVerdict]] = [None] * len(transactions)
+    waves, blocked = dependency_waves(transactions)
+    for index in blocked:
+        verdicts[index] = TransactionVerdict(transactions[index].tx_id, False,
+                                             "Циклическая зависимость в пакете (транзакция в цикле или зависит от него)",
+                                             None)
+
+    first_index: Dict[str, int] = {}
+    for index, tx in enumerate(transactions):
+        first_index.setdefault(tx.tx_id, index)
+    failed: Set[str] = set()
+    overlay = _UTXOOverlay(utxo_set)
+
+    for wave_number, wave in enumerate(waves):
+        candidates: List[Tuple[int, str]] = []
+        for index in wave:
+            tx = transactions[index]
+            error, public_key_pem = None, None
+            if first_index[tx.tx_id] != index:
+                error = "Транзакция повторяется в пакете"
+            else:
+                failed_parent = next((inp.previous_tx_id for inp in tx.inputs
+                                      if inp.previous_tx_id in failed), None)
+                if failed_parent is not None:
+                    error = f"Родительская транзакция {failed_parent} некорректна"
+                else:
+                    error, public_key_pem = _check_spending(tx, overlay)
+            if error is not None:
+                verdicts[index] = TransactionVerdict(tx.tx_id, False, error, wave_number)
+                if first_index[tx.tx_id] == index:
+                    failed.add(tx.tx_id)
+                continue
+            candidates.append((index, public_key_pem))
+
+        results = verify_many(
+            [(transactions[index], public_key_pem) for index, public_key_pem in candidates
+             if public_key_pem is not None],
+            workers=workers, serial_threshold=serial_threshold
+        )
+        results = iter(results)
+        claimed: Set[Outpoint] = set()
+        for index, public_key_pem in candidates:
+            tx = transactions[index]
+            valid = next(results) if public_key_pem is not None else tx.verify_signature("")
+            error = None if valid else "Подпись транзакции неверна"
+            if error is None:
+                conflict = next((inp for inp in tx.inputs if inp.outpoint in claimed), None)
+                if conflict is not None:
+                    error = f"Двойная трата в пакете: выход {conflict.previous_tx_id}:{conflict.output_index}"
+            if error is None:
+                claimed.update(inp.outpoint for inp in tx.inputs)
+                overlay.apply(tx)
+                verdicts[index] = TransactionVerdict(tx.tx_id, True, None, wave_number)
+            else:
+                failed.add(tx.tx_id)
+                verdicts[index] = TransactionVerdict(tx.tx_id, False, error, wave_number)
+
+    return BatchReport(verdicts, waves)
@@ -0,0 +1,245 @@
+"""
+Компактный версионированный двоичный формат транзакций.
+
+Все целые числа имеют фиксированную ширину и порядок байт big-endian:
+
+    version      u8     версия формата (FORMAT_VERSION)
+    flags        u8     FLAG_SIGNED | FLAG_BINARY_PREIMAGE | FLAG_SCHEME | FLAG_INT_TIMESTAMP
+    timestamp    f64 (i64, если установлен FLAG_INT_TIMESTAMP)
+    [scheme]     u16 длина + имя схемы подписи (ascii), если установлен FLAG_SCHEME
+    n_inputs     u32
+      id_len     u16, previous_tx_id (utf-8), output_index u32
+    n_outputs    u32
+      tag        u8     RECIPIENT_TEXT, RECIPIENT_DER или RECIPIENT_FINGERPRINT
+      len        u16, recipient, amount f64
+    [signature]  u16 длина + сырые байты, если установлен FLAG_SIGNED
+
+Публичные ключи в формате PEM хранятся как DER (без base64 и заголовков),
+адреса-отпечатки - как 32 сырых байта, прочие адреса - как utf-8 текст.
+
+Целочисленная метка времени сохраняется как i64 с флагом FLAG_INT_TIMESTAMP,
+чтобы после декодирования не изменился JSON-прообраз подписи (1700000000
+и 1700000000.0 сериализуются по-разному). В двоичном прообразе метка
+времени всегда записывается как f64.
+"""
+import base64
+import struct
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from .address import is_fingerprint_address
+from .transaction_input import TransactionInput
+from .transaction_output import TransactionOutput
+
+FORMAT_VERSION = 1
+
+FLAG_SIGNED = 0x01
+FLAG_BINARY_PREIMAGE = 0x02
+FLAG_SCHEME = 0x04
+FLAG_INT_TIMESTAMP = 0x08
+
+RECIPIENT_TEXT = 0
+RECIPIENT_DER = 1
+RECIPIENT_FINGERPRINT = 2
+
+_HEADER = struct.Struct(">BBd")
+_HEADER_INT = struct.Struct(">BBq")
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+_COUNT = struct.Struct(">I")
+_LENGTH = struct.Struct(">H")
+_INDEX = struct.Struct(">I")
+_AMOUNT = struct.Struct(">d")
+_TAG = struct.Struct(">B")
+
+_PEM_HEADER = "-----BEGIN PUBLIC KEY-----\n"
+_PEM_FOOTER = "-----END PUBLIC KEY-----\n"
+_PEM_LINE_LENGTH = 64
+
+
+class DecodedTransaction(NamedTuple):
+    """Поля транзакции, прочитанные из двоичного представления."""
+    timestamp: Union[int, float]
+    inputs: List[TransactionInput]
+    outputs: List[TransactionOutput]
+    signature: Optional[bytes]
+    binary_preimage: bool
+    scheme: Optional[str]
+
+
+def _der_to_pem(der: bytes) -> str:
+    body = base64.b64encode(der).decode('ascii')
+    lines = [body[i:i + _PEM_LINE_LENGTH] for i in range(0, len(body), _PEM_LINE_LENGTH)]
+    return _PEM_HEADER + "\n".join(lines) + "\n" + _PEM_FOOTER
+
+
+def encode_recipient(recipient: str) -> Tuple[int, bytes]:
+    """
+    Кодирует адрес получателя. Канонический PEM публичного ключа
+    сворачивается в DER, адрес-отпечаток - в сырые байты хэша,
+    остальные строки сохраняются как текст.
+    """
+    if is_fingerprint_address(recipient):
+        return RECIPIENT_FINGERPRINT, bytes.fromhex(recipient)
+    if recipient.startswith(_PEM_HEADER) and recipient.endswith(_PEM_FOOTER):
+        body = recipient[len(_PEM_HEADER):-len(_PEM_FOOTER)]
+        try:
+            der = base64.b64decode(body.replace("\n", ""), validate=True)
+        except ValueError:
+            der = None
+        # DER используется только если PEM восстанавливается побайтно.
+        if der is not None and _der_to_pem(der) == recipient:
+            return RECIPIENT_DER, der
+    return RECIPIENT_TEXT, recipient.encode('utf-8')
+
+
+def decode_recipient(tag: int, data: bytes) -> str:
+    """Восстанавливает адрес получателя, закодированный encode_recipient."""
+    if tag == RECIPIENT_FINGERPRINT:
+        return data.hex()
+    if tag == RECIPIENT_DER:
+        return _der_to_pem(data)
+    if tag == RECIPIENT_TEXT:
+        return data.decode('utf-8')
+    raise ValueError(f"Неизвестный тип адреса получателя: {tag}")
+
+
+def pack_bytes(parts: list, data: bytes):
+    """Добавляет в parts байты с префиксом длины u16."""
+    if len(data) > 0xFFFF:
+        raise ValueError("Поле слишком длинное для двоичного формата")
+    parts.append(_LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def pack_output(parts: list, out: TransactionOutput):
+    """Добавляет в parts двоичное представление выхода: tag, len, recipient, amount."""
+    tag, data = encode_recipient(out.recipient_address_pubkey_pem)
+    parts.append(_TAG.pack(tag))
+    pack_bytes(parts, data)
+    parts.append(_AMOUNT.pack(out.amount))
+
+
+def _encode_body(parts: list, inputs, outputs):
+    parts.append(_COUNT.pack(len(inputs)))
+    for inp in inputs:
+        pack_bytes(parts, inp.previous_tx_id.encode('utf-8'))
+        parts.append(_INDEX.pack(inp.output_index))
+    parts.append(_COUNT.pack(len(outputs)))
+    for out in outputs:
+        pack_output(parts, out)
+
+
+def _encode_header(parts: list, flags: int, timestamp: float, scheme: Optional[str],
+                   keep_timestamp_type: bool = False):
+    if scheme is not None:
+        flags |= FLAG_SCHEME
+    if keep_timestamp_type and type(timestamp) is int and _INT64_MIN <= timestamp <= _INT64_MAX:
+        parts.append(_HEADER_INT.pack(FORMAT_VERSION, flags | FLAG_INT_TIMESTAMP, timestamp))
+    else:
+        parts.append(_HEADER.pack(FORMAT_VERSION, flags, timestamp))
+    if scheme is not None:
+        pack_bytes(parts, scheme.encode('ascii'))
+
+
+def encode_preimage(timestamp: float, inputs, outputs, scheme: Optional[str] = None) -> bytes:
+    """
+    Двоичные данные транзакции без подписи (для хеширования и подписи).
+    scheme=None означает схему подписи по умолчанию.
+    """
+    parts: list = []
+    _encode_header(parts, FLAG_BINARY_PREIMAGE, timestamp, scheme)
+    _encode_body(parts, inputs, outputs)
+    return b"".join(parts)
+
+
+def encode_transaction(timestamp: float, inputs, outputs, signature: Optional[bytes],
+                       binary_preimage: bool = False, scheme: Optional[str] = None) -> bytes:
+    """Кодирует транзакцию целиком, включая подпись."""
+    flags = 0
+    if signature:
+        flags |= FLAG_SIGNED
+    if binary_preimage:
+        flags |= FLAG_BINARY_PREIMAGE
+    parts: list = []
+    _encode_header(parts, flags, timestamp, scheme, keep_timestamp_type=True)
+    _encode_body(parts, inputs, outputs)
+    if signature:
+        pack_bytes(parts, signature)
+    return b"".join(parts)
+
+
+def unpack_header(data, offset: int = 0) -> Tuple[int, int, Union[int, float]]:
+    """Читает заголовок (версия, флаги, метка времени) с учетом FLAG_INT_TIMESTAMP."""
+    version, flags, timestamp = _HEADER.unpack_from(data, offset)
+    if flags & FLAG_INT_TIMESTAMP:
+        timestamp = _HEADER_INT.unpack_from(data, offset)[2]
+    return version, flags, timestamp
+
+
+class BufferReader:
+    """Последовательное чтение полей из буфера без лишних копий."""
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct):
+        values = fmt.unpack_from(self.view, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def read_bytes(self) -> bytes:
+        (length,) = self.unpack(_LENGTH)
+        end = self.offset + length
+        if end > len(self.view):
+            raise struct.error("buffer too short")
+        data = self.view[self.offset:end].tobytes()
+        self.offset = end
+        return data
+
+    def read_output(self, trusted: bool = False) -> TransactionOutput:
+        """Читает выход, записанный pack_output."""
+        (tag,) = self.unpack(_TAG)
+        recipient = decode_recipient(tag, self.read_bytes())
+        (amount,) = self.unpack(_AMOUNT)
+        if trusted:
+            return TransactionOutput.from_trusted(recipient, amount)
+        return TransactionOutput(recipient, amount)
+
+    def at_end(self) -> bool:
+        return self.offset == len(self.view)
+
+
+def decode_transaction(data, trusted: bool = False) -> DecodedTransaction:
+    """
+    Декодирует транзакцию, закодированную encode_transaction.
+    При trusted=True входы и выходы создаются без проверки аргументов.
+    """
+    make_input = TransactionInput.from_trusted if trusted else TransactionInput
+    reader = BufferReader(data)
+    try:
+        version, flags, timestamp = unpack_header(reader.view)
+        reader.offset = _HEADER.size
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия двоичного формата: {version}")
+        scheme = reader.read_bytes().decode('ascii') if flags & FLAG_SCHEME else None
+
+        (n_inputs,) = reader.unpack(_COUNT)
+        inputs = []
+        for _ in range(n_inputs):
+            previous_tx_id = reader.read_bytes().decode('utf-8')
+            (output_index,) = reader.unpack(_INDEX)
+            inputs.append(make_input(previous_tx_id, output_index))
+
+        (n_outputs,) = reader.unpack(_COUNT)
+        outputs = []
+        for _ in range(n_outputs):
+            outputs.append(reader.read_output(trusted))
+
+        signature = reader.read_bytes() if flags & FLAG_SIGNED else None
+    except struct.error as e:
+        raise ValueError("Двоичные данные транзакции обрезаны или повреждены") from e
+
+    if not reader.at_end():
+        raise ValueError("Лишние байты после двоичных данных транзакции")
+
+    return DecodedTransaction(timestamp, inputs, outputs, signature,
+                              bool(flags & FLAG_BINARY_PREIMAGE), scheme)
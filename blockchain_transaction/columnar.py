@@ -0,0 +1,133 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError: # numpy - необязательная зависимость
+    np = None
+
+from .transaction import Transaction
+from .transaction_output import AMOUNT_SCALE, TransactionOutput, from_units
+from .utxo import Outpoint, UTXOSet
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Для OutputColumns требуется пакет numpy")
+
+
+class OutputColumns:
+    """
+    Колоночное представление выходов для векторных запросов по миллионам
+    выходов: суммы в базовых единицах (units, int64), идентификаторы
+    адресов (address_ids, int32, индексы в addresses) и битовая карта
+    потраченных выходов (spent, bool). Строка i соответствует outpoints[i].
+    Балансы, общая эмиссия и гистограммы считаются операциями numpy без
+    циклов Python; потраченные выходы в них не учитываются.
+    """
+    def __init__(self, outpoints: List[Outpoint], units, address_ids, addresses: List[str], spent=None):
+        _require_numpy()
+        self.outpoints = outpoints
+        self.units = np.asarray(units, dtype=np.int64)
+        self.address_ids = np.asarray(address_ids, dtype=np.int32)
+        self.addresses = addresses
+        self.spent = (np.zeros(len(outpoints), dtype=bool) if spent is None
+                      else np.asarray(spent, dtype=bool))
+        if not len(self.units) == len(self.address_ids) == len(self.spent) == len(outpoints):
+            raise ValueError("Колонки выходов должны иметь одинаковую длину")
+        self._address_index = {address: index for index, address in enumerate(addresses)}
+        self._rows: Optional[Dict[Outpoint, int]] = None
+
+    @classmethod
+    def from_outputs(cls, items: Iterable[Tuple[Outpoint, TransactionOutput]]) -> "OutputColumns":
+        """Строит колонки из пар (outpoint, выход)."""
+        _require_numpy()
+        outpoints: List[Outpoint] = []
+        units: List[int] = []
+        address_ids: List[int] = []
+        addresses: List[str] = []
+        address_index: Dict[str, int] = {}
+        for outpoint, output in items:
+            address = output.recipient_address_pubkey_pem
+            address_id = address_index.get(address)
+            if address_id is None:
+                address_id = address_index[address] = len(addresses)
+                addresses.append(address)
+            outpoints.append(outpoint)
+            units.append(output.units)
+            address_ids.append(address_id)
+        return cls(outpoints, np.array(units, dtype=np.int64),
+                   np.array(address_ids, dtype=np.int32), addresses)
+
+    @classmethod
+    def from_utxo_set(cls, utxo_set: UTXOSet) -> "OutputColumns":
+        """Строит колонки из непотраченных выходов UTXO-множества."""
+        return cls.from_outputs(utxo_set)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "OutputColumns":
+        """
+        Строит колонки из всех выходов транзакций; выходы, на которые
+        ссылаются входы этих же транзакций, отмечаются как потраченные.
+        """
+        transactions = list(transactions)
+        columns = cls.from_outputs(
+            ((tx.tx_id, index), output)
+            for tx in transactions
+            for index, output in enumerate(tx.outputs)
+        )
+        columns.mark_spent(inp.outpoint for tx in transactions for inp in tx.inputs)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.outpoints)
+
+    def mark_spent(self, outpoints: Iterable[Outpoint]) -> int:
+        """Отмечает выходы как потраченные; неизвестные outpoint пропускаются. Возвращает число отмеченных."""
+        if self._rows is None:
+            self._rows = {outpoint: row for row, outpoint in enumerate(self.outpoints)}
+        rows = [row for row in map(self._rows.get, outpoints) if row is not None]
+        if rows:
+            self.spent[np.array(rows, dtype=np.int64)] = True
+        return len(rows)
+
+    def address_id(self, address: str) -> Optional[int]:
+        """Идентификатор адреса в колонке address_ids или None."""
+        return self._address_index.get(address)
+
+    def balance_units(self):
+        """Массив балансов непотраченных выходов в базовых единицах, индексированный address_id."""
+        unspent = ~self.spent
+        balances = np.zeros(len(self.addresses), dtype=np.int64)
+        # np.add.at суммирует точно в int64, в отличие от bincount с весами float64.
+        np.add.at(balances, self.address_ids[unspent], self.units[unspent])
+        return balances
+
+    def balances(self) -> Dict[str, float]:
+        """Балансы адресов с ненулевым остатком."""
+        balances = self.balance_units()
+        return {self.addresses[address_id]: from_units(int(balances[address_id]))
+                for address_id in np.flatnonzero(balances)}
+
+    def balance(self, address: str) -> float:
+        """Баланс одного адреса (0.0 для неизвестного адреса)."""
+        address_id = self.address_id(address)
+        if address_id is None:
+            return 0.0
+        mask = (self.address_ids == address_id) & ~self.spent
+        return from_units(int(self.units[mask].sum()))
+
+    def total_supply_units(self) -> int:
+        """Сумма непотраченных выходов в базовых единицах."""
+        return int(self.units[~self.spent].sum())
+
+    def total_supply(self) -> float:
+        """Сумма непотраченных выходов."""
+        return from_units(self.total_supply_units())
+
+    def histogram(self, bins=10, include_spent: bool = False):
+        """
+        Гистограмма сумм выходов (в единицах amount), как numpy.histogram:
+        возвращает (counts, bin_edges).
+        """
+        units = self.units if include_spent else self.units[~self.spent]
+        return np.histogram(units / AMOUNT_SCALE, bins=bins)
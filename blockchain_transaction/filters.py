@@ -0,0 +1,281 @@
+"""
+Компактные вероятностные фильтры для быстрых отрицательных проверок
+принадлежности (известен ли tx_id, потрачен ли выход) без обращения к
+хранилищу.
+
+Фильтр никогда не дает ложноотрицательного ответа: если ключ добавлен,
+проверка вернет True. Ложноположительные ответы возможны с вероятностью
+не выше заданной false_positive_rate при числе ключей не больше capacity;
+положительный ответ нужно подтверждать в хранилище.
+
+Ключом может быть str, bytes или outpoint (tx_id, output_index).
+"""
+import array
+import hashlib
+import math
+import os
+import random
+import struct
+import sys
+from typing import Iterable, Tuple, Union
+
+Key = Union[str, bytes, Tuple[str, int]]
+
+_BLOOM_MAGIC = b"BLMF"
+_CUCKOO_MAGIC = b"CKOF"
+_FILTER_VERSION = 1
+# magic, версия, capacity, false_positive_rate, число ключей, два параметра фильтра
+_FILTER_HEADER = struct.Struct(">4sBQdQQQ")
+
+
+def _key_bytes(key: Key) -> bytes:
+    if isinstance(key, bytes):
+        return key
+    if isinstance(key, str):
+        return key.encode('utf-8')
+    if isinstance(key, tuple) and len(key) == 2:
+        tx_id, output_index = key
+        return f"{tx_id}:{output_index}".encode('utf-8')
+    raise ValueError(f"Неподдерживаемый тип ключа фильтра: {type(key).__name__}")
+
+
+def _hash128(key: Key) -> int:
+    return int.from_bytes(hashlib.blake2b(_key_bytes(key), digest_size=16).digest(), 'big')
+
+
+def _check_parameters(capacity: int, false_positive_rate: float):
+    if not isinstance(capacity, int) or capacity < 1:
+        raise ValueError("capacity должен быть положительным целым числом")
+    if not 0 < false_positive_rate < 1:
+        raise ValueError("false_positive_rate должен быть в интервале (0, 1)")
+
+
+def _write_atomically(path: str, data: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_header(data: bytes, magic: bytes, name: str):
+    try:
+        header = _FILTER_HEADER.unpack_from(data, 0)
+    except struct.error as e:
+        raise ValueError(f"Данные {name} обрезаны или повреждены") from e
+    if header[0] != magic:
+        raise ValueError(f"Данные не являются {name}")
+    if header[1] != _FILTER_VERSION:
+        raise ValueError(f"Неподдерживаемая версия {name}: {header[1]}")
+    return header[2:]
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: битовый массив из m бит и k хэш-функций (двойное
+    хеширование одного BLAKE2b), подобранных по capacity и
+    false_positive_rate. Поддерживает только добавление.
+    """
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        _check_parameters(capacity, false_positive_rate)
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: Key):
+        value = _hash128(key)
+        first, second = value >> 64, (value & 0xFFFFFFFFFFFFFFFF) | 1
+        num_bits = self.num_bits
+        return [(first + i * second) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: Key):
+        """Добавляет ключ."""
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def add_many(self, keys: Iterable[Key]):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: Key) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self) -> int:
+        """Число добавлений (повторные добавления ключа учитываются)."""
+        return self._count
+
+    def to_bytes(self) -> bytes:
+        header = _FILTER_HEADER.pack(_BLOOM_MAGIC, _FILTER_VERSION, self.capacity, self.false_positive_rate,
+                                     self._count, self.num_bits, self.num_hashes)
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        capacity, false_positive_rate, count, num_bits, num_hashes = _read_header(data, _BLOOM_MAGIC, "фильтра Блума")
+        bloom = cls(capacity, false_positive_rate)
+        bits = data[_FILTER_HEADER.size:]
+        if num_bits != bloom.num_bits or num_hashes != bloom.num_hashes or len(bits) != len(bloom._bits):
+            raise ValueError("Данные фильтра Блума обрезаны или повреждены")
+        bloom._bits = bytearray(bits)
+        bloom._count = count
+        return bloom
+
+    def save(self, path: str):
+        """Записывает фильтр в файл (атомарной заменой)."""
+        _write_atomically(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class CuckooFilter:
+    """
+    Кукушкин фильтр: корзины по bucket_size отпечатков, у каждого ключа
+    две возможные корзины. В отличие от фильтра Блума поддерживает
+    удаление (remove), например при откате блоков. Удалять можно только
+    ранее добавленные ключи, иначе можно удалить отпечаток другого ключа.
+    Если место для ключа не найдено, add выбрасывает ValueError.
+    """
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01,
+                 bucket_size: int = 4, max_kicks: int = 500):
+        _check_parameters(capacity, false_positive_rate)
+        if not isinstance(bucket_size, int) or bucket_size < 1:
+            raise ValueError("bucket_size должен быть положительным целым числом")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.bucket_size = bucket_size
+        self.max_kicks = max_kicks
+        # Вероятность ложного срабатывания ~ 2 * bucket_size / 2**fingerprint_bits.
+        self.fingerprint_bits = min(32, max(4, math.ceil(math.log2(2 * bucket_size / false_positive_rate))))
+        # Число корзин - степень двойки с запасом для заполнения ~95%.
+        self.num_buckets = 1 << max(0, math.ceil(math.log2(capacity / (bucket_size * 0.95))))
+        typecode = 'B' if self.fingerprint_bits <= 8 else 'H' if self.fingerprint_bits <= 16 else 'I'
+        self._slots = array.array(typecode, bytes(array.array(typecode).itemsize * self.num_buckets * bucket_size))
+        self._count = 0
+        self._random = random.Random(0)
+
+    def _fingerprint_and_index(self, key: Key) -> Tuple[int, int]:
+        value = _hash128(key)
+        fingerprint = (value >> 64) & ((1 << self.fingerprint_bits) - 1)
+        if fingerprint == 0: # 0 обозначает пустую ячейку
+            fingerprint = 1
+        return fingerprint, value & (self.num_buckets - 1)
+
+    def _alternate(self, index: int, fingerprint: int) -> int:
+        return (index ^ _hash128(fingerprint.to_bytes(4, 'big'))) & (self.num_buckets - 1)
+
+    def _find(self, bucket: int, fingerprint: int) -> int:
+        start = bucket * self.bucket_size
+        for slot in range(start, start + self.bucket_size):
+            if self._slots[slot] == fingerprint:
+                return slot
+        return -1
+
+    def add(self, key: Key):
+        """Добавляет ключ; ValueError, если фильтр заполнен."""
+        fingerprint, first = self._fingerprint_and_index(key)
+        second = self._alternate(first, fingerprint)
+        for bucket in (first, second):
+            slot = self._find(bucket, 0)
+            if slot >= 0:
+                self._slots[slot] = fingerprint
+                self._count += 1
+                return
+
+        # Вытеснение: перемещаем случайные отпечатки в их альтернативные корзины.
+        bucket = self._random.choice((first, second))
+        evicted = []
+        for _ in range(self.max_kicks):
+            slot = bucket * self.bucket_size + self._random.randrange(self.bucket_size)
+            fingerprint, self._slots[slot] = self._slots[slot], fingerprint
+            evicted.append((slot, fingerprint))
+            bucket = self._alternate(bucket, fingerprint)
+            free = self._find(bucket, 0)
+            if free >= 0:
+                self._slots[free] = fingerprint
+                self._count += 1
+                return
+        # Откат перемещений, чтобы не потерять ранее добавленные ключи.
+        for slot, previous in reversed(evicted):
+            self._slots[slot] = previous
+        raise ValueError("Кукушкин фильтр заполнен")
+
+    def add_many(self, keys: Iterable[Key]):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: Key) -> bool:
+        fingerprint, first = self._fingerprint_and_index(key)
+        return (self._find(first, fingerprint) >= 0 or
+                self._find(self._alternate(first, fingerprint), fingerprint) >= 0)
+
+    def remove(self, key: Key) -> bool:
+        """Удаляет ранее добавленный ключ. Возвращает False, если отпечаток не найден."""
+        fingerprint, first = self._fingerprint_and_index(key)
+        for bucket in (first, self._alternate(first, fingerprint)):
+            slot = self._find(bucket, fingerprint)
+            if slot >= 0:
+                self._slots[slot] = 0
+                self._count -= 1
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_bytes(self) -> bytes:
+        header = _FILTER_HEADER.pack(_CUCKOO_MAGIC, _FILTER_VERSION, self.capacity, self.false_positive_rate,
+                                     self._count, self.bucket_size, self.max_kicks)
+        slots = array.array(self._slots.typecode, self._slots)
+        if sys.byteorder == 'little':
+            slots.byteswap() # Ячейки хранятся в big-endian
+        return header + slots.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CuckooFilter":
+        capacity, false_positive_rate, count, bucket_size, max_kicks = _read_header(
+            data, _CUCKOO_MAGIC, "кукушкина фильтра")
+        cuckoo = cls(capacity, false_positive_rate, bucket_size, max_kicks)
+        slots = array.array(cuckoo._slots.typecode)
+        body = data[_FILTER_HEADER.size:]
+        if len(body) != len(cuckoo._slots) * slots.itemsize:
+            raise ValueError("Данные кукушкина фильтра обрезаны или повреждены")
+        slots.frombytes(body)
+        if sys.byteorder == 'little':
+            slots.byteswap()
+        cuckoo._slots = slots
+        cuckoo._count = count
+        return cuckoo
+
+    def save(self, path: str):
+        """Записывает фильтр в файл (атомарной заменой)."""
+        _write_atomically(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "CuckooFilter":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def extend_filter(membership_filter, keys: Iterable[Key]):
+    """
+    Добавляет ключи в фильтр, стоящий перед хранилищем. Если кукушкин
+    фильтр переполнен, возвращает None: фильтр с пропущенными ключами
+    давал бы ложноотрицательные ответы, поэтому хранилище его отключает.
+    """
+    if membership_filter is None:
+        return None
+    try:
+        membership_filter.add_many(keys)
+    except ValueError:
+        return None
+    return membership_filter
@@ -0,0 +1,122 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from .transaction import Transaction
+from .utxo import Outpoint
+
+
+class TransactionGraph:
+    """
+    Индекс происхождения средств: граф транзакций, построенный по ссылкам
+    TransactionInput.previous_tx_id. Каждой транзакции назначается
+    компактный целочисленный идентификатор; для него хранятся списки
+    родителей (откуда пришли средства) и детей (кто потратил выходы).
+    Запросы ancestors/descendants обходят граф в ширину по целым числам
+    и не сканируют историю.
+
+    Транзакции, на которые ссылаются входы, но которые еще не добавлены,
+    хранятся как неизвестные вершины и становятся известными при add().
+    """
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._tx_ids: List[str] = []
+        self._known = bytearray()
+        self._parents: List[List[int]] = []
+        self._children: List[List[int]] = []
+        self._spenders: Dict[Outpoint, int] = {}
+        self._count = 0
+
+    def _node(self, tx_id: str) -> int:
+        node = self._ids.get(tx_id)
+        if node is None:
+            node = self._ids[tx_id] = len(self._tx_ids)
+            self._tx_ids.append(tx_id)
+            self._known.append(0)
+            self._parents.append([])
+            self._children.append([])
+        return node
+
+    def _require(self, tx_id: str) -> int:
+        node = self._ids.get(tx_id)
+        if node is None or not self._known[node]:
+            raise ValueError(f"Транзакция {tx_id} отсутствует в графе")
+        return node
+
+    def add(self, tx: Transaction):
+        """Добавляет транзакцию и ее связи; повторное добавление игнорируется."""
+        node = self._node(tx.tx_id)
+        if self._known[node]:
+            return
+        self._known[node] = 1
+        self._count += 1
+        parents = self._parents[node]
+        for inp in tx.inputs:
+            parent = self._node(inp.previous_tx_id)
+            if parent not in parents: # У транзакции обычно немного входов
+                parents.append(parent)
+                self._children[parent].append(node)
+            self._spenders[inp.outpoint] = node
+
+    def add_many(self, transactions: Iterable[Transaction]):
+        """Добавляет транзакции в любом порядке."""
+        for tx in transactions:
+            self.add(tx)
+
+    def __contains__(self, tx_id: str) -> bool:
+        node = self._ids.get(tx_id)
+        return node is not None and bool(self._known[node])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def parents(self, tx_id: str) -> List[str]:
+        """tx_id транзакций, выходы которых тратит транзакция (включая неизвестные)."""
+        return [self._tx_ids[parent] for parent in self._parents[self._require(tx_id)]]
+
+    def children(self, tx_id: str) -> List[str]:
+        """tx_id транзакций, тративших выходы транзакции."""
+        return [self._tx_ids[child] for child in self._children[self._require(tx_id)]]
+
+    def spender_of(self, tx_id: str, output_index: int) -> Optional[str]:
+        """tx_id транзакции, потратившей выход, или None."""
+        node = self._spenders.get((tx_id, output_index))
+        return self._tx_ids[node] if node is not None else None
+
+    def _walk(self, start: List[int], adjacency: List[List[int]], depth: Optional[int]) -> Dict[str, int]:
+        distances: Dict[int, int] = {node: 1 for node in start}
+        queue = deque(start)
+        while queue:
+            node = queue.popleft()
+            distance = distances[node]
+            if depth is not None and distance >= depth:
+                continue
+            for neighbour in adjacency[node]:
+                if neighbour not in distances:
+                    distances[neighbour] = distance + 1
+                    queue.append(neighbour)
+        return {self._tx_ids[node]: distance for node, distance in distances.items()}
+
+    def ancestors(self, tx_id: str, depth: Optional[int] = None) -> Dict[str, int]:
+        """
+        Все предки транзакции не глубже depth (None - без ограничения):
+        словарь tx_id -> расстояние (1 - непосредственные родители).
+        Неизвестные транзакции включаются, но их предки не известны.
+        """
+        if depth is not None and depth < 1:
+            return {}
+        return self._walk(list(self._parents[self._require(tx_id)]), self._parents, depth)
+
+    def descendants(self, tx_id: str, output_index: Optional[int] = None,
+                    depth: Optional[int] = None) -> Dict[str, int]:
+        """
+        Все потомки транзакции (или одного ее выхода, если задан output_index)
+        не глубже depth: словарь tx_id -> расстояние (1 - потратившие напрямую).
+        """
+        if depth is not None and depth < 1:
+            return {}
+        if output_index is None:
+            start = list(self._children[self._require(tx_id)])
+        else:
+            spender = self._spenders.get((tx_id, output_index))
+            start = [spender] if spender is not None else []
+        return self._walk(start, self._children, depth)
@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+
+from .keys import DEFAULT_SCHEME, generate_keys, get_scheme, serialize_private_key, serialize_public_key
+
+# Пара (приватный ключ PEM, публичный ключ PEM).
+KeyPair = Tuple[str, str]
+
+
+def _generate_pem_pairs(scheme: str, count: int) -> List[KeyPair]:
+    """Генерирует пары ключей в рабочем процессе и возвращает их в PEM."""
+    pairs = []
+    for _ in range(count):
+        private_key, public_key = generate_keys(scheme)
+        pairs.append((serialize_private_key(private_key), serialize_public_key(public_key)))
+    return pairs
+
+
+class KeyPool:
+    """
+    Пул заранее сгенерированных пар ключей.
+    Фоновый поток поддерживает глубину пула на уровне target_depth, генерируя
+    ключи пакетами в пуле процессов; get() выдает готовую пару за O(1).
+    Если пул пуст, пара генерируется синхронно (учитывается как промах).
+
+    При заданном persist_path неиспользованные ключи сохраняются при close()
+    в файл с правами 0600 (приватные ключи шифруются, если передан password)
+    и загружаются при следующем запуске, после чего файл удаляется, чтобы
+    одна пара не была выдана дважды. Файл с ключами другой схемы не
+    загружается и не удаляется (ValueError).
+    """
+    def __init__(self, target_depth: int = 64, scheme: str = DEFAULT_SCHEME,
+                 workers: Optional[int] = None, batch_size: int = 8,
+                 persist_path: Optional[str] = None, password: Optional[bytes] = None,
+                 start: bool = True):
+        if not isinstance(target_depth, int) or target_depth < 1:
+            raise ValueError("target_depth должен быть положительным целым числом")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size должен быть положительным целым числом")
+        get_scheme(scheme)
+
+        self.target_depth = target_depth
+        self.scheme = scheme
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.persist_path = persist_path
+        self._password = password
+
+        self._pairs: Deque[KeyPair] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ready = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._generated = 0
+        self._generation_seconds = 0.0
+        self._served = 0
+        self._misses = 0
+
+        if persist_path and os.path.exists(persist_path):
+            self._load(persist_path)
+        if start:
+            self.start()
+
+    # --- Управление фоновым пополнением ---
+
+    def start(self):
+        """Запускает фоновое пополнение пула."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refill_loop, name="KeyPool-refill", daemon=True)
+        self._thread.start()
+
+    def _refill_loop(self):
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stop.is_set():
+                missing = self.target_depth - len(self._pairs)
+                if missing <= 0:
+                    self._wake.wait(timeout=0.5)
+                    self._wake.clear()
+                    continue
+                started = time.perf_counter()
+                futures = []
+                while missing > 0 and len(futures) < self.workers:
+                    count = min(self.batch_size, missing)
+                    futures.append(executor.submit(_generate_pem_pairs, self.scheme, count))
+                    missing -= count
+                for future in futures:
+                    pairs = future.result()
+                    with self._lock:
+                        self._pairs.extend(pairs)
+                        self._generated += len(pairs)
+                        self._ready.notify_all()
+                with self._lock:
+                    self._generation_seconds += time.perf_counter() - started
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Ждет, пока глубина пула достигнет target_depth."""
+        with self._ready:
+            return self._ready.wait_for(lambda: len(self._pairs) >= self.target_depth, timeout)
+
+    def close(self):
+        """Останавливает пополнение и сохраняет неиспользованные ключи, если задан persist_path."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.persist_path:
+            self._save(self.persist_path)
+
+    def __enter__(self) -> "KeyPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- Выдача ключей ---
+
+    def get(self) -> KeyPair:
+        """Возвращает пару (приватный PEM, публичный PEM)."""
+        with self._lock:
+            if self._pairs:
+                pair = self._pairs.popleft()
+                self._served += 1
+                low_watermark = len(self._pairs) < self.target_depth
+            else:
+                pair = None
+                self._misses += 1
+        if pair is None:
+            pair = _generate_pem_pairs(self.scheme, 1)[0]
+            with self._lock:
+                self._served += 1
+            low_watermark = True
+        if low_watermark:
+            self._wake.set()
+        return pair
+
+    @property
+    def depth(self) -> int:
+        """Число готовых пар в пуле."""
+        return len(self._pairs)
+
+    def metrics(self) -> Dict[str, float]:
+        """Возвращает глубину пула, счетчики и скорость пополнения (пар в секунду)."""
+        with self._lock:
+            refill_rate = self._generated / self._generation_seconds if self._generation_seconds else 0.0
+            return {
+                "depth": len(self._pairs),
+                "target_depth": self.target_depth,
+                "generated": self._generated,
+                "served": self._served,
+                "misses": self._misses,
+                "refill_rate": refill_rate,
+            }
+
+    # --- Сохранение ---
+
+    def _save(self, path: str):
+        with self._lock:
+            pairs = list(self._pairs)
+            self._pairs.clear()
+        if not pairs:
+            return
+        records = [{"private": self._encrypt(private_pem), "public": public_pem}
+                   for private_pem, public_pem in pairs]
+        tmp_path = path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"scheme": self.scheme, "keys": records}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _load(self, path: str):
+        """
+        Файл удаляется только после успешной загрузки всех ключей: при другой
+        схеме или неверном пароле он остается на месте, а конструктор
+        выбрасывает исключение.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("scheme") != self.scheme:
+            raise ValueError(f"Файл {path} содержит ключи схемы {data.get('scheme')}, "
+                             f"а пул создается для схемы {self.scheme}")
+        pairs = [(self._decrypt(record["private"]), record["public"]) for record in data.get("keys", [])]
+        self._pairs.extend(pairs)
+        os.remove(path)
+
+    def _encrypt(self, private_pem: str) -> str:
+        if not self._password:
+            return private_pem
+        private_key = serialization.load_pem_private_key(private_pem.encode('utf-8'), password=None)
+        return private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.BestAvailableEncryption(self._password)
+        ).decode('utf-8')
+
+    def _decrypt(self, stored_pem: str) -> str:
+        if not self._password:
+            return stored_pem
+        private_key = serialization.load_pem_private_key(stored_pem.encode('utf-8'), password=self._password)
+        return serialize_private_key(private_key)
@@ -1,6 +1,12 @@
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa, padding
 from cryptography.hazmat.primitives import serialization
+from cryptography.exceptions import InvalidSignature
+
+import abc
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
 
 def generate_rsa_keys():
     """Генерирует пару RSA ключей (приватный и публичный)."""
@@ -11,6 +17,10 @@ def generate_rsa_keys():
     public_key = private_key.public_key()
     return private_key, public_key
 
+def generate_keys(scheme: str = "rsa-pss"):
+    """Генерирует пару ключей (приватный и публичный) для указанной схемы подписи."""
+    return get_scheme(scheme).generate_keys()
+
 def serialize_private_key(private_key: rsa.RSAPrivateKey) -> str:
     """Сериализует приватный ключ в формат PEM."""
     pem = private_key.private_bytes(
@@ -39,4 +49,246 @@ def deserialize_public_key(pem_data_str: str) -> rsa.RSAPublicKey:
     """Десериализует публичный ключ из PEM строки."""
     return serialization.load_pem_public_key(
         pem_data_str.encode('utf-8')
-    )
\ No newline at end of file
+    )
+
+class SignatureScheme(abc.ABC):
+    """
+    Схема цифровой подписи. Имя схемы записывается в транзакцию,
+    чтобы проверяющая сторона знала, каким алгоритмом проверять подпись.
+    """
+    name = ""
+
+    @abc.abstractmethod
+    def generate_keys(self) -> Tuple[Any, Any]:
+        """Генерирует пару ключей (приватный и публичный) схемы."""
+
+    @abc.abstractmethod
+    def supports_key(self, key) -> bool:
+        """Проверяет, подходит ли приватный или публичный ключ для схемы."""
+
+    @abc.abstractmethod
+    def sign(self, private_key, data: bytes) -> bytes:
+        """Подписывает data приватным ключом схемы."""
+
+    @abc.abstractmethod
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        """Проверяет подпись; при неверной подписи выбрасывает InvalidSignature."""
+
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        """Проверяет подпись; ключ чужой схемы считается неверным."""
+        if not self.supports_key(public_key):
+            return False
+        try:
+            self._verify(public_key, signature, data)
+            return True
+        except InvalidSignature:
+            return False
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name='{self.name}')"
+
+
+class RSAPSSScheme(SignatureScheme):
+    """RSA-2048 с PSS padding и SHA256 (схема по умолчанию)."""
+    name = "rsa-pss"
+
+    def _padding(self):
+        return padding.PSS(
+            mgf=padding.MGF1(hashes.SHA256()),
+            salt_length=padding.PSS.MAX_LENGTH
+        )
+
+    def generate_keys(self):
+        return generate_rsa_keys()
+
+    def supports_key(self, key) -> bool:
+        return isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey))
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data, self._padding(), hashes.SHA256())
+
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        public_key.verify(signature, data, self._padding(), hashes.SHA256())
+
+
+class Ed25519Scheme(SignatureScheme):
+    """Ed25519: быстрая генерация ключей и подпись, подпись 64 байта."""
+    name = "ed25519"
+
+    def generate_keys(self):
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        return private_key, private_key.public_key()
+
+    def supports_key(self, key) -> bool:
+        return isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey))
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data)
+
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        public_key.verify(signature, data)
+
+
+class ECDSASecp256k1Scheme(SignatureScheme):
+    """ECDSA на кривой secp256k1 с SHA256, подпись в DER (около 71 байта)."""
+    name = "ecdsa-secp256k1"
+
+    def generate_keys(self):
+        private_key = ec.generate_private_key(ec.SECP256K1())
+        return private_key, private_key.public_key()
+
+    def supports_key(self, key) -> bool:
+        return (isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey))
+                and isinstance(key.curve, ec.SECP256K1))
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data, ec.ECDSA(hashes.SHA256()))
+
+    def _verify(self, public_key, signature: bytes, data: bytes):
+        public_key.verify(signature, data, ec.ECDSA(hashes.SHA256()))
+
+
+DEFAULT_SCHEME = RSAPSSScheme.name
+
+SIGNATURE_SCHEMES: Dict[str, SignatureScheme] = {
+    scheme.name: scheme for scheme in (RSAPSSScheme(), Ed25519Scheme(), ECDSASecp256k1Scheme())
+}
+
+def get_scheme(name: str) -> SignatureScheme:
+    """Возвращает схему подписи по имени."""
+    try:
+        return SIGNATURE_SCHEMES[name]
+    except (KeyError, TypeError):
+        raise ValueError(f"Неизвестная схема подписи: {name}") from None
+
+def scheme_for_key(key) -> SignatureScheme:
+    """Определяет схему подписи по типу ключа."""
+    for scheme in SIGNATURE_SCHEMES.values():
+        if scheme.supports_key(key):
+            return scheme
+    raise ValueError(f"Нет схемы подписи для ключа типа {type(key).__name__}")
+
+
+class Signer:
+    """
+    Подписывающий ключ: приватный ключ, разобранный из PEM один раз, и
+    соответствующая ему схема подписи. Передается в Transaction.sign и
+    parallel.sign_many вместо PEM строки. При передаче в другой процесс
+    (pickle) сохраняется только PEM, ключ разбирается заново.
+    """
+    def __init__(self, private_key_pem: str):
+        if not isinstance(private_key_pem, str) or not private_key_pem:
+            raise ValueError("Приватный ключ необходим для подписи.")
+        self.private_key_pem = private_key_pem
+        self.private_key = deserialize_private_key(private_key_pem)
+        self.scheme = scheme_for_key(self.private_key)
+
+    @classmethod
+    def from_private_key(cls, private_key) -> "Signer":
+        """Создает подписывающего из уже разобранного приватного ключа."""
+        signer = cls.__new__(cls)
+        signer.private_key_pem = serialize_private_key(private_key)
+        signer.private_key = private_key
+        signer.scheme = scheme_for_key(private_key)
+        return signer
+
+    def sign(self, data: bytes) -> bytes:
+        """Подписывает данные схемой ключа."""
+        return self.scheme.sign(self.private_key, data)
+
+    def __getstate__(self):
+        return {"private_key_pem": self.private_key_pem}
+
+    def __setstate__(self, state):
+        self.__init__(state["private_key_pem"])
+
+    def __repr__(self) -> str:
+        return f"Signer(scheme='{self.scheme.name}')"
+
+
+class KeyCache:
+    """
+    Ограниченный по размеру потокобезопасный LRU-кэш десериализованных ключей.
+    Ключом служит PEM строка, значением - результат loader(pem).
+    Ошибки загрузки не кэшируются. capacity=0 отключает кэширование.
+    """
+    def __init__(self, loader: Callable[[str], Any], capacity: int = 1024):
+        self._check_capacity(capacity)
+        self._loader = loader
+        self._capacity = capacity
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _check_capacity(capacity: int):
+        if not isinstance(capacity, int) or capacity < 0:
+            raise ValueError("capacity должен быть неотрицательным целым числом")
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def get(self, pem_data_str: str) -> Any:
+        """Возвращает ключ из кэша или загружает его и запоминает."""
+        with self._lock:
+            key = self._entries.get(pem_data_str)
+            if key is not None:
+                self._entries.move_to_end(pem_data_str)
+                self._hits += 1
+                return key
+            self._misses += 1
+
+        # Разбор PEM выполняется вне блокировки, чтобы не сериализовать потоки.
+        key = self._loader(pem_data_str)
+
+        with self._lock:
+            if self._capacity:
+                self._entries[pem_data_str] = key
+                self._entries.move_to_end(pem_data_str)
+                self._evict()
+        return key
+
+    def _evict(self):
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, pem_data_str: str) -> bool:
+        """Удаляет ключ из кэша. Возвращает True, если он там был."""
+        with self._lock:
+            return self._entries.pop(pem_data_str, None) is not None
+
+    def clear(self):
+        """Очищает кэш и сбрасывает статистику."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def resize(self, capacity: int):
+        """Изменяет емкость кэша, вытесняя самые старые записи при необходимости."""
+        self._check_capacity(capacity)
+        with self._lock:
+            self._capacity = capacity
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает статистику попаданий и промахов."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "capacity": self._capacity,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Общие кэши, используемые Transaction при подписи и проверке.
+public_key_cache = KeyCache(deserialize_public_key, capacity=4096)
+private_key_cache = KeyCache(deserialize_private_key, capacity=64)
@@ -0,0 +1,199 @@
+import heapq
+import itertools
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .transaction import Transaction
+from .transaction_output import from_units
+from .utxo import Outpoint, UTXOSet
+
+PriorityFunction = Callable[[Transaction], float]
+
+
+def age_priority(tx: Transaction) -> float:
+    """Приоритет по возрасту: чем раньше timestamp, тем выше приоритет."""
+    return -tx.timestamp
+
+
+def transaction_fee(tx: Transaction, utxo_set: UTXOSet) -> Optional[float]:
+    """
+    Комиссия транзакции: сумма тратимых выходов минус сумма ее выходов.
+    Возвращает None, если какой-либо тратимый выход не найден в UTXO.
+    Суммирование выполняется в целых базовых единицах (см. TransactionOutput.units).
+    """
+    total_in = 0
+    for inp in tx.inputs:
+        output = utxo_set.get_for_input(inp)
+        if output is None:
+            return None
+        total_in += output.units
+    return from_units(total_in - sum(out.units for out in tx.outputs))
+
+
+class FeePriority:
+    """Приоритет по комиссии; транзакции с неизвестными входами получают 0."""
+    def __init__(self, utxo_set: UTXOSet):
+        self.utxo_set = utxo_set
+
+    def __call__(self, tx: Transaction) -> float:
+        fee = transaction_fee(tx, self.utxo_set)
+        return fee if fee is not None else 0.0
+
+
+class Mempool:
+    """
+    Пул неподтвержденных транзакций.
+    Поиск по tx_id выполняется за O(1), прием транзакции - за O(число входов):
+    индекс outpoint -> tx_id выявляет двойную трату среди ожидающих транзакций.
+    При переполнении вытесняется транзакция с наименьшим приоритетом
+    (вместе с зависящими от нее транзакциями пула); предки принимаемой
+    транзакции в пуле не вытесняются.
+    """
+    def __init__(self, max_size: int = 100_000, priority: PriorityFunction = age_priority):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError("max_size должен быть положительным целым числом")
+        self.max_size = max_size
+        self.priority = priority
+        self._transactions: Dict[str, Transaction] = {}
+        self._priorities: Dict[str, float] = {}
+        self._spent_by: Dict[Outpoint, str] = {}
+        # Куча (приоритет, порядковый номер, tx_id); удаленные записи пропускаются лениво.
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self._transactions
+
+    def get(self, tx_id: str) -> Optional[Transaction]:
+        """Возвращает транзакцию пула по tx_id или None."""
+        return self._transactions.get(tx_id)
+
+    def spender_of(self, outpoint: Outpoint) -> Optional[str]:
+        """Возвращает tx_id транзакции пула, тратящей outpoint, или None."""
+        return self._spent_by.get(outpoint)
+
+    def admit(self, tx: Transaction) -> bool:
+        """
+        Добавляет транзакцию в пул. Возвращает False, если она уже в пуле.
+        Выбрасывает ValueError при конфликте с ожидающей транзакцией или если
+        пул заполнен транзакциями с не меньшим приоритетом.
+        """
+        tx_id = tx.tx_id
+        if tx_id in self._transactions:
+            return False
+
+        for inp in tx.inputs:
+            spender = self._spent_by.get(inp.outpoint)
+            if spender is not None:
+                raise ValueError(f"Двойная трата: выход {inp.previous_tx_id}:{inp.output_index} "
+                                 f"уже тратится транзакцией {spender}")
+
+        priority = self.priority(tx)
+        if len(self._transactions) >= self.max_size:
+            # Вытеснение предка каскадом удалило бы и его потомков, а принятая
+            # транзакция осталась бы в пуле без родителя.
+            lowest = self._peek_lowest(exclude=self._ancestors_in_pool(tx))
+            if lowest is None or priority <= lowest[0]:
+                raise ValueError("Мемпул заполнен транзакциями с более высоким приоритетом")
+            self._remove(lowest[2], cascade=True)
+
+        self._transactions[tx_id] = tx
+        self._priorities[tx_id] = priority
+        for inp in tx.inputs:
+            self._spent_by[inp.outpoint] = tx_id
+        heapq.heappush(self._heap, (priority, next(self._counter), tx_id))
+        return True
+
+    def admit_many(self, transactions: Iterable[Transaction]) -> List[bool]:
+        """Добавляет транзакции по порядку; для отклоненных возвращает False."""
+        results = []
+        for tx in transactions:
+            try:
+                results.append(self.admit(tx))
+            except ValueError:
+                results.append(False)
+        return results
+
+    def remove(self, tx_id: str) -> List[str]:
+        """
+        Удаляет транзакцию и все транзакции пула, тратящие ее выходы.
+        Возвращает список удаленных tx_id.
+        """
+        return self._remove(tx_id, cascade=True)
+
+    def remove_confirmed(self, transactions: Iterable[Transaction]) -> List[str]:
+        """
+        Удаляет транзакции, вошедшие в блок, а также ожидающие транзакции,
+        которые конфликтуют с ними по входам. Потомки подтвержденных
+        транзакций остаются в пуле. Возвращает список удаленных tx_id.
+        """
+        removed: List[str] = []
+        for tx in transactions:
+            removed.extend(self._remove(tx.tx_id, cascade=False))
+            for inp in tx.inputs:
+                spender = self._spent_by.get(inp.outpoint)
+                if spender is not None:
+                    removed.extend(self._remove(spender, cascade=True))
+        return removed
+
+    def by_priority(self) -> List[Transaction]:
+        """Возвращает транзакции пула от высокого приоритета к низкому."""
+        ordered = sorted(self._transactions, key=self._priorities.__getitem__, reverse=True)
+        return [self._transactions[tx_id] for tx_id in ordered]
+
+    def _ancestors_in_pool(self, tx: Transaction) -> Set[str]:
+        """tx_id транзакций пула, выходы которых tx тратит прямо или через цепочку."""
+        ancestors: Set[str] = set()
+        pending = [inp.previous_tx_id for inp in tx.inputs]
+        while pending:
+            parent_id = pending.pop()
+            parent = self._transactions.get(parent_id)
+            if parent is None or parent_id in ancestors:
+                continue
+            ancestors.add(parent_id)
+            pending.extend(inp.previous_tx_id for inp in parent.inputs)
+        return ancestors
+
+    def _peek_lowest(self, exclude: Set[str] = frozenset()) -> Optional[Tuple[float, int, str]]:
+        """Запись кучи с наименьшим приоритетом среди транзакций не из exclude."""
+        skipped = []
+        try:
+            while self._heap:
+                priority, _, tx_id = self._heap[0]
+                if self._priorities.get(tx_id) != priority:
+                    heapq.heappop(self._heap)
+                elif tx_id in exclude:
+                    skipped.append(heapq.heappop(self._heap))
+                else:
+                    return self._heap[0]
+            return None
+        finally:
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+
+    def _remove(self, tx_id: str, cascade: bool) -> List[str]:
+        removed: List[str] = []
+        pending = [tx_id]
+        while pending:
+            current = pending.pop()
+            tx = self._transactions.pop(current, None)
+            if tx is None:
+                continue
+            del self._priorities[current]
+            for inp in tx.inputs:
+                if self._spent_by.get(inp.outpoint) == current:
+                    del self._spent_by[inp.outpoint]
+            removed.append(current)
+            if cascade:
+                for index in range(len(tx.outputs)):
+                    child = self._spent_by.get((current, index))
+                    if child is not None:
+                        pending.append(child)
+        # Куча не должна расти без ограничений из-за устаревших записей.
+        if len(self._heap) > 2 * len(self._transactions) + 64:
+            self._heap = [entry for entry in self._heap
+                          if self._priorities.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+        return removed
@@ -0,0 +1,104 @@
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+# Префиксы разделяют хэши листьев и внутренних узлов, чтобы внутренний
+# узел нельзя было выдать за лист (атака второго прообраза).
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+# Шаг доказательства: (хэш соседнего узла, сосед находится слева).
+ProofStep = Tuple[bytes, bool]
+
+
+def _hash_leaf(tx_id: str) -> bytes:
+    return hashlib.sha256(_LEAF_PREFIX + tx_id.encode('utf-8')).digest()
+
+
+def _hash_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Дерево Меркла над tx_id транзакций.
+    Построение занимает O(n); добавление и замена листа пересчитывают
+    только O(log n) узлов на пути к корню. Узел без пары переносится
+    на уровень выше без изменений.
+    """
+    def __init__(self, tx_ids: Iterable[str] = ()):
+        self._levels: List[List[bytes]] = [[_hash_leaf(tx_id) for tx_id in tx_ids]]
+        level = self._levels[0]
+        while len(level) > 1:
+            level = [self._combine(level, i) for i in range(0, len(level), 2)]
+            self._levels.append(level)
+
+    @staticmethod
+    def _combine(level: List[bytes], left_index: int) -> bytes:
+        if left_index + 1 < len(level):
+            return _hash_node(level[left_index], level[left_index + 1])
+        return level[left_index]
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    @property
+    def root(self) -> Optional[bytes]:
+        """Корень дерева или None для пустого дерева."""
+        top = self._levels[-1]
+        return top[0] if top else None
+
+    @property
+    def root_hex(self) -> Optional[str]:
+        root = self.root
+        return root.hex() if root is not None else None
+
+    def append(self, tx_id: str) -> int:
+        """Добавляет лист и возвращает его индекс."""
+        leaves = self._levels[0]
+        leaves.append(_hash_leaf(tx_id))
+        self._update_path(len(leaves) - 1)
+        return len(leaves) - 1
+
+    def replace(self, index: int, tx_id: str):
+        """Заменяет лист с указанным индексом."""
+        self._check_index(index)
+        self._levels[0][index] = _hash_leaf(tx_id)
+        self._update_path(index)
+
+    def _check_index(self, index: int):
+        if not isinstance(index, int) or not 0 <= index < len(self):
+            raise ValueError(f"Индекс листа вне диапазона: {index}")
+
+    def _update_path(self, index: int):
+        level_number = 0
+        while len(self._levels[level_number]) > 1:
+            if level_number + 1 == len(self._levels):
+                self._levels.append([])
+            parent = index // 2
+            node = self._combine(self._levels[level_number], parent * 2)
+            upper = self._levels[level_number + 1]
+            if parent < len(upper):
+                upper[parent] = node
+            else:
+                upper.append(node)
+            index = parent
+            level_number += 1
+
+    def proof(self, index: int) -> List[ProofStep]:
+        """Строит доказательство включения листа с указанным индексом."""
+        self._check_index(index)
+        steps: List[ProofStep] = []
+        for level in self._levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                steps.append((level[sibling], sibling < index))
+            index //= 2
+        return steps
+
+    @staticmethod
+    def verify_proof(tx_id: str, proof: List[ProofStep], root: bytes) -> bool:
+        """Проверяет, что tx_id входит в дерево с данным корнем."""
+        node = _hash_leaf(tx_id)
+        for sibling, sibling_is_left in proof:
+            node = _hash_node(sibling, node) if sibling_is_left else _hash_node(node, sibling)
+        return node == root
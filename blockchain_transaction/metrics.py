@@ -0,0 +1,150 @@
+import threading
+import time
+from typing import Dict, Sequence, Tuple
+
+# Границы корзин гистограммы задержек, в секундах.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0
+)
+
+
+class Histogram:
+    """Гистограмма задержек с фиксированными корзинами (накопительные, как в Prometheus)."""
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Последняя корзина - +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Dict[str, int]:
+        """Накопительные счетчики по корзинам, ключ - верхняя граница (le)."""
+        result = {}
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result["+Inf" if bound == float("inf") else repr(bound)] = total
+        return result
+
+
+class _NullStage:
+    """Пустой контекст замера, используемый при выключенной инструментации."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('_instrumentation', '_name', '_started')
+
+    def __init__(self, instrumentation: "Instrumentation", name: str):
+        self._instrumentation = instrumentation
+        self._name = name
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._instrumentation.observe(self._name, time.perf_counter() - self._started)
+        return False
+
+
+class Instrumentation:
+    """
+    Необязательная инструментация горячих участков: счетчики и гистограммы
+    задержек по стадиям. По умолчанию выключена; в выключенном состоянии
+    stage() возвращает общий пустой контекст и ничего не измеряет.
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.enabled = False
+        self._buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Сбрасывает все накопленные значения."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def stage(self, name: str):
+        """Контекст замера времени стадии name."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def observe(self, name: str, seconds: float):
+        """Добавляет измерение длительности стадии."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self._buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, value: int = 1):
+        """Увеличивает счетчик события, если инструментация включена."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        """Снимок метрик в виде словаря."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "stages": {
+                    name: {
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": histogram.cumulative(),
+                    }
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "blockchain_tx") -> str:
+        """Метрики в текстовом формате Prometheus."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_events_total Число событий по типам.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        lines.append(f"# HELP {prefix}_stage_seconds Длительность стадий обработки транзакций.")
+        lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+        for name, stage in sorted(snapshot["stages"].items()):
+            for bound, count in stage["buckets"].items():
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {stage["sum"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+# Общая инструментация, используемая Transaction.
+metrics = Instrumentation()
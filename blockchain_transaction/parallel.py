@@ -0,0 +1,223 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .address import default_registry
+from .keys import Signer
+from .metrics import metrics
+from .transaction import Transaction
+from .verification_cache import verification_cache
+
+# Ниже этого размера пакета накладные расходы на пул процессов
+# превышают выигрыш от параллелизма. Замер: отправка пакета в уже
+# запущенный пул стоит ~1.5 мс плюс ~13 мкс на пару (pickle), проверка
+# RSA-PSS — ~60 мкс; окупаемость около 50 пар на 4 процессах и около 90
+# на 2, порог взят с запасом.
+DEFAULT_SERIAL_THRESHOLD = 128
+# sign_many запускает пул на каждый вызов (~15-20 мс), но подпись RSA-PSS
+# дороже проверки (~0.5 мс): окупаемость около 50-60 транзакций.
+DEFAULT_SIGN_SERIAL_THRESHOLD = 64
+
+VerifyPair = Tuple[Transaction, str]
+
+
+# Пулы проверки подписей переиспользуются между вызовами verify_many
+# (в том числе между волнами validate_batch_in_waves): запуск процессов
+# стоит десятки миллисекунд. Ключ — (pid, workers), чтобы дочерний процесс
+# после fork не пользовался пулом родителя.
+_verify_pools: Dict[Tuple[int, int], ProcessPoolExecutor] = {}
+_verify_pools_lock = threading.Lock()
+
+
+def _get_verify_pool(workers: int) -> ProcessPoolExecutor:
+    key = (os.getpid(), workers)
+    with _verify_pools_lock:
+        executor = _verify_pools.get(key)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            _verify_pools[key] = executor
+        return executor
+
+
+def _discard_verify_pool(workers: int, executor: ProcessPoolExecutor):
+    """Убирает сломанный пул (например, после гибели рабочего процесса)."""
+    with _verify_pools_lock:
+        key = (os.getpid(), workers)
+        if _verify_pools.get(key) is executor:
+            del _verify_pools[key]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools():
+    """
+    Останавливает пулы процессов, переиспользуемые verify_many.
+    Вызывается при выходе из интерпретатора; следующий вызов verify_many
+    создаст пул заново.
+    """
+    with _verify_pools_lock:
+        pid = os.getpid()
+        executors = [executor for (owner, _), executor in _verify_pools.items() if owner == pid]
+        _verify_pools.clear()
+    for executor in executors:
+        executor.shutdown()
+
+
+atexit.register(shutdown_pools)
+
+
+# Подписывающий рабочего процесса, создается один раз в _init_signer_worker.
+_worker_signer: Optional[Signer] = None
+
+
+def _init_signer_worker(private_key_pem: str):
+    global _worker_signer
+    _worker_signer = Signer(private_key_pem)
+
+
+def _sign_chunk(chunk: Sequence[bytes]) -> List[bytes]:
+    """Подписывает хэши части пакета ключом рабочего процесса."""
+    return [_worker_signer.sign(data) for data in chunk]
+
+
+def _verify_chunk(chunk: Sequence[VerifyPair]) -> List[bool]:
+    """Проверяет часть пакета в рабочем процессе."""
+    return [tx.verify_signature(public_key_pem) for tx, public_key_pem in chunk]
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError("workers должен быть положительным целым числом")
+    return workers
+
+
+def _split_chunks(pairs: Sequence, workers: int,
+                  chunk_size: Optional[int]) -> List[Tuple[int, Sequence]]:
+    """Делит пакет на части, запоминая индекс начала каждой части."""
+    if chunk_size is None:
+        # Несколько частей на процесс, чтобы выровнять нагрузку.
+        chunk_size = max(1, -(-len(pairs) // (workers * 4)))
+    elif not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError("chunk_size должен быть положительным целым числом")
+    return [(start, pairs[start:start + chunk_size])
+            for start in range(0, len(pairs), chunk_size)]
+
+
+def iter_verify_many(pairs: Iterable[VerifyPair], workers: Optional[int] = None,
+                     serial_threshold: int = DEFAULT_SERIAL_THRESHOLD,
+                     chunk_size: Optional[int] = None) -> Iterator[Tuple[int, bool]]:
+    """
+    Проверяет подписи пакета транзакций и выдает пары (индекс, результат)
+    по мере готовности. Порядок выдачи не гарантирован.
+    Небольшие пакеты (меньше serial_threshold) и workers=1 проверяются
+    последовательно в текущем процессе. Пул процессов создается при первом
+    вызове и переиспользуется (см. shutdown_pools).
+    Адреса-отпечатки разрешаются через default_registry в текущем процессе:
+    при запуске процессов через spawn реестр рабочих процессов пуст.
+    Пары, найденные в verification_cache, не передаются в пул, а успешные
+    проверки рабочих процессов запоминаются в кэше текущего процесса.
+    """
+    pairs = list(pairs)
+    workers = _resolve_workers(workers)
+
+    if workers == 1 or len(pairs) < serial_threshold:
+        for index, (tx, public_key_pem) in enumerate(pairs):
+            yield index, tx.verify_signature(public_key_pem)
+        return
+
+    use_cache = verification_cache.enabled
+    # (индекс пары, транзакция, PEM, tx_id для кэша или None)
+    pending: List[Tuple[int, Transaction, Optional[str], Optional[str]]] = []
+    for index, (tx, public_key_pem) in enumerate(pairs):
+        if public_key_pem:
+            public_key_pem = default_registry.resolve_key(public_key_pem)
+        cache_tx_id = None
+        if use_cache and public_key_pem and tx.signature and not tx.is_coinbase():
+            cache_tx_id = tx._verification_cache_key()
+            if verification_cache.lookup(cache_tx_id, public_key_pem):
+                metrics.increment("verify_cache_hit")
+                yield index, True
+                continue
+        pending.append((index, tx, public_key_pem, cache_tx_id))
+    if not pending:
+        return
+
+    chunks = _split_chunks([(tx, public_key_pem) for _, tx, public_key_pem, _ in pending], workers, chunk_size)
+    executor = _get_verify_pool(workers)
+    futures = {}
+    try:
+        for start, chunk in chunks:
+            futures[executor.submit(_verify_chunk, chunk)] = start
+        for future in as_completed(futures):
+            start = futures[future]
+            for offset, result in enumerate(future.result()):
+                index, _, public_key_pem, cache_tx_id = pending[start + offset]
+                if result and cache_tx_id is not None:
+                    verification_cache.remember(cache_tx_id, public_key_pem)
+                yield index, result
+    except BrokenProcessPool:
+        _discard_verify_pool(workers, executor)
+        raise
+    finally:
+        # Пул общий: части брошенного на середине пакета не должны его занимать.
+        for future in futures:
+            future.cancel()
+
+
+def verify_many(pairs: Iterable[VerifyPair], workers: Optional[int] = None,
+                serial_threshold: int = DEFAULT_SERIAL_THRESHOLD,
+                chunk_size: Optional[int] = None) -> List[bool]:
+    """
+    Проверяет подписи пакета пар (транзакция, публичный ключ PEM отправителя)
+    в пуле процессов. Возвращает список результатов в порядке входных пар.
+    """
+    pairs = list(pairs)
+    results: List[bool] = [False] * len(pairs)
+    for index, result in iter_verify_many(pairs, workers=workers,
+                                          serial_threshold=serial_threshold,
+                                          chunk_size=chunk_size):
+        results[index] = result
+    return results
+
+
+def sign_many(transactions: Iterable[Transaction], signer: Signer, workers: Optional[int] = None,
+              serial_threshold: int = DEFAULT_SIGN_SERIAL_THRESHOLD,
+              chunk_size: Optional[int] = None) -> List[Transaction]:
+    """
+    Подписывает пакет транзакций одним ключом в пуле процессов.
+    Каждый рабочий процесс разбирает ключ один раз при запуске; в процессы
+    передаются только хэши транзакций, а подписи и финальные tx_id
+    устанавливаются на исходных объектах. Возвращает список транзакций.
+    Пул не переиспользуется, чтобы приватный ключ не оставался в рабочих
+    процессах после вызова.
+    Если какая-либо транзакция уже подписана или ее схема не совпадает со
+    схемой ключа, ValueError выбрасывается до начала подписи.
+    """
+    transactions = list(transactions)
+    workers = _resolve_workers(workers)
+    for tx in transactions:
+        if tx.signature is not None:
+            raise ValueError(f"Транзакция уже подписана: {tx.tx_id}")
+        if tx.scheme != signer.scheme.name:
+            raise ValueError(f"Ключ не соответствует схеме подписи транзакции: {tx.scheme}")
+
+    if workers == 1 or len(transactions) < serial_threshold:
+        for tx in transactions:
+            tx.sign(signer)
+        return transactions
+
+    hashes = [tx._calculate_initial_hash().encode('utf-8') for tx in transactions]
+    chunks = _split_chunks(hashes, workers, chunk_size)
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             initializer=_init_signer_worker,
+                             initargs=(signer.private_key_pem,)) as executor:
+        futures = {executor.submit(_sign_chunk, chunk): start for start, chunk in chunks}
+        for future in as_completed(futures):
+            start = futures[future]
+            for offset, signature in enumerate(future.result()):
+                transactions[start + offset]._attach_signature(signature)
+    return transactions
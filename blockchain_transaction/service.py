@@ -0,0 +1,214 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .transaction import Transaction
+
+# Элемент очереди: (словарь транзакции, ключ отправителя, future результата, время постановки).
+_QueueItem = Tuple[dict, Optional[str], asyncio.Future, float]
+
+
+class ValidationResult(NamedTuple):
+    """Результат проверки транзакции сервисом."""
+    valid: bool
+    transaction: Optional[Transaction]
+    error: Optional[str]
+
+
+def _validate_one(tx_data: dict, sender_public_key_pem: Optional[str]) -> ValidationResult:
+    # Ошибка в одном запросе (любого типа) не должна влиять на остальные запросы пакета.
+    try:
+        tx = Transaction.from_dict(tx_data)
+    except Exception as e:
+        return ValidationResult(False, None, f"Некорректные данные транзакции: {e}")
+    if sender_public_key_pem is not None:
+        try:
+            valid = tx.verify_signature(sender_public_key_pem)
+        except Exception as e:
+            return ValidationResult(False, tx, f"Ошибка проверки подписи: {e}")
+        if not valid:
+            return ValidationResult(False, tx, "Подпись транзакции неверна")
+    return ValidationResult(True, tx, None)
+
+
+def validate_batch(items: List[Tuple[dict, Optional[str]]]) -> List[ValidationResult]:
+    """Разбирает и проверяет пакет транзакций; выполняется в исполнителе."""
+    return [_validate_one(tx_data, public_key_pem) for tx_data, public_key_pem in items]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class ValidationService:
+    """
+    Асинхронный фронтенд проверки транзакций.
+    Запросы validate() собираются в микропакеты (до batch_size запросов или
+    max_batch_delay секунд ожидания), разбор и проверка подписи выполняются
+    в ограниченном исполнителе, поэтому цикл событий не блокируется.
+    Когда очередь заполнена, validate() ждет свободного места (backpressure),
+    а validate_nowait() выбрасывает asyncio.QueueFull.
+    """
+    def __init__(self, max_queue: int = 10_000, batch_size: int = 64,
+                 max_batch_delay: float = 0.002, executor: Optional[Executor] = None,
+                 max_workers: int = 4, latency_window: int = 10_000):
+        if not isinstance(max_queue, int) or max_queue < 1:
+            raise ValueError("max_queue должен быть положительным целым числом")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size должен быть положительным целым числом")
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_workers = max_workers
+        self._max_queue = max_queue
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._processed = 0
+        self._batches = 0
+
+    async def start(self):
+        """Запускает фоновую задачу формирования пакетов."""
+        if self._batcher is not None:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        # Не больше пакетов в работе, чем рабочих: остальные ждут в очереди.
+        self._inflight = asyncio.Semaphore(self.max_workers)
+        self._batcher = asyncio.create_task(self._run_batcher())
+
+    async def stop(self):
+        """Дожидается обработки очереди и останавливает сервис."""
+        if self._batcher is None:
+            return
+        await self._queue.join()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        self._batcher = None
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks)
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "ValidationService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def _check_started(self):
+        if self._batcher is None:
+            raise RuntimeError("Сервис проверки не запущен")
+
+    async def validate(self, tx_data: dict, sender_public_key_pem: Optional[str] = None) -> ValidationResult:
+        """
+        Разбирает транзакцию и, если передан ключ отправителя, проверяет подпись.
+        Ожидает свободного места в очереди, если она заполнена.
+        """
+        self._check_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((tx_data, sender_public_key_pem, future, time.perf_counter()))
+        return await future
+
+    def validate_nowait(self, tx_data: dict, sender_public_key_pem: Optional[str] = None) -> asyncio.Future:
+        """Ставит транзакцию в очередь без ожидания; при заполненной очереди - asyncio.QueueFull."""
+        self._check_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((tx_data, sender_public_key_pem, future, time.perf_counter()))
+        return future
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_QueueItem] = [await self._queue.get()]
+            deadline = loop.time() + self.max_batch_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._process_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _process_batch(self, batch: List[_QueueItem]):
+        loop = asyncio.get_running_loop()
+        try:
+            payload = [(tx_data, public_key_pem) for tx_data, public_key_pem, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, validate_batch, payload)
+            except Exception as e:
+                results = [ValidationResult(False, None, f"Ошибка проверки: {e}")] * len(batch)
+            finished = time.perf_counter()
+            for (_, _, future, enqueued), result in zip(batch, results):
+                self._latencies.append(finished - enqueued)
+                if not future.done():
+                    future.set_result(result)
+            self._processed += len(batch)
+            self._batches += 1
+        finally:
+            self._inflight.release()
+            for _ in batch:
+                self._queue.task_done()
+
+    def metrics(self) -> Dict[str, float]:
+        """Глубина очереди, счетчики и перцентили задержки (в секундах)."""
+        latencies = sorted(self._latencies)
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "processed": self._processed,
+            "batches": self._batches,
+            "latency_p50": _percentile(latencies, 0.50),
+            "latency_p95": _percentile(latencies, 0.95),
+            "latency_p99": _percentile(latencies, 0.99),
+        }
+
+
+async def run_load_test(service: ValidationService,
+                        requests: Iterable[Tuple[dict, Optional[str]]],
+                        concurrency: int = 100) -> Dict[str, float]:
+    """
+    Локальная нагрузочная проверка: отправляет запросы в запущенный сервис
+    с заданным числом одновременных клиентов и возвращает метрики сервиса
+    вместе с пропускной способностью.
+    """
+    requests = list(requests)
+    position = 0
+    valid = 0
+
+    async def client():
+        nonlocal position, valid
+        while position < len(requests):
+            tx_data, public_key_pem = requests[position]
+            position += 1
+            result = await service.validate(tx_data, public_key_pem)
+            valid += result.valid
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    seconds = time.perf_counter() - started
+
+    metrics = service.metrics()
+    metrics["requests"] = len(requests)
+    metrics["valid"] = valid
+    metrics["seconds"] = seconds
+    metrics["tx_per_second"] = len(requests) / seconds if seconds > 0 else 0.0
+    return metrics
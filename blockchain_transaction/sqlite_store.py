@@ -0,0 +1,248 @@
+"""
+Встроенное хранилище транзакций на SQLite (без отдельного сервера БД).
+
+Схема нормализована:
+
+    transactions  id, tx_id (уникальный индекс), timestamp, scheme, preimage_format, signature
+    addresses     id, address (уникальный индекс)
+    inputs        tx_row, position, previous_tx_id, output_index
+                  индекс (previous_tx_id, output_index) - поиск потратившей транзакции
+    outputs       tx_row, output_index, address_id, units, amount
+                  индекс (address_id) - выходы адреса
+
+Суммы хранятся в базовых единицах (TransactionOutput.units); столбец amount
+заполняется только для сумм, которые не восстанавливаются из units без
+потерь (иначе изменились бы tx_id и прообраз подписи). По той же причине
+столбец timestamp объявлен без типа: SQLite сохраняет целую метку времени
+как INTEGER, а дробную - как REAL. База открывается в режиме WAL;
+пакетная вставка выполняется через executemany в одной транзакции SQLite.
+"""
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .filters import extend_filter
+from .transaction import Transaction
+from .transaction_input import TransactionInput
+from .transaction_output import TransactionOutput
+from .utxo import Outpoint
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    tx_id TEXT NOT NULL UNIQUE,
+    timestamp NOT NULL,
+    scheme TEXT NOT NULL,
+    preimage_format TEXT NOT NULL,
+    signature BLOB
+);
+CREATE TABLE IF NOT EXISTS addresses (
+    id INTEGER PRIMARY KEY,
+    address TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS inputs (
+    tx_row INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    previous_tx_id TEXT NOT NULL,
+    output_index INTEGER NOT NULL,
+    PRIMARY KEY (tx_row, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS inputs_outpoint ON inputs (previous_tx_id, output_index);
+CREATE TABLE IF NOT EXISTS outputs (
+    tx_row INTEGER NOT NULL,
+    output_index INTEGER NOT NULL,
+    address_id INTEGER NOT NULL,
+    units INTEGER NOT NULL,
+    amount REAL,
+    PRIMARY KEY (tx_row, output_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS outputs_address ON outputs (address_id);
+"""
+
+def _output(address: str, units: int, amount: Optional[float]) -> TransactionOutput:
+    if amount is None:
+        return TransactionOutput.from_units(address, units)
+    return TransactionOutput.from_trusted(address, amount)
+
+
+# Ограничение числа параметров запроса в старых версиях SQLite.
+_QUERY_CHUNK = 500
+
+
+class SQLiteTransactionStore:
+    """
+    Хранилище транзакций в файле SQLite с нормализованными таблицами
+    входов и выходов. Отвечает на запросы "кто потратил выход" и
+    "непотраченные выходы адреса" поиском по индексам.
+    Объект не потокобезопасен: каждому потоку нужен свой экземпляр.
+
+    Необязательные фильтры (BloomFilter или CuckooFilter) стоят перед
+    запросами: tx_filter с ключами tx_id - перед поиском транзакции,
+    spent_filter с ключами outpoint - перед spender_of. Большинство
+    запросов об отсутствующих ключах не обращаются к базе. Пустые фильтры
+    заполняются из базы при открытии.
+    """
+    def __init__(self, path: str, tx_filter=None, spent_filter=None):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # В режиме WAL synchronous=NORMAL не нарушает целостность базы.
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        self._address_ids: Dict[str, int] = {}
+
+        self.tx_filter = tx_filter
+        self.spent_filter = spent_filter
+        if tx_filter is not None and not len(tx_filter):
+            self.tx_filter = extend_filter(tx_filter, (
+                row[0] for row in self._connection.execute("SELECT tx_id FROM transactions")))
+        if spent_filter is not None and not len(spent_filter):
+            self.spent_filter = extend_filter(spent_filter, self._connection.execute(
+                "SELECT previous_tx_id, output_index FROM inputs"))
+
+    # --- Запись ---
+
+    def add(self, tx: Transaction) -> bool:
+        """Добавляет транзакцию. Возвращает False, если она уже сохранена."""
+        return self.add_many([tx]) == 1
+
+    def _existing_tx_ids(self, tx_ids: List[str]) -> set:
+        existing = set()
+        for start in range(0, len(tx_ids), _QUERY_CHUNK):
+            chunk = tx_ids[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            existing.update(row[0] for row in self._connection.execute(
+                f"SELECT tx_id FROM transactions WHERE tx_id IN ({placeholders})", chunk))
+        return existing
+
+    def _resolve_address_ids(self, addresses: Iterable[str]):
+        """Заполняет кэш address -> id, добавляя новые адреса."""
+        missing = [address for address in set(addresses) if address not in self._address_ids]
+        if not missing:
+            return
+        self._connection.executemany("INSERT OR IGNORE INTO addresses (address) VALUES (?)",
+                                     ((address,) for address in missing))
+        for start in range(0, len(missing), _QUERY_CHUNK):
+            chunk = missing[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            self._address_ids.update(self._connection.execute(
+                f"SELECT address, id FROM addresses WHERE address IN ({placeholders})", chunk))
+
+    def add_many(self, transactions: Iterable[Transaction]) -> int:
+        """
+        Добавляет пакет транзакций в одной транзакции SQLite (executemany).
+        Уже сохраненные и повторяющиеся транзакции пропускаются.
+        Возвращает число добавленных транзакций.
+        """
+        pending: Dict[str, Transaction] = {}
+        for tx in transactions:
+            pending.setdefault(tx.tx_id, tx)
+        if not pending:
+            return 0
+
+        connection = self._connection
+        try:
+            with connection:
+                # Блокировка записи сразу: проверка дубликатов и выбор id
+                # не пересекаются с другими писателями.
+                connection.execute("BEGIN IMMEDIATE")
+                candidates = [tx_id for tx_id in pending if not self._filtered_out(tx_id)]
+                for tx_id in self._existing_tx_ids(candidates):
+                    del pending[tx_id]
+                if not pending:
+                    return 0
+                self._resolve_address_ids(out.recipient_address_pubkey_pem
+                                          for tx in pending.values() for out in tx.outputs)
+                (next_row,) = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM transactions").fetchone()
+
+                transaction_rows = []
+                input_rows = []
+                output_rows = []
+                address_ids = self._address_ids
+                for row, (tx_id, tx) in enumerate(pending.items(), start=next_row):
+                    transaction_rows.append((row, tx_id, tx.timestamp, tx.scheme,
+                                             tx.preimage_format, tx.signature))
+                    input_rows.extend((row, position, inp.previous_tx_id, inp.output_index)
+                                      for position, inp in enumerate(tx.inputs))
+                    output_rows.extend((row, index, address_ids[out.recipient_address_pubkey_pem], out.units,
+                                        None if out.has_exact_units() else out.amount)
+                                       for index, out in enumerate(tx.outputs))
+
+                connection.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)", transaction_rows)
+                connection.executemany("INSERT INTO inputs VALUES (?, ?, ?, ?)", input_rows)
+                connection.executemany("INSERT INTO outputs VALUES (?, ?, ?, ?, ?)", output_rows)
+        except sqlite3.Error:
+            # Адреса, добавленные в откаченной транзакции, не сохранились.
+            self._address_ids.clear()
+            raise
+        self.tx_filter = extend_filter(self.tx_filter, pending)
+        self.spent_filter = extend_filter(self.spent_filter, (
+            inp.outpoint for tx in pending.values() for inp in tx.inputs))
+        return len(pending)
+
+    # --- Чтение ---
+
+    def _filtered_out(self, tx_id: str) -> bool:
+        """True, если фильтр гарантирует отсутствие транзакции."""
+        return self.tx_filter is not None and tx_id not in self.tx_filter
+
+    def __contains__(self, tx_id: str) -> bool:
+        if self._filtered_out(tx_id):
+            return False
+        return self._connection.execute(
+            "SELECT 1 FROM transactions WHERE tx_id = ?", (tx_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def get(self, tx_id: str) -> Optional[Transaction]:
+        """Возвращает транзакцию по tx_id или None."""
+        if self._filtered_out(tx_id):
+            return None
+        row = self._connection.execute(
+            "SELECT id, timestamp, scheme, preimage_format, signature FROM transactions WHERE tx_id = ?",
+            (tx_id,)).fetchone()
+        if row is None:
+            return None
+        tx_row, timestamp, scheme, preimage_format, signature = row
+        inputs = [TransactionInput.from_trusted(previous_tx_id, output_index)
+                  for previous_tx_id, output_index in self._connection.execute(
+                      "SELECT previous_tx_id, output_index FROM inputs WHERE tx_row = ? ORDER BY position",
+                      (tx_row,))]
+        outputs = [_output(address, units, amount)
+                   for address, units, amount in self._connection.execute(
+                       "SELECT a.address, o.units, o.amount FROM outputs o JOIN addresses a ON a.id = o.address_id "
+                       "WHERE o.tx_row = ? ORDER BY o.output_index", (tx_row,))]
+        return Transaction.from_trusted(inputs, outputs, timestamp, signature=signature, tx_id=tx_id,
+                                        preimage_format=preimage_format, scheme=scheme)
+
+    def spender_of(self, tx_id: str, output_index: int) -> Optional[str]:
+        """tx_id сохраненной транзакции, потратившей выход, или None."""
+        if self.spent_filter is not None and (tx_id, output_index) not in self.spent_filter:
+            return None
+        row = self._connection.execute(
+            "SELECT t.tx_id FROM inputs i JOIN transactions t ON t.id = i.tx_row "
+            "WHERE i.previous_tx_id = ? AND i.output_index = ? LIMIT 1",
+            (tx_id, output_index)).fetchone()
+        return row[0] if row is not None else None
+
+    def unspent_outputs(self, address: str) -> List[Tuple[Outpoint, TransactionOutput]]:
+        """Непотраченные (ни одной сохраненной транзакцией) выходы адреса."""
+        rows = self._connection.execute(
+            "SELECT t.tx_id, o.output_index, o.units, o.amount FROM addresses a "
+            "JOIN outputs o ON o.address_id = a.id "
+            "JOIN transactions t ON t.id = o.tx_row "
+            "WHERE a.address = ? AND NOT EXISTS ("
+            "    SELECT 1 FROM inputs i WHERE i.previous_tx_id = t.tx_id AND i.output_index = o.output_index"
+            ") ORDER BY o.tx_row, o.output_index",
+            (address,))
+        return [((tx_id, index), _output(address, units, amount)) for tx_id, index, units, amount in rows]
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self) -> "SQLiteTransactionStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,426 @@
+"""
+Хранилище транзакций только для добавления (append-only).
+
+Каталог хранилища содержит файлы:
+
+    transactions.dat                сегмент записей: [длина u32][crc32 u32][tx_id 32 байта][to_bytes()]
+    transactions.<start>-<end>.idx  отсортированный прогон индекса для mmap:
+                                    [magic 4][версия u8][число записей u64][конец покрытой части u64]
+                                    и записи [tx_id 32 байта][смещение записи u64] для записей
+                                    сегмента со смещениями в [start, end)
+
+Индекс, сохраненный прежними версиями в одном файле transactions.idx,
+читается как прогон с start = 0.
+
+Записи, добавленные после последнего сохранения индекса, хранятся в памяти
+(не больше max_pending, затем индекс сохраняется автоматически) и
+восстанавливаются при открытии сканированием хвоста сегмента через mmap;
+неполная или поврежденная последняя запись (сбой во время записи) отрезается.
+Каждое сохранение записывает новый прогон, а INDEX_FANOUT соседних прогонов
+одного уровня сливаются в один (как в LSM-дереве), поэтому запись индекса
+переписывается O(log(n / max_pending)) раз, а не при каждом сохранении.
+"""
+import heapq
+import mmap
+import os
+import re
+import struct
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .filters import extend_filter
+from .transaction import Transaction
+from .views import TransactionView
+
+DATA_FILE = "transactions.dat"
+# Индекс одним файлом (формат прежних версий).
+INDEX_FILE = "transactions.idx"
+_RUN_FILE = re.compile(r"transactions\.(\d+)-(\d+)\.idx(\.tmp)?")
+
+_RECORD_HEADER = struct.Struct(">II32s")
+_INDEX_MAGIC = b"TXIX"
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct(">4sBQQ")
+_INDEX_ENTRY = struct.Struct(">32sQ")
+_DIGEST_SIZE = 32
+# Число записей в памяти, после которого индекс сохраняется автоматически (около 150 МБ).
+DEFAULT_MAX_PENDING = 1_000_000
+# Число прогонов одного уровня, которые сливаются в прогон следующего уровня.
+# Поиск просматривает до (INDEX_FANOUT - 1) прогонов на уровень.
+INDEX_FANOUT = 4
+
+
+def _tx_id_to_digest(tx_id: str) -> bytes:
+    try:
+        digest = bytes.fromhex(tx_id)
+    except (TypeError, ValueError):
+        digest = b""
+    if len(digest) != _DIGEST_SIZE:
+        raise ValueError(f"tx_id должен быть SHA256 в шестнадцатеричном виде: {tx_id!r}")
+    return digest
+
+
+class _IndexRun:
+    """Отсортированный прогон индекса, отображенный в память (записи сегмента в [start, end))."""
+    def __init__(self, path: str, start: int):
+        self.path = path
+        self.start = start
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _INDEX_HEADER.size:
+                raise ValueError("Файл индекса хранилища поврежден")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.count, self.end = _INDEX_HEADER.unpack_from(self._map, 0)
+            if (magic != _INDEX_MAGIC or version != _INDEX_VERSION or self.end < start
+                    or size != _INDEX_HEADER.size + self.count * _INDEX_ENTRY.size):
+                self._map.close()
+                raise ValueError("Файл индекса хранилища поврежден")
+        except BaseException:
+            self._file.close()
+            raise
+
+    def find(self, digest: bytes) -> Optional[int]:
+        index_map = self._map
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            position = _INDEX_HEADER.size + middle * _INDEX_ENTRY.size
+            entry_digest = index_map[position:position + _DIGEST_SIZE]
+            if entry_digest < digest:
+                low = middle + 1
+            elif entry_digest > digest:
+                high = middle
+            else:
+                return _INDEX_ENTRY.unpack_from(index_map, position)[1]
+        return None
+
+    def entries(self) -> Iterator[Tuple[bytes, int]]:
+        for i in range(self.count):
+            yield _INDEX_ENTRY.unpack_from(self._map, _INDEX_HEADER.size + i * _INDEX_ENTRY.size)
+
+    def digests(self) -> Iterator[bytes]:
+        for i in range(self.count):
+            position = _INDEX_HEADER.size + i * _INDEX_ENTRY.size
+            yield self._map[position:position + _DIGEST_SIZE]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class TransactionStore:
+    """
+    Хранилище транзакций с поиском по tx_id через отсортированный индекс,
+    отображенный в память (mmap). Поиск выполняет двоичный поиск по
+    индексу за O(log n) без загрузки индекса в память.
+
+    Необязательный tx_filter (BloomFilter или CuckooFilter с ключами tx_id
+    в нижнем регистре) отвечает на большинство запросов об отсутствующих
+    транзакциях без обращения к индексу. Пустой фильтр заполняется ключами
+    хранилища при открытии; сохраненный ранее фильтр должен соответствовать
+    хранилищу.
+
+    Когда в памяти накапливается max_pending непроиндексированных записей,
+    индекс сохраняется (flush_index), поэтому память не растет с размером
+    хранилища. Индекс состоит из нескольких отсортированных прогонов (см.
+    INDEX_FANOUT); compact_index() сливает их в один.
+    """
+    def __init__(self, directory: str, tx_filter=None, max_pending: int = DEFAULT_MAX_PENDING):
+        if not isinstance(max_pending, int) or max_pending < 1:
+            raise ValueError("max_pending должен быть положительным целым числом")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._data_path = os.path.join(directory, DATA_FILE)
+
+        self._data_file = open(self._data_path, "a+b")
+        self._data_map: Optional[mmap.mmap] = None
+        # Прогоны индекса от старых к новым; их диапазоны идут подряд с нуля.
+        self._runs: List[_IndexRun] = []
+        self._index_count = 0
+        self._indexed_length = 0
+        self._pending: Dict[bytes, int] = {}
+        self.max_pending = max_pending
+
+        self._open_index()
+        self._recover_tail()
+        self._remap_data()
+        self._flush_index_if_full()
+
+        self.tx_filter = tx_filter
+        if tx_filter is not None and not len(tx_filter) and len(self):
+            self.tx_filter = extend_filter(tx_filter, (digest.hex() for digest in self._iter_digests()))
+
+    # --- Открытие и восстановление ---
+
+    def _open_index(self):
+        runs = []
+        try:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                match = _RUN_FILE.fullmatch(name)
+                if name == INDEX_FILE:
+                    runs.append(_IndexRun(path, 0))
+                elif match and match.group(3):
+                    os.remove(path) # Недописанный прогон
+                elif match:
+                    runs.append(_IndexRun(path, int(match.group(1))))
+
+            runs.sort(key=lambda run: (run.start, -run.end))
+            for run in runs:
+                if self._runs and run.end <= self._runs[-1].end:
+                    # Прогон уже слит в более широкий: слияние прервалось до удаления исходных.
+                    run.close()
+                    os.remove(run.path)
+                    continue
+                if run.start != self._indexed_length:
+                    raise ValueError("Файл индекса хранилища поврежден")
+                self._runs.append(run)
+                self._indexed_length = run.end
+        except BaseException:
+            for run in runs:
+                run.close()
+            self._runs = []
+            raise
+        self._index_count = sum(run.count for run in self._runs)
+
+    def _recover_tail(self):
+        """Индексирует записи после покрытой индексом части и отрезает неполный хвост."""
+        self._data_file.seek(0, os.SEEK_END)
+        data_length = self._data_file.tell()
+        if data_length < self._indexed_length:
+            raise ValueError("Сегмент данных короче, чем указано в индексе")
+
+        # Хвост читается через отображение в память, а не целиком в буфер.
+        offset = self._indexed_length
+        if data_length > offset:
+            with mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ) as data_map:
+                view = memoryview(data_map)
+                try:
+                    while offset + _RECORD_HEADER.size <= data_length:
+                        length, crc, digest = _RECORD_HEADER.unpack_from(data_map, offset)
+                        payload_start = offset + _RECORD_HEADER.size
+                        payload_end = payload_start + length
+                        if payload_end > data_length or zlib.crc32(view[payload_start:payload_end]) != crc:
+                            break
+                        self._pending[digest] = offset
+                        offset = payload_end
+                finally:
+                    view.release()
+
+        if offset != data_length:
+            self._data_file.truncate(offset)
+            self._data_file.flush()
+            os.fsync(self._data_file.fileno())
+
+    def _remap_data(self):
+        self._data_file.flush()
+        size = os.fstat(self._data_file.fileno()).st_size
+        # Старое отображение не закрывается явно: на него могут ссылаться
+        # memoryview, выданные get_bytes().
+        self._data_map = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    # --- Запись ---
+
+    def append(self, tx: Transaction) -> int:
+        """Добавляет транзакцию и возвращает смещение записи."""
+        return self.append_many([tx])[0]
+
+    def append_many(self, transactions: Iterable[Transaction]) -> List[int]:
+        """
+        Добавляет пакет транзакций одной записью в файл с одним fsync.
+        Уже сохраненные транзакции не дублируются: для них возвращается
+        смещение существующей записи.
+        """
+        self._data_file.seek(0, os.SEEK_END)
+        offset = self._data_file.tell()
+        parts = []
+        offsets = []
+        added: Dict[bytes, int] = {}
+        for tx in transactions:
+            digest = _tx_id_to_digest(tx.tx_id)
+            existing = added.get(digest)
+            if existing is None and not self._filtered_out(tx.tx_id):
+                existing = self._find(digest)
+            if existing is not None:
+                offsets.append(existing)
+                continue
+            payload = tx.to_bytes()
+            parts.append(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload), digest))
+            parts.append(payload)
+            added[digest] = offset
+            offsets.append(offset)
+            offset += _RECORD_HEADER.size + len(payload)
+
+        if parts:
+            self._data_file.write(b"".join(parts))
+            self._data_file.flush()
+            os.fsync(self._data_file.fileno())
+            self._pending.update(added)
+            self._remap_data()
+            self.tx_filter = extend_filter(self.tx_filter, (digest.hex() for digest in added))
+            self._flush_index_if_full()
+        return offsets
+
+    def _flush_index_if_full(self):
+        if len(self._pending) >= self.max_pending:
+            self.flush_index()
+
+    # --- Чтение ---
+
+    def _iter_digests(self) -> Iterator[bytes]:
+        for run in self._runs:
+            yield from run.digests()
+        yield from self._pending
+
+    def _find(self, digest: bytes) -> Optional[int]:
+        offset = self._pending.get(digest)
+        if offset is None:
+            # Новые прогоны меньше, и недавние транзакции запрашивают чаще.
+            for run in reversed(self._runs):
+                offset = run.find(digest)
+                if offset is not None:
+                    break
+        return offset
+
+    def _filtered_out(self, tx_id: str) -> bool:
+        """True, если фильтр гарантирует отсутствие транзакции."""
+        return self.tx_filter is not None and isinstance(tx_id, str) and tx_id not in self.tx_filter
+
+    def __contains__(self, tx_id: str) -> bool:
+        if self._filtered_out(tx_id):
+            return False
+        try:
+            return self._find(_tx_id_to_digest(tx_id)) is not None
+        except ValueError:
+            return False
+
+    def __len__(self) -> int:
+        return self._index_count + len(self._pending)
+
+    def get_bytes(self, tx_id: str) -> Optional[memoryview]:
+        """
+        Возвращает двоичное представление транзакции (to_bytes()) как
+        memoryview поверх отображенного в память сегмента, без копирования.
+        """
+        if self._filtered_out(tx_id):
+            return None
+        offset = self._find(_tx_id_to_digest(tx_id))
+        if offset is None:
+            return None
+        length = _RECORD_HEADER.unpack_from(self._data_map, offset)[0]
+        start = offset + _RECORD_HEADER.size
+        return memoryview(self._data_map)[start:start + length]
+
+    def get(self, tx_id: str, trusted: bool = False) -> Optional[Transaction]:
+        """
+        Возвращает транзакцию по tx_id или None.
+        При trusted=True запись не проверяется и tx_id не пересчитывается.
+        """
+        data = self.get_bytes(tx_id)
+        if data is None:
+            return None
+        if trusted:
+            return Transaction.from_bytes(data, trusted=True, tx_id=tx_id)
+        return Transaction.from_bytes(data)
+
+    def view(self, tx_id: str) -> Optional[TransactionView]:
+        """Возвращает ленивое представление транзакции без копирования или None."""
+        data = self.get_bytes(tx_id)
+        return TransactionView(data, tx_id=tx_id) if data is not None else None
+
+    def iter_views(self) -> Iterator[TransactionView]:
+        """
+        Последовательно обходит все записи сегмента в порядке добавления и
+        выдает ленивые представления транзакций (для сканирования с фильтром).
+        """
+        data_map = self._data_map
+        if data_map is None:
+            return
+        view = memoryview(data_map)
+        offset = 0
+        end = len(data_map)
+        while offset < end:
+            length, _, digest = _RECORD_HEADER.unpack_from(data_map, offset)
+            start = offset + _RECORD_HEADER.size
+            yield TransactionView(view[start:start + length], tx_id=digest.hex())
+            offset = start + length
+
+    # --- Индекс ---
+
+    def flush_index(self):
+        """
+        Сохраняет записи из памяти новым отсортированным прогоном индекса
+        и сливает прогоны одного уровня (см. INDEX_FANOUT).
+        """
+        if not self._pending:
+            return
+        self._data_file.seek(0, os.SEEK_END)
+        data_length = self._data_file.tell()
+        self._runs.append(self._write_run(sorted(self._pending.items()), self._indexed_length, data_length))
+        self._indexed_length = data_length
+        self._pending.clear()
+        while (len(self._runs) >= INDEX_FANOUT and
+               self._run_level(self._runs[-INDEX_FANOUT]) == self._run_level(self._runs[-1])):
+            self._merge_runs(len(self._runs) - INDEX_FANOUT)
+        self._index_count = sum(run.count for run in self._runs)
+
+    def compact_index(self):
+        """Сохраняет записи из памяти и сливает все прогоны индекса в один (ускоряет поиск)."""
+        self.flush_index()
+        if len(self._runs) > 1:
+            self._merge_runs(0)
+
+    def _run_level(self, run: _IndexRun) -> int:
+        """Уровень прогона: 0 для прогонов меньше max_pending * INDEX_FANOUT записей."""
+        level = 0
+        size = self.max_pending * INDEX_FANOUT
+        while run.count >= size:
+            level += 1
+            size *= INDEX_FANOUT
+        return level
+
+    def _merge_runs(self, first: int):
+        """Сливает прогоны начиная с first в один; исходные файлы удаляются после записи."""
+        merged = self._runs[first:]
+        entries = heapq.merge(*(run.entries() for run in merged))
+        self._runs[first:] = [self._write_run(entries, merged[0].start, merged[-1].end)]
+        for run in merged:
+            run.close()
+            os.remove(run.path)
+
+    def _write_run(self, entries: Iterable[Tuple[bytes, int]], start: int, end: int) -> _IndexRun:
+        """Атомарно записывает прогон индекса для записей сегмента в [start, end)."""
+        path = os.path.join(self.directory, f"transactions.{start}-{end}.idx")
+        tmp_path = path + ".tmp"
+        count = 0
+        with open(tmp_path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, 0, end))
+            for digest, offset in entries:
+                f.write(_INDEX_ENTRY.pack(digest, offset))
+                count += 1
+            f.seek(0)
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, count, end))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return _IndexRun(path, start)
+
+    def _close_index(self):
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._index_count = 0
+
+    def close(self):
+        """Сохраняет индекс и закрывает файлы хранилища."""
+        self.flush_index()
+        self._close_index()
+        self._data_map = None
+        self._data_file.close()
+
+    def __enter__(self) -> "TransactionStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
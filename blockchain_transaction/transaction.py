@@ -1,56 +1,176 @@
 import hashlib
 import json
 import time
-from typing import List, Optional
-
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.exceptions import InvalidSignature
+from typing import List, Optional, Union
 
 from .transaction_input import TransactionInput
 from .transaction_output import TransactionOutput
-from .keys import deserialize_private_key, deserialize_public_key, serialize_public_key # Для recipient_address
+from .keys import DEFAULT_SCHEME, Signer, get_scheme, private_key_cache, public_key_cache
+from .address import default_registry
+from .metrics import metrics
+from .verification_cache import verification_cache
+from . import binary_format
+
+# Форматы канонических данных для подписи.
+PREIMAGE_JSON = "json"
+PREIMAGE_BINARY = "binary"
+_PREIMAGE_FORMATS = (PREIMAGE_JSON, PREIMAGE_BINARY)
+
+# Поля, изменение которых запрещено у замороженной транзакции.
+_FROZEN_FIELDS = frozenset(("inputs", "outputs", "timestamp", "preimage_format", "scheme"))
 
 class Transaction:
     """
     Представляет транзакцию в блокчейне.
     Содержит входы, выходы и подпись.
     """
-    def __init__(self, inputs: List[TransactionInput], outputs: List[TransactionOutput], timestamp: Optional[float] = None):
+    _frozen = False # Переопределяется в _FrozenTransaction
+    def __init__(self, inputs: List[TransactionInput], outputs: List[TransactionOutput], timestamp: Optional[float] = None,
+                 frozen: bool = False, preimage_format: str = PREIMAGE_JSON, tx_id: Optional[str] = None,
+                 scheme: str = DEFAULT_SCHEME):
+        """
+        scheme - имя схемы подписи (см. keys.SIGNATURE_SCHEMES); она входит
+        в подписываемые данные, если отличается от схемы по умолчанию.
+        tx_id можно передать, если он заранее известен (например, из доверенного
+        архива) - тогда хэш данных при создании не вычисляется.
+        """
         if not all(isinstance(i, TransactionInput) for i in inputs):
             raise ValueError("Все элементы inputs должны быть экземплярами TransactionInput")
         if not all(isinstance(o, TransactionOutput) for o in outputs):
             raise ValueError("Все элементы outputs должны быть экземплярами TransactionOutput")
         if not outputs:
             raise ValueError("Транзакция должна иметь хотя бы один выход")
+        if preimage_format not in _PREIMAGE_FORMATS:
+            raise ValueError(f"Неизвестный формат данных для подписи: {preimage_format}")
+        get_scheme(scheme) # Проверка, что схема подписи известна
 
         self.inputs = sorted(inputs) # Сортировка для детерминизма
         self.outputs = sorted(outputs) # Сортировка для детерминизма
         self.timestamp = timestamp if timestamp is not None else time.time()
+        self.preimage_format = preimage_format
+        self.scheme = scheme
         self.signature: Optional[bytes] = None
-        self.tx_id: str = self._calculate_initial_hash()
+        self.tx_id = tx_id if tx_id is not None else self._calculate_initial_hash()
+        if frozen:
+            self.freeze()
+
+    @classmethod
+    def from_trusted(cls, inputs: List[TransactionInput], outputs: List[TransactionOutput], timestamp: float,
+                     signature: Optional[bytes] = None, tx_id: Optional[str] = None,
+                     preimage_format: str = PREIMAGE_JSON, scheme: str = DEFAULT_SCHEME) -> "Transaction":
+        """
+        Быстрое создание транзакции из заведомо корректных данных (например, из
+        собственного проверенного хранилища): без проверки аргументов, без
+        сортировки (входы и выходы должны быть уже отсортированы) и без хеширования.
+        Если tx_id не передан, он вычисляется при первом обращении.
+        """
+        tx = cls.__new__(cls)
+        tx.__dict__.update(
+            inputs=inputs,
+            outputs=outputs,
+            timestamp=timestamp,
+            preimage_format=preimage_format,
+            scheme=scheme,
+            signature=signature,
+            _tx_id=tx_id,
+        )
+        return tx
+
+    @property
+    def tx_id(self) -> str:
+        """ID транзакции (см. _calculate_final_tx_id)."""
+        tx_id = self._tx_id
+        if tx_id is None:
+            tx_id = self._tx_id = self._calculate_final_tx_id()
+        return tx_id
+
+    @tx_id.setter
+    def tx_id(self, value: str):
+        self._tx_id = value
+
+    def freeze(self) -> "Transaction":
+        """
+        Переводит транзакцию в неизменяемый режим.
+        Входы и выходы заменяются неизменяемыми копиями в кортежах, канонические
+        данные для подписи и хэш вычисляются один раз и кэшируются; повторная
+        проверка подписи больше не требует сериализации. Изменение inputs,
+        outputs, timestamp и полей их элементов после заморозки запрещено.
+        """
+        return self._freeze(keep_tx_id=False)
+
+    def _freeze(self, keep_tx_id: bool) -> "Transaction":
+        """
+        При keep_tx_id=True известный tx_id (например, доверенный) сохраняется,
+        а данные для подписи и хэш вычисляются при первом обращении.
+        """
+        if self._frozen:
+            return self
+        self.inputs = tuple(inp.frozen() for inp in self.inputs)
+        self.outputs = tuple(out.frozen() for out in self.outputs)
+        self._signing_data = None
+        self._initial_hash = None
+        self._final_tx_id_cache = None
+        if keep_tx_id and self._tx_id is not None:
+            self._final_tx_id_cache = (self.signature, self._tx_id)
+        # Проверка записи полей включается сменой класса: у незамороженных
+        # транзакций присваивание атрибутов не проходит через __setattr__.
+        self.__class__ = _FrozenTransaction
+        if not keep_tx_id:
+            self.tx_id = self._calculate_final_tx_id()
+        return self
+
+    @property
+    def is_frozen(self) -> bool:
+        """Возвращает True, если транзакция заморожена."""
+        return self._frozen
 
     def _get_data_for_signing(self) -> bytes:
         """
         Собирает данные транзакции (без подписи) в каноническом виде для хеширования и подписи.
         """
+        if self._frozen:
+            if self._signing_data is None:
+                self._signing_data = self._build_data_for_signing()
+            return self._signing_data
+        with metrics.stage("get_data_for_signing"):
+            return self._build_data_for_signing()
+
+    def _build_data_for_signing(self) -> bytes:
+        if self.preimage_format == PREIMAGE_BINARY:
+            return binary_format.encode_preimage(self.timestamp, self.inputs, self.outputs,
+                                                 scheme=self._explicit_scheme())
         tx_data = {
             "timestamp": self.timestamp,
             "inputs": [inp.to_dict() for inp in self.inputs],
             "outputs": [out.to_dict() for out in self.outputs]
         }
+        # Схема по умолчанию не записывается, чтобы не менять tx_id существующих транзакций.
+        if self.scheme != DEFAULT_SCHEME:
+            tx_data["scheme"] = self.scheme
         return json.dumps(tx_data, sort_keys=True, separators=(',', ':')).encode('utf-8')
 
+    def _explicit_scheme(self) -> Optional[str]:
+        return self.scheme if self.scheme != DEFAULT_SCHEME else None
+
     def _calculate_initial_hash(self) -> str:
         """
         Вычисляет SHA256 хэш данных транзакции (до подписи).
         Этот хэш будет подписан.
         """
-        return hashlib.sha256(self._get_data_for_signing()).hexdigest()
+        if self._frozen and self._initial_hash is not None:
+            return self._initial_hash
+        data = self._get_data_for_signing()
+        with metrics.stage("sha256"):
+            initial_hash = hashlib.sha256(data).hexdigest()
+        if self._frozen:
+            self._initial_hash = initial_hash
+        return initial_hash
 
-    def sign(self, private_key_pem: str):
+    def sign(self, private_key_pem: Union[str, Signer]):
         """
-        Подписывает транзакцию с использованием приватного ключа (в PEM).
+        Подписывает транзакцию с использованием приватного ключа (в PEM или
+        уже разобранного, в виде Signer).
+        Тип ключа должен соответствовать схеме подписи транзакции.
         Подписывается хэш данных транзакции.
         После подписи обновляется финальный tx_id.
         """
@@ -78,17 +198,25 @@ class Transaction:
         if not private_key_pem:
             raise ValueError("Приватный ключ необходим для подписи.")
 
-        private_key = deserialize_private_key(private_key_pem)
-        data_hash_to_sign = self._calculate_initial_hash().encode('utf-8')
+        with metrics.stage("sign"):
+            if isinstance(private_key_pem, Signer):
+                private_key = private_key_pem.private_key
+            else:
+                with metrics.stage("pem_parse_private"):
+                    private_key = private_key_cache.get(private_key_pem)
+            scheme = get_scheme(self.scheme)
+            if not scheme.supports_key(private_key):
+                raise ValueError(f"Ключ не соответствует схеме подписи транзакции: {self.scheme}")
+            data_hash_to_sign = self._calculate_initial_hash().encode('utf-8')
 
-        self.signature = private_key.sign(
-            data_hash_to_sign,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+            with metrics.stage("crypto_sign"):
+                signature = scheme.sign(private_key, data_hash_to_sign)
+            self._attach_signature(signature)
+        metrics.increment("sign")
+
+    def _attach_signature(self, signature: bytes):
+        """Устанавливает подпись, вычисленную над _calculate_initial_hash(), и обновляет tx_id."""
+        self.signature = signature
         self.tx_id = self._calculate_final_tx_id()
 
     def _calculate_final_tx_id(self) -> str:
@@ -97,16 +225,42 @@ class Transaction:
         Если не подписана: хэш данных.
         Если подписана: хэш (хэша данных + подписи).
         """
+        if self._frozen and self._final_tx_id_cache is not None:
+            cached_signature, cached_tx_id = self._final_tx_id_cache
+            if cached_signature == self.signature:
+                return cached_tx_id
+
         initial_hash = self._calculate_initial_hash()
         if not self.signature:
+            if self._frozen:
+                self._final_tx_id_cache = (self.signature, initial_hash)
             return initial_hash
 
+        final_tx_id = self._signed_tx_id(initial_hash)
+        if self._frozen:
+            self._final_tx_id_cache = (self.signature, final_tx_id)
+        return final_tx_id
+
+    def _signed_tx_id(self, initial_hash: str) -> str:
+        """Хэш (хэша данных + подписи) для подписанной транзакции."""
         combined_data = initial_hash + self.signature.hex()
         return hashlib.sha256(combined_data.encode('utf-8')).hexdigest()
 
+    def _verification_cache_key(self) -> str:
+        """
+        Ключ verification_cache: tx_id, вычисленный по данным и подписи.
+        В отличие от _calculate_final_tx_id, не использует доверенный tx_id
+        (trust_tx_id=True): иначе транзакция с измененными данными и чужим
+        tx_id нашлась бы в кэше как проверенная.
+        """
+        return self._signed_tx_id(self._calculate_initial_hash())
+
     def verify_signature(self, sender_public_key_pem: str) -> bool:
         """
         Проверяет подпись транзакции с использованием публичного ключа отправителя (в PEM).
+        Вместо PEM можно передать адрес-отпечаток, зарегистрированный в default_registry.
+        Успешные проверки запоминаются в verification_cache, и повторная проверка
+        той же транзакции тем же ключом не выполняет криптографическую операцию.
         Для coinbase транзакций (без входов) эта проверка обычно не нужна или обрабатывается иначе.
         """
         if self.is_coinbase():
@@ -116,26 +270,36 @@ class Transaction:
             return False
         if not sender_public_key_pem:
             return False
-
-        public_key = deserialize_public_key(sender_public_key_pem)
-        original_data_hash = self._calculate_initial_hash().encode('utf-8')
-
-        try:
-            public_key.verify(
-                self.signature,
-                original_data_hash,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            return True
-        except InvalidSignature:
-            return False
-        except Exception:
+        sender_public_key_pem = default_registry.resolve_key(sender_public_key_pem)
+        if sender_public_key_pem is None:
             return False
 
+        # Данные для подписи сериализуются один раз: из их хэша выводится
+        # и ключ кэша, и проверяемое сообщение.
+        initial_hash = self._calculate_initial_hash()
+        # Флаг читается один раз: кэш могут включить из другого потока во время проверки.
+        use_cache = verification_cache.enabled
+        if use_cache:
+            final_tx_id = self._signed_tx_id(initial_hash)
+            if verification_cache.lookup(final_tx_id, sender_public_key_pem):
+                metrics.increment("verify_cache_hit")
+                return True
+
+        with metrics.stage("verify_signature"):
+            with metrics.stage("pem_parse_public"):
+                public_key = public_key_cache.get(sender_public_key_pem)
+            original_data_hash = initial_hash.encode('utf-8')
+
+            try:
+                with metrics.stage("crypto_verify"):
+                    valid = get_scheme(self.scheme).verify(public_key, self.signature, original_data_hash)
+            except Exception:
+                valid = False
+        if valid and use_cache:
+            verification_cache.remember(final_tx_id, sender_public_key_pem)
+        metrics.increment("verify_ok" if valid else "verify_failed")
+        return valid
+
     def is_coinbase(self) -> bool:
         """Проверяет, является ли транзакция coinbase (без входов)."""
         return not self.inputs
@@ -150,32 +314,118 @@ class Transaction:
 
     def to_dict(self) -> dict:
         """Представляет транзакцию в виде словаря для легкой сериализации/хранения."""
-        return {
+        tx_dict = {
             "tx_id": self.tx_id,
             "timestamp": self.timestamp,
             "inputs": [inp.to_dict() for inp in self.inputs],
             "outputs": [out.to_dict() for out in self.outputs],
             "signature": self.signature.hex() if self.signature else None
         }
+        # Формат по умолчанию не записывается для совместимости со старыми данными.
+        if self.preimage_format != PREIMAGE_JSON:
+            tx_dict["preimage_format"] = self.preimage_format
+        if self.scheme != DEFAULT_SCHEME:
+            tx_dict["scheme"] = self.scheme
+        return tx_dict
+
+    def to_bytes(self) -> bytes:
+        """Кодирует транзакцию в компактный двоичный формат (см. binary_format)."""
+        return binary_format.encode_transaction(
+            self.timestamp, self.inputs, self.outputs, self.signature,
+            binary_preimage=self.preimage_format == PREIMAGE_BINARY,
+            scheme=self._explicit_scheme()
+        )
 
     @classmethod
-    def from_dict(cls, tx_data: dict):
-        """Восстанавливает транзакцию из словаря."""
+    def from_bytes(cls, data, frozen: bool = False, trusted: bool = False, tx_id: Optional[str] = None):
+        """
+        Восстанавливает транзакцию из двоичного представления to_bytes().
+        При trusted=True данные не проверяются (см. from_trusted), а tx_id
+        берется из аргумента или вычисляется при первом обращении.
+        """
+        decoded = binary_format.decode_transaction(data, trusted=trusted)
+        preimage_format = PREIMAGE_BINARY if decoded.binary_preimage else PREIMAGE_JSON
+        if trusted:
+            tx = cls.from_trusted(decoded.inputs, decoded.outputs, decoded.timestamp,
+                                  signature=decoded.signature, tx_id=tx_id,
+                                  preimage_format=preimage_format,
+                                  scheme=decoded.scheme or DEFAULT_SCHEME)
+            return tx._freeze(keep_tx_id=True) if frozen else tx
+        tx = cls(decoded.inputs, decoded.outputs, timestamp=decoded.timestamp,
+                 preimage_format=preimage_format, scheme=decoded.scheme or DEFAULT_SCHEME)
+        tx.signature = decoded.signature
+        tx.tx_id = tx._calculate_final_tx_id()
+        if frozen:
+            tx.freeze()
+        return tx
+
+    @classmethod
+    def from_dict(cls, tx_data: dict, frozen: bool = False, trust_tx_id: bool = False):
+        """
+        Восстанавливает транзакцию из словаря.
+        При frozen=True возвращается замороженная транзакция.
+        При trust_tx_id=True tx_id берется из словаря без пересчета хэшей;
+        использовать только для данных из доверенного источника.
+        """
+        with metrics.stage("from_dict"):
+            return cls._from_dict(tx_data, frozen, trust_tx_id)
+
+    @classmethod
+    def from_trusted_dict(cls, tx_data: dict) -> "Transaction":
+        """
+        Быстро восстанавливает транзакцию из словаря to_dict() доверенного источника:
+        без проверок, сортировки и пересчета tx_id (см. from_trusted).
+        """
+        signature_hex = tx_data.get('signature')
+        return cls.from_trusted(
+            [TransactionInput.from_trusted(inp['previous_tx_id'], inp['output_index'])
+             for inp in tx_data.get('inputs', ())],
+            [TransactionOutput.from_trusted(out['recipient_address_pubkey_pem'], out['amount'])
+             for out in tx_data['outputs']],
+            tx_data['timestamp'],
+            signature=bytes.fromhex(signature_hex) if signature_hex else None,
+            tx_id=tx_data.get('tx_id'),
+            preimage_format=tx_data.get('preimage_format', PREIMAGE_JSON),
+            scheme=tx_data.get('scheme', DEFAULT_SCHEME),
+        )
+
+    @classmethod
+    def _from_dict(cls, tx_data: dict, frozen: bool, trust_tx_id: bool):
         inputs = [TransactionInput(**inp_data) for inp_data in tx_data.get('inputs', [])]
         outputs = [TransactionOutput(**out_data) for out_data in tx_data.get('outputs', [])]
         
         if not outputs:
              raise ValueError("Данные для транзакции должны содержать 'outputs'")
 
-        tx = cls(inputs, outputs, timestamp=tx_data.get('timestamp'))
+        trusted_tx_id = tx_data.get('tx_id') if trust_tx_id else None
+        tx = cls(inputs, outputs, timestamp=tx_data.get('timestamp'),
+                 preimage_format=tx_data.get('preimage_format', PREIMAGE_JSON),
+                 tx_id=trusted_tx_id, scheme=tx_data.get('scheme', DEFAULT_SCHEME))
         
         signature_hex = tx_data.get('signature')
         if signature_hex:
             tx.signature = bytes.fromhex(signature_hex)
+
+        if trusted_tx_id:
+            if frozen:
+                tx._freeze(keep_tx_id=True)
+            return tx
         
         calculated_final_tx_id = tx._calculate_final_tx_id()
         if tx_data.get('tx_id') and tx_data['tx_id'] != calculated_final_tx_id:
             pass
         tx.tx_id = calculated_final_tx_id
 
-        return tx
\ No newline at end of file
+        if frozen:
+            tx.freeze()
+        return tx
+
+
+class _FrozenTransaction(Transaction):
+    """Замороженная транзакция (см. Transaction.freeze): поля данных изменять нельзя."""
+    _frozen = True
+
+    def __setattr__(self, name, value):
+        if name in _FROZEN_FIELDS:
+            raise AttributeError(f"Транзакция заморожена, поле {name} нельзя изменить")
+        super().__setattr__(name, value)
@@ -1,17 +1,41 @@
+import sys
+
 class TransactionInput:
     """
     Представляет вход транзакции.
     Ссылается на выход предыдущей транзакции.
+    Хранится компактно (__slots__), хэшируется по (previous_tx_id, output_index),
+    поэтому может служить ключом словаря или элементом множества.
     """
+    __slots__ = ('previous_tx_id', 'output_index')
+
     def __init__(self, previous_tx_id: str, output_index: int):
         if not isinstance(previous_tx_id, str) or not previous_tx_id:
             raise ValueError("previous_tx_id должен быть непустой строкой")
         if not isinstance(output_index, int) or output_index < 0:
             raise ValueError("output_index должен быть неотрицательным целым числом")
 
-        self.previous_tx_id = previous_tx_id
+        # Интернирование: все входы, ссылающиеся на одну транзакцию, разделяют одну строку.
+        self.previous_tx_id = sys.intern(previous_tx_id)
         self.output_index = output_index
 
+    @classmethod
+    def from_trusted(cls, previous_tx_id: str, output_index: int) -> "TransactionInput":
+        """Создает вход без проверки аргументов (для заведомо корректных данных)."""
+        tx_input = cls.__new__(cls)
+        tx_input.previous_tx_id = sys.intern(previous_tx_id)
+        tx_input.output_index = output_index
+        return tx_input
+
+    def frozen(self) -> "TransactionInput":
+        """Неизменяемая копия входа (см. Transaction.freeze)."""
+        return _FrozenTransactionInput._create(self.previous_tx_id, self.output_index)
+
+    @property
+    def outpoint(self) -> tuple:
+        """Ссылка на выход предыдущей транзакции в виде (previous_tx_id, output_index)."""
+        return (self.previous_tx_id, self.output_index)
+
     def to_dict(self) -> dict:
         """Возвращает словарь для сериализации."""
         return {
@@ -29,9 +53,42 @@ class TransactionInput:
         return (self.previous_tx_id == other.previous_tx_id and
                 self.output_index == other.output_index)
 
+    def __hash__(self) -> int:
+        return hash((self.previous_tx_id, self.output_index))
+
     def __lt__(self, other) -> bool: # Для сортировки
         if not isinstance(other, TransactionInput):
             return NotImplemented
         if self.previous_tx_id != other.previous_tx_id:
             return self.previous_tx_id < other.previous_tx_id
-        return self.output_index < other.output_index
\ No newline at end of file
+        return self.output_index < other.output_index
+
+
+class _FrozenTransactionInput(TransactionInput):
+    """Вход замороженной транзакции: изменение полей запрещено."""
+    __slots__ = ()
+
+    @classmethod
+    def _create(cls, previous_tx_id: str, output_index: int) -> "_FrozenTransactionInput":
+        tx_input = cls.__new__(cls)
+        object.__setattr__(tx_input, 'previous_tx_id', previous_tx_id)
+        object.__setattr__(tx_input, 'output_index', output_index)
+        return tx_input
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Вход замороженной транзакции нельзя изменить (поле {name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Вход замороженной транзакции нельзя изменить (поле {name})")
+
+    def frozen(self) -> "TransactionInput":
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_FrozenTransactionInput._create, (self.previous_tx_id, self.output_index))
@@ -1,16 +1,105 @@
+import math
+import sys
+
+from .address import AddressRegistry, default_registry, is_fingerprint_address
+
+# Число базовых единиц в одной единице суммы: суммы хранятся как целые
+# числа с фиксированной точкой (8 знаков после запятой).
+AMOUNT_SCALE = 10**8
+
+
+def to_units(amount: float) -> int:
+    """Переводит сумму в целое число базовых единиц (с округлением до ближайшей)."""
+    scaled = amount * AMOUNT_SCALE
+    if not math.isfinite(scaled):
+        raise ValueError("amount должен быть конечным числом")
+    return round(scaled)
+
+
+def from_units(units: int) -> float:
+    """Переводит целое число базовых единиц в сумму."""
+    return units / AMOUNT_SCALE
+
+
 class TransactionOutput:
     """
     Представляет выход транзакции.
     Определяет, кому и сколько средств передается.
+    amount хранится без изменений (он входит в прообраз подписи и tx_id);
+    units - та же сумма в целых базовых единицах (см. AMOUNT_SCALE) для
+    точного суммирования. Для сумм с точностью выше 1/AMOUNT_SCALE units
+    округлено до ближайшей единицы.
+    Хранится компактно (__slots__) и хэшируется по (получатель, сумма);
+    выход, добавленный в множество или словарь, не следует изменять.
     """
+    __slots__ = ('recipient_address_pubkey_pem', '_amount', 'units')
+
     def __init__(self, recipient_address_pubkey_pem: str, amount: float):
         if not isinstance(recipient_address_pubkey_pem, str) or not recipient_address_pubkey_pem:
             raise ValueError("recipient_address_pubkey_pem должен быть непустой строкой")
-        if not isinstance(amount, (int, float)) or amount <= 0:
+        # NaN не проходит сравнение amount <= 0, а бесконечность и суммы,
+        # переполняющие units, не переводятся в целое число.
+        if (not isinstance(amount, (int, float)) or amount <= 0
+                or not math.isfinite(amount * AMOUNT_SCALE)):
             raise ValueError("amount должен быть положительным числом")
 
-        self.recipient_address_pubkey_pem = recipient_address_pubkey_pem
-        self.amount = float(amount)
+        # Интернирование: выходы на один адрес разделяют одну строку.
+        self.recipient_address_pubkey_pem = sys.intern(recipient_address_pubkey_pem)
+        self.amount = amount
+
+    @classmethod
+    def from_units(cls, recipient_address_pubkey_pem: str, units: int) -> "TransactionOutput":
+        """Создает выход с суммой, заданной целым числом базовых единиц."""
+        if not isinstance(recipient_address_pubkey_pem, str) or not recipient_address_pubkey_pem:
+            raise ValueError("recipient_address_pubkey_pem должен быть непустой строкой")
+        if not isinstance(units, int) or isinstance(units, bool) or units <= 0:
+            raise ValueError("units должен быть положительным целым числом")
+        tx_output = cls.__new__(cls)
+        tx_output.recipient_address_pubkey_pem = sys.intern(recipient_address_pubkey_pem)
+        tx_output._amount = from_units(units)
+        tx_output.units = units
+        return tx_output
+
+    @classmethod
+    def from_trusted(cls, recipient_address_pubkey_pem: str, amount: float) -> "TransactionOutput":
+        """Создает выход без проверки аргументов (для заведомо корректных данных)."""
+        tx_output = cls.__new__(cls)
+        tx_output.recipient_address_pubkey_pem = sys.intern(recipient_address_pubkey_pem)
+        tx_output._amount = float(amount)
+        tx_output.units = round(amount * AMOUNT_SCALE)
+        return tx_output
+
+    @property
+    def amount(self) -> float:
+        """Сумма в том виде, в котором она задана (входит в прообраз подписи)."""
+        return self._amount
+
+    @amount.setter
+    def amount(self, value: float):
+        units = to_units(value)
+        self._amount = float(value)
+        self.units = units
+
+    def frozen(self) -> "TransactionOutput":
+        """Неизменяемая копия выхода (см. Transaction.freeze)."""
+        return _FrozenTransactionOutput._create(self.recipient_address_pubkey_pem, self._amount, self.units)
+
+    def has_exact_units(self) -> bool:
+        """True, если amount точно восстанавливается из units (from_units)."""
+        return from_units(self.units) == self._amount
+
+    @classmethod
+    def for_public_key(cls, public_key_pem: str, amount: float,
+                       registry: AddressRegistry = default_registry) -> "TransactionOutput":
+        """
+        Создает выход на адрес-отпечаток публичного ключа вместо полного PEM.
+        Ключ регистрируется в реестре, чтобы его можно было найти при проверке подписи.
+        """
+        return cls(registry.register(public_key_pem), amount)
+
+    def has_fingerprint_address(self) -> bool:
+        """Возвращает True, если получатель задан адресом-отпечатком."""
+        return is_fingerprint_address(self.recipient_address_pubkey_pem)
 
     def to_dict(self) -> dict:
         """Возвращает словарь для сериализации."""
@@ -27,11 +116,45 @@ class TransactionOutput:
         if not isinstance(other, TransactionOutput):
             return NotImplemented
         return (self.recipient_address_pubkey_pem == other.recipient_address_pubkey_pem and
-                self.amount == other.amount)
+                self._amount == other._amount)
+
+    def __hash__(self) -> int:
+        return hash((self.recipient_address_pubkey_pem, self._amount))
 
     def __lt__(self, other) -> bool: # Для сортировки
         if not isinstance(other, TransactionOutput):
             return NotImplemented
         if self.recipient_address_pubkey_pem != other.recipient_address_pubkey_pem:
             return self.recipient_address_pubkey_pem < other.recipient_address_pubkey_pem
-        return self.amount < other.amount
\ No newline at end of file
+        return self._amount < other._amount
+
+
+class _FrozenTransactionOutput(TransactionOutput):
+    """Выход замороженной транзакции: изменение полей запрещено."""
+    __slots__ = ()
+
+    @classmethod
+    def _create(cls, recipient_address_pubkey_pem: str, amount: float, units: int) -> "_FrozenTransactionOutput":
+        tx_output = cls.__new__(cls)
+        object.__setattr__(tx_output, 'recipient_address_pubkey_pem', recipient_address_pubkey_pem)
+        object.__setattr__(tx_output, '_amount', amount)
+        object.__setattr__(tx_output, 'units', units)
+        return tx_output
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Выход замороженной транзакции нельзя изменить (поле {name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Выход замороженной транзакции нельзя изменить (поле {name})")
+
+    def frozen(self) -> "TransactionOutput":
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_FrozenTransactionOutput._create, (self.recipient_address_pubkey_pem, self._amount, self.units))
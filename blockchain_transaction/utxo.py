@@ -0,0 +1,154 @@
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .binary_format import BufferReader, pack_bytes, pack_output
+from .transaction import Transaction
+from .transaction_input import TransactionInput
+from .transaction_output import TransactionOutput
+
+Outpoint = Tuple[str, int]
+
+_SNAPSHOT_MAGIC = b"UTXO"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct(">4sBQ")
+_GROUP_SIZE = struct.Struct(">I")
+_INDEX = struct.Struct(">I")
+
+
+class UndoRecord(NamedTuple):
+    """Данные для отмены применения одной транзакции к UTXO."""
+    tx_id: str
+    spent: List[Tuple[Outpoint, TransactionOutput]]
+    created: List[Outpoint]
+
+
+class UTXOSet:
+    """
+    Множество непотраченных выходов (UTXO), индексированное по
+    (tx_id, output_index). Поиск, трата и добавление выполняются за O(1).
+    """
+    def __init__(self):
+        self._outputs: Dict[Outpoint, TransactionOutput] = {}
+
+    def get(self, tx_id: str, output_index: int) -> Optional[TransactionOutput]:
+        """Возвращает непотраченный выход или None."""
+        return self._outputs.get((tx_id, output_index))
+
+    def get_for_input(self, tx_input: TransactionInput) -> Optional[TransactionOutput]:
+        """Возвращает выход, на который ссылается вход, если он не потрачен."""
+        return self._outputs.get(tx_input.outpoint)
+
+    def add(self, tx_id: str, output_index: int, output: TransactionOutput):
+        """Добавляет непотраченный выход."""
+        self._outputs[(tx_id, output_index)] = output
+
+    def __contains__(self, outpoint: Outpoint) -> bool:
+        return outpoint in self._outputs
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def __iter__(self) -> Iterator[Tuple[Outpoint, TransactionOutput]]:
+        return iter(self._outputs.items())
+
+    def apply(self, tx: Transaction) -> UndoRecord:
+        """
+        Применяет транзакцию: тратит выходы, на которые ссылаются входы,
+        и добавляет ее собственные выходы. Если хотя бы один вход ссылается
+        на отсутствующий выход, множество не изменяется.
+        """
+        outpoints = [inp.outpoint for inp in tx.inputs]
+        if len(set(outpoints)) != len(outpoints):
+            raise ValueError(f"Транзакция {tx.tx_id} тратит один выход дважды")
+        for outpoint in outpoints:
+            if outpoint not in self._outputs:
+                raise ValueError(f"Выход {outpoint[0]}:{outpoint[1]} отсутствует или уже потрачен")
+
+        created = [(tx.tx_id, index) for index in range(len(tx.outputs))]
+        for outpoint in created:
+            if outpoint in self._outputs:
+                raise ValueError(f"Выход {outpoint[0]}:{outpoint[1]} уже существует")
+
+        spent = [(outpoint, self._outputs.pop(outpoint)) for outpoint in outpoints]
+        for outpoint, output in zip(created, tx.outputs):
+            self._outputs[outpoint] = output
+        return UndoRecord(tx.tx_id, spent, created)
+
+    def undo(self, record: UndoRecord):
+        """Отменяет применение транзакции по записи, полученной от apply."""
+        for outpoint in record.created:
+            self._outputs.pop(outpoint, None)
+        for outpoint, output in record.spent:
+            self._outputs[outpoint] = output
+
+    def apply_batch(self, transactions: Iterable[Transaction]) -> List[UndoRecord]:
+        """
+        Применяет транзакции по порядку. При ошибке уже примененные
+        транзакции пакета откатываются, и исключение пробрасывается дальше.
+        """
+        records: List[UndoRecord] = []
+        try:
+            for tx in transactions:
+                records.append(self.apply(tx))
+        except ValueError:
+            self.undo_batch(records)
+            raise
+        return records
+
+    def undo_batch(self, records: List[UndoRecord]):
+        """Отменяет пакет в обратном порядке."""
+        for record in reversed(records):
+            self.undo(record)
+
+    def save_snapshot(self, path: str):
+        """
+        Записывает компактный двоичный снимок множества. Выходы группируются
+        по tx_id, получатели кодируются как в binary_format. Файл заменяется
+        атомарно.
+        """
+        groups: Dict[str, List[Tuple[int, TransactionOutput]]] = {}
+        for (tx_id, index), output in self._outputs.items():
+            groups.setdefault(tx_id, []).append((index, output))
+
+        parts = [_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, len(groups))]
+        for tx_id, entries in groups.items():
+            pack_bytes(parts, tx_id.encode('utf-8'))
+            parts.append(_GROUP_SIZE.pack(len(entries)))
+            for index, output in entries:
+                parts.append(_INDEX.pack(index))
+                pack_output(parts, output)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(parts))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "UTXOSet":
+        """Загружает множество из снимка, записанного save_snapshot."""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        utxo_set = cls()
+        outputs = utxo_set._outputs
+        reader = BufferReader(data)
+        try:
+            magic, version, n_groups = reader.unpack(_SNAPSHOT_HEADER)
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError("Файл не является снимком UTXO")
+            if version != _SNAPSHOT_VERSION:
+                raise ValueError(f"Неподдерживаемая версия снимка UTXO: {version}")
+            for _ in range(n_groups):
+                tx_id = reader.read_bytes().decode('utf-8')
+                (n_entries,) = reader.unpack(_GROUP_SIZE)
+                for _ in range(n_entries):
+                    (index,) = reader.unpack(_INDEX)
+                    outputs[(tx_id, index)] = reader.read_output()
+        except struct.error as e:
+            raise ValueError("Снимок UTXO обрезан или поврежден") from e
+        if not reader.at_end():
+            raise ValueError("Лишние байты в конце снимка UTXO")
+        return utxo_set
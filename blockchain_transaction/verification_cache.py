@@ -0,0 +1,86 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+_CacheKey = Tuple[str, bytes]
+
+
+class VerificationCache:
+    """
+    Ограниченный потокобезопасный LRU-кэш успешных проверок подписи.
+    Ключ - финальный tx_id (пересчитанный из текущих данных транзакции)
+    и отпечаток публичного ключа (SHA256 от PEM). Запоминаются только
+    успешные проверки. disable() отключает кэш, например для аудита,
+    когда каждая подпись должна проверяться заново.
+    """
+    def __init__(self, capacity: int = 100_000):
+        if not isinstance(capacity, int) or capacity < 0:
+            raise ValueError("capacity должен быть неотрицательным целым числом")
+        self.capacity = capacity
+        self.enabled = True
+        self._entries: "OrderedDict[_CacheKey, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _make_key(tx_id: str, public_key_pem: str) -> _CacheKey:
+        return (tx_id, hashlib.sha256(public_key_pem.encode('utf-8')).digest())
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        """Отключает кэш и очищает его содержимое."""
+        self.enabled = False
+        self.clear()
+
+    def lookup(self, tx_id: str, public_key_pem: str) -> bool:
+        """Возвращает True, если подпись транзакции этим ключом уже была проверена."""
+        if not self.enabled:
+            return False
+        key = self._make_key(tx_id, public_key_pem)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True
+            self._misses += 1
+            return False
+
+    def remember(self, tx_id: str, public_key_pem: str):
+        """Запоминает успешную проверку."""
+        if not self.enabled or not self.capacity:
+            return
+        key = self._make_key(tx_id, public_key_pem)
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Очищает кэш и сбрасывает статистику."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Статистика попаданий: hits, misses, hit_rate, size."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "size": len(self._entries),
+                "capacity": self.capacity,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Общий кэш, используемый Transaction.verify_signature.
+verification_cache = VerificationCache()
@@ -0,0 +1,226 @@
+"""
+Ленивые представления (views) транзакций поверх двоичного буфера
+(bytes, memoryview или mmap) в формате binary_format.
+
+Представления не копируют буфер и декодируют поля только при обращении.
+Имена атрибутов совпадают с Transaction, TransactionInput и
+TransactionOutput, поэтому код фильтрации может работать с любыми из них;
+полный объект создается методом to_transaction()/to_input()/to_output().
+"""
+import struct
+from collections.abc import Sequence
+from typing import List, Optional, Tuple, Union
+
+from .binary_format import (
+    FLAG_BINARY_PREIMAGE, FLAG_SCHEME, FLAG_SIGNED, FORMAT_VERSION,
+    _AMOUNT, _COUNT, _HEADER, _INDEX, _LENGTH, _TAG, decode_recipient, unpack_header
+)
+from .keys import DEFAULT_SCHEME
+from .transaction import PREIMAGE_BINARY, PREIMAGE_JSON, Transaction
+from .transaction_input import TransactionInput
+from .transaction_output import TransactionOutput, to_units
+
+
+_CORRUPTED = "Двоичные данные транзакции обрезаны или повреждены"
+
+
+class TransactionInputView:
+    """Вход транзакции, читаемый из буфера при обращении к полям."""
+    __slots__ = ('_view', '_offset')
+
+    def __init__(self, view: memoryview, offset: int):
+        self._view = view
+        self._offset = offset
+
+    @property
+    def previous_tx_id(self) -> str:
+        (length,) = _LENGTH.unpack_from(self._view, self._offset)
+        start = self._offset + _LENGTH.size
+        return str(self._view[start:start + length], 'utf-8')
+
+    @property
+    def output_index(self) -> int:
+        (length,) = _LENGTH.unpack_from(self._view, self._offset)
+        return _INDEX.unpack_from(self._view, self._offset + _LENGTH.size + length)[0]
+
+    @property
+    def outpoint(self) -> Tuple[str, int]:
+        return (self.previous_tx_id, self.output_index)
+
+    def to_input(self) -> TransactionInput:
+        return TransactionInput.from_trusted(self.previous_tx_id, self.output_index)
+
+    def __repr__(self) -> str:
+        return f"TransactionInputView(previous_tx_id='{self.previous_tx_id}', output_index={self.output_index})"
+
+
+class TransactionOutputView:
+    """Выход транзакции, читаемый из буфера при обращении к полям."""
+    __slots__ = ('_view', '_offset')
+
+    def __init__(self, view: memoryview, offset: int):
+        self._view = view
+        self._offset = offset
+
+    @property
+    def recipient_address_pubkey_pem(self) -> str:
+        (tag,) = _TAG.unpack_from(self._view, self._offset)
+        (length,) = _LENGTH.unpack_from(self._view, self._offset + _TAG.size)
+        start = self._offset + _TAG.size + _LENGTH.size
+        return decode_recipient(tag, self._view[start:start + length].tobytes())
+
+    @property
+    def amount(self) -> float:
+        (length,) = _LENGTH.unpack_from(self._view, self._offset + _TAG.size)
+        return _AMOUNT.unpack_from(self._view, self._offset + _TAG.size + _LENGTH.size + length)[0]
+
+    @property
+    def units(self) -> int:
+        return to_units(self.amount)
+
+    def to_output(self) -> TransactionOutput:
+        return TransactionOutput.from_trusted(self.recipient_address_pubkey_pem, self.amount)
+
+    def __repr__(self) -> str:
+        return f"TransactionOutputView(amount={self.amount})"
+
+
+class _ViewSequence(Sequence):
+    """Неизменяемая последовательность представлений по заранее найденным смещениям."""
+    __slots__ = ('_view', '_offsets', '_factory')
+
+    def __init__(self, view: memoryview, offsets: List[int], factory):
+        self._view = view
+        self._offsets = offsets
+        self._factory = factory
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._factory(self._view, offset) for offset in self._offsets[index]]
+        return self._factory(self._view, self._offsets[index])
+
+
+class TransactionView:
+    """
+    Транзакция, читаемая из двоичного представления to_bytes() без
+    копирования. Заголовок разбирается при создании; смещения входов и
+    выходов находятся при первом обращении к inputs/outputs (читаются
+    только длины полей), значения полей декодируются при обращении.
+
+    tx_id не хранится в двоичном формате: его можно передать (например,
+    TransactionStore передает ключ записи), иначе он вычисляется через
+    to_transaction() при первом обращении.
+    """
+    __slots__ = ('_view', '_tx_id', 'timestamp', 'scheme', 'preimage_format',
+                 '_flags', '_body_offset', '_inputs', '_outputs', '_signature_offset')
+
+    def __init__(self, data, tx_id: Optional[str] = None):
+        view = memoryview(data)
+        try:
+            version, flags, timestamp = unpack_header(view)
+            offset = _HEADER.size
+            scheme = DEFAULT_SCHEME
+            if flags & FLAG_SCHEME:
+                (length,) = _LENGTH.unpack_from(view, offset)
+                offset += _LENGTH.size
+                if offset + length > len(view):
+                    raise struct.error("buffer too short")
+                scheme = str(view[offset:offset + length], 'ascii')
+                offset += length
+        except struct.error as e:
+            raise ValueError(_CORRUPTED) from e
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия двоичного формата: {version}")
+
+        self._view = view
+        self._tx_id = tx_id
+        self._flags = flags
+        self._body_offset = offset
+        self._inputs: Optional[_ViewSequence] = None
+        self._outputs: Optional[_ViewSequence] = None
+        self._signature_offset = 0
+        self.timestamp: Union[int, float] = timestamp
+        self.scheme: str = scheme
+        self.preimage_format: str = PREIMAGE_BINARY if flags & FLAG_BINARY_PREIMAGE else PREIMAGE_JSON
+
+    def _index_layout(self):
+        """Находит смещения входов, выходов и подписи, проверяя границы буфера."""
+        view = self._view
+        try:
+            offset = self._body_offset
+            (n_inputs,) = _COUNT.unpack_from(view, offset)
+            offset += _COUNT.size
+            input_offsets = []
+            for _ in range(n_inputs):
+                input_offsets.append(offset)
+                (length,) = _LENGTH.unpack_from(view, offset)
+                offset += _LENGTH.size + length + _INDEX.size
+
+            (n_outputs,) = _COUNT.unpack_from(view, offset)
+            offset += _COUNT.size
+            output_offsets = []
+            for _ in range(n_outputs):
+                output_offsets.append(offset)
+                (length,) = _LENGTH.unpack_from(view, offset + _TAG.size)
+                offset += _TAG.size + _LENGTH.size + length + _AMOUNT.size
+
+            signature_offset = offset
+            if self._flags & FLAG_SIGNED:
+                (length,) = _LENGTH.unpack_from(view, offset)
+                offset += _LENGTH.size + length
+        except struct.error as e:
+            raise ValueError(_CORRUPTED) from e
+        if offset > len(view):
+            raise ValueError(_CORRUPTED)
+        if offset != len(view):
+            raise ValueError("Лишние байты после двоичных данных транзакции")
+
+        self._inputs = _ViewSequence(view, input_offsets, TransactionInputView)
+        self._outputs = _ViewSequence(view, output_offsets, TransactionOutputView)
+        self._signature_offset = signature_offset
+
+    @property
+    def inputs(self) -> _ViewSequence:
+        if self._inputs is None:
+            self._index_layout()
+        return self._inputs
+
+    @property
+    def outputs(self) -> _ViewSequence:
+        if self._outputs is None:
+            self._index_layout()
+        return self._outputs
+
+    @property
+    def signature(self) -> Optional[bytes]:
+        if not self._flags & FLAG_SIGNED:
+            return None
+        if self._inputs is None:
+            self._index_layout()
+        (length,) = _LENGTH.unpack_from(self._view, self._signature_offset)
+        start = self._signature_offset + _LENGTH.size
+        return self._view[start:start + length].tobytes()
+
+    @property
+    def tx_id(self) -> str:
+        if self._tx_id is None:
+            self._tx_id = self.to_transaction(trusted=True).tx_id
+        return self._tx_id
+
+    def is_coinbase(self) -> bool:
+        return len(self.inputs) == 0
+
+    def to_transaction(self, trusted: bool = False) -> Transaction:
+        """
+        Создает полную транзакцию. При trusted=True используется быстрый
+        путь Transaction.from_trusted и переданный tx_id.
+        """
+        if trusted:
+            return Transaction.from_bytes(self._view, trusted=True, tx_id=self._tx_id)
+        return Transaction.from_bytes(self._view)
+
+    def __repr__(self) -> str:
+        return f"TransactionView(timestamp={self.timestamp}, scheme='{self.scheme}')"
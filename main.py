@@ -3,7 +3,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
 from blockchain_transaction import (
-    Transaction, TransactionInput, TransactionOutput,
+    Transaction, TransactionInput, TransactionOutput, TransactionGraph,
     generate_rsa_keys, serialize_private_key, serialize_public_key
 )
 
@@ -75,6 +75,11 @@ def main():
     else:
         print("Ошибка: Связь транзакций нарушена!")
 
+    graph = TransactionGraph()
+    graph.add_many([coinbase_tx, alice_to_bob_tx])
+    print(f"Предки транзакции Алисы->Боб по графу: {list(graph.ancestors(alice_to_bob_tx.tx_id))}")
+    print(f"Выход 0 Coinbase потрачен транзакцией: {graph.spender_of(coinbase_tx.tx_id, 0)}")
+
     # --- Демонстрация сериализации/десериализации ---
     print("\n--- Сериализация и Десериализация ---")
     tx_dict = alice_to_bob_tx.to_dict()
@@ -0,0 +1,69 @@
+import unittest
+import hashlib
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cryptography.hazmat.primitives import serialization
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput,
+    generate_rsa_keys, serialize_private_key, serialize_public_key,
+    AddressRegistry, address_from_public_key, is_fingerprint_address, default_registry
+)
+
+class TestAddress(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        alice_private_key, cls.alice_public_key = generate_rsa_keys()
+        cls.alice_private_pem = serialize_private_key(alice_private_key)
+        cls.alice_public_pem = serialize_public_key(cls.alice_public_key)
+        cls.bob_public_pem = serialize_public_key(generate_rsa_keys()[1])
+
+    def test_address_is_sha256_of_der(self):
+        der = self.alice_public_key.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        address = address_from_public_key(self.alice_public_pem)
+        self.assertEqual(address, hashlib.sha256(der).hexdigest())
+        self.assertTrue(is_fingerprint_address(address))
+        self.assertFalse(is_fingerprint_address(self.alice_public_pem))
+
+    def test_registry_register_and_resolve(self):
+        registry = AddressRegistry()
+        address = registry.register(self.alice_public_pem)
+        self.assertIn(address, registry)
+        self.assertEqual(registry.resolve(address), self.alice_public_pem)
+        self.assertIs(registry.register(self.alice_public_pem), address)
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(registry.resolve_key(self.bob_public_pem), self.bob_public_pem)
+        self.assertTrue(registry.remove(address))
+        self.assertIsNone(registry.resolve(address))
+
+    def test_output_for_public_key_uses_address(self):
+        registry = AddressRegistry()
+        out = TransactionOutput.for_public_key(self.bob_public_pem, 10.0, registry=registry)
+        self.assertTrue(out.has_fingerprint_address())
+        self.assertEqual(len(out.recipient_address_pubkey_pem), 64)
+        self.assertEqual(registry.resolve(out.recipient_address_pubkey_pem), self.bob_public_pem)
+
+    def test_fingerprint_output_binary_roundtrip(self):
+        out = TransactionOutput.for_public_key(self.bob_public_pem, 10.0)
+        tx = Transaction(inputs=[TransactionInput("prev_tx_addr", 0)], outputs=[out], timestamp=1678886400.0)
+        tx_pem = Transaction(inputs=[TransactionInput("prev_tx_addr", 0)],
+                             outputs=[TransactionOutput(self.bob_public_pem, 10.0)], timestamp=1678886400.0)
+        self.assertLess(len(tx.to_bytes()) * 4, len(tx_pem.to_bytes()))
+        self.assertEqual(Transaction.from_bytes(tx.to_bytes()).tx_id, tx.tx_id)
+
+    def test_verify_signature_with_registered_address(self):
+        address = default_registry.register(self.alice_public_pem)
+        tx = Transaction(inputs=[TransactionInput("prev_tx_addr", 0)],
+                         outputs=[TransactionOutput.for_public_key(self.bob_public_pem, 5.0)])
+        tx.sign(self.alice_private_pem)
+        self.assertTrue(tx.verify_signature(address))
+        self.assertFalse(tx.verify_signature("0" * 64)) # Неизвестный адрес
+
+if __name__ == '__main__':
+    unittest.main()
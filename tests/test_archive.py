@@ -0,0 +1,79 @@
+import unittest
+import gzip
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput,
+    generate_rsa_keys, serialize_private_key, serialize_public_key,
+    ArchiveStats, iter_jsonl, write_jsonl
+)
+
+class TestArchive(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        private_key, public_key = generate_rsa_keys()
+        cls.private_pem = serialize_private_key(private_key)
+        cls.public_pem = serialize_public_key(public_key)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.transactions = []
+        for i in range(5):
+            tx = Transaction(inputs=[TransactionInput(f"prev_tx_{i}", i)],
+                             outputs=[TransactionOutput(self.public_pem, 1.0 + i)],
+                             timestamp=1678886400.0 + i)
+            tx.sign(self.private_pem)
+            self.transactions.append(tx)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_write_and_read_roundtrip(self):
+        path = self.path("archive.jsonl")
+        stats = write_jsonl(path, iter(self.transactions))
+        self.assertEqual(stats.count, 5)
+        restored = list(iter_jsonl(path))
+        self.assertEqual([tx.to_dict() for tx in restored], [tx.to_dict() for tx in self.transactions])
+        self.assertTrue(restored[0].verify_signature(self.public_pem))
+
+    def test_gzip_is_chosen_by_extension(self):
+        path = self.path("archive.jsonl.gz")
+        write_jsonl(path, self.transactions)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 5)
+        self.assertEqual([tx.tx_id for tx in iter_jsonl(path)], [tx.tx_id for tx in self.transactions])
+
+    def test_trusted_read_keeps_stored_tx_id(self):
+        path = self.path("archive.jsonl")
+        write_jsonl(path, self.transactions[:1])
+        with open(path, "r", encoding="utf-8") as f:
+            line = f.read().replace(self.transactions[0].tx_id, "stored_tx_id")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(line)
+
+        self.assertEqual(next(iter_jsonl(path, trusted=True)).tx_id, "stored_tx_id")
+        self.assertEqual(next(iter_jsonl(path)).tx_id, self.transactions[0].tx_id)
+
+    def test_read_collects_stats(self):
+        path = self.path("archive.jsonl")
+        write_jsonl(path, self.transactions)
+        stats = ArchiveStats()
+        for _ in iter_jsonl(path, stats=stats):
+            pass
+        self.assertEqual(stats.count, 5)
+        self.assertGreater(stats.tx_per_second, 0)
+
+    def test_invalid_line_raises_error(self):
+        path = self.path("archive.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{not json}\n")
+        with self.assertRaisesRegex(ValueError, "Некорректная строка 1"):
+            list(iter_jsonl(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, UTXOSet,
+    generate_rsa_keys, serialize_private_key, serialize_public_key,
+    dependency_waves, validate_batch_in_waves
+)
+
+class TestBatchValidation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        alice_private_key, alice_public_key = generate_rsa_keys()
+        cls.alice_private_pem = serialize_private_key(alice_private_key)
+        cls.alice_public_pem = serialize_public_key(alice_public_key)
+        bob_private_key, bob_public_key = generate_rsa_keys()
+        cls.bob_private_pem = serialize_private_key(bob_private_key)
+        cls.bob_public_pem = serialize_public_key(bob_public_key)
+
+    def setUp(self):
+        self.coinbase = Transaction(inputs=[], outputs=[TransactionOutput(self.alice_public_pem, 100.0)],
+                                    timestamp=1678886400.0)
+        self.utxo = UTXOSet()
+        self.utxo.apply(self.coinbase)
+
+    def spend(self, outpoints, outputs, private_pem, timestamp=1678886401.0):
+        tx = Transaction(inputs=[TransactionInput(tx_id, index) for tx_id, index in outpoints],
+                         outputs=[TransactionOutput(pem, amount) for pem, amount in outputs],
+                         timestamp=timestamp)
+        tx.sign(private_pem)
+        return tx
+
+    @staticmethod
+    def output_of(tx, public_pem):
+        # Выходы транзакции отсортированы по получателю: индекс ищется по ключу.
+        return next(index for index, out in enumerate(tx.outputs)
+                    if out.recipient_address_pubkey_pem == public_pem)
+
+    def make_chain(self):
+        # coinbase -> a (Алиса платит Бобу, сдача Алисе) -> b (Боб платит Алисе), c (Алиса платит Бобу)
+        a = self.spend([(self.coinbase.tx_id, 0)],
+                       [(self.bob_public_pem, 60.0), (self.alice_public_pem, 40.0)], self.alice_private_pem)
+        b = self.spend([(a.tx_id, self.output_of(a, self.bob_public_pem))],
+                       [(self.alice_public_pem, 59.5)], self.bob_private_pem)
+        c = self.spend([(a.tx_id, self.output_of(a, self.alice_public_pem))],
+                       [(self.bob_public_pem, 40.0)], self.alice_private_pem)
+        return a, b, c
+
+    def test_waves_follow_dependencies(self):
+        a, b, c = self.make_chain()
+        waves, blocked = dependency_waves([b, c, a])
+        self.assertEqual(waves, [[2], [0, 1]])
+        self.assertEqual(blocked, [])
+
+    def test_chain_in_batch_is_valid(self):
+        a, b, c = self.make_chain()
+        report = validate_batch_in_waves([b, c, a], self.utxo)
+        self.assertTrue(report.valid, report.errors())
+        self.assertEqual([verdict.wave for verdict in report.verdicts], [1, 1, 0])
+        self.assertEqual(len(self.utxo), 1) # Исходное множество не изменяется
+
+    def test_parallel_signature_checks(self):
+        a, b, c = self.make_chain()
+        report = validate_batch_in_waves([a, b, c], self.utxo, workers=2, serial_threshold=0)
+        self.assertTrue(report.valid, report.errors())
+
+    def test_invalid_parent_invalidates_children(self):
+        forged = self.spend([(self.coinbase.tx_id, 0)],
+                            [(self.bob_public_pem, 60.0), (self.alice_public_pem, 40.0)], self.bob_private_pem)
+        child = self.spend([(forged.tx_id, self.output_of(forged, self.bob_public_pem))],
+                           [(self.alice_public_pem, 10.0)], self.bob_private_pem)
+        report = validate_batch_in_waves([forged, child], self.utxo)
+        errors = report.errors()
+        self.assertEqual(errors[forged.tx_id], "Подпись транзакции неверна")
+        self.assertIn("Родительская транзакция", errors[child.tx_id])
+
+    def test_missing_outpoint_and_inflation_are_reported(self):
+        missing = self.spend([("unknown_tx", 0)], [(self.bob_public_pem, 1.0)], self.alice_private_pem)
+        inflated = self.spend([(self.coinbase.tx_id, 0)], [(self.bob_public_pem, 100.5)], self.alice_private_pem)
+        errors = validate_batch_in_waves([missing, inflated], self.utxo).errors()
+        self.assertIn("отсутствует или уже потрачен", errors[missing.tx_id])
+        self.assertEqual(errors[inflated.tx_id], "Сумма выходов превышает сумму входов")
+
+    def test_double_spend_within_batch(self):
+        first = self.spend([(self.coinbase.tx_id, 0)], [(self.bob_public_pem, 100.0)], self.alice_private_pem)
+        second = self.spend([(self.coinbase.tx_id, 0)], [(self.alice_public_pem, 100.0)],
+                            self.alice_private_pem, timestamp=1678886402.0)
+        report = validate_batch_in_waves([first, second], self.utxo)
+        self.assertTrue(report.verdicts[0].valid)
+        self.assertIn("Двойная трата", report.verdicts[1].error)
+
+    def test_bad_signature_does_not_claim_outpoint(self):
+        # Конфликтующая трата, подписанная чужим ключом, стоит в пакете раньше корректной.
+        forged = self.spend([(self.coinbase.tx_id, 0)], [(self.bob_public_pem, 100.0)], self.bob_private_pem)
+        honest = self.spend([(self.coinbase.tx_id, 0)], [(self.alice_public_pem, 100.0)],
+                            self.alice_private_pem, timestamp=1678886402.0)
+        report = validate_batch_in_waves([forged, honest], self.utxo)
+        self.assertEqual(report.verdicts[0].error, "Подпись транзакции неверна")
+        self.assertTrue(report.verdicts[1].valid, report.errors())
+
+    def test_cycle_is_reported(self):
+        x = Transaction.from_trusted([TransactionInput("tx_y", 0)], [TransactionOutput("addr", 1.0)], 1.0,
+                                     tx_id="tx_x")
+        y = Transaction.from_trusted([TransactionInput("tx_x", 0)], [TransactionOutput("addr", 1.0)], 1.0,
+                                     tx_id="tx_y")
+        report = validate_batch_in_waves([x, y], self.utxo)
+        self.assertEqual(report.waves, [])
+        self.assertTrue(all("Циклическая зависимость" in error for error in report.errors().values()))
+
+if __name__ == '__main__':
+    unittest.main()
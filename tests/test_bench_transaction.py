@@ -0,0 +1,55 @@
+import json
+import unittest
+import os
+import sys
+BENCHMARKS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from bench_transaction import Fixture, compare_with_baseline, run_benchmarks, _measure
+
+def make_result(key, ops_per_sec):
+    return {"key": key, "ops_per_sec": ops_per_sec}
+
+class TestCompareWithBaseline(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline = {"results": [make_result("sign[io=1]", 1000.0),
+                                     make_result("verify[io=1]", 10000.0),
+                                     make_result("hash[io=1]", 0.0)]}
+
+    def test_slowdown_beyond_threshold_is_regression(self):
+        regressions = compare_with_baseline([make_result("sign[io=1]", 800.0)], self.baseline, 0.10)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("sign[io=1]", regressions[0])
+        self.assertIn("-20.0%", regressions[0])
+
+    def test_slowdown_within_threshold_and_speedup_pass(self):
+        results = [make_result("sign[io=1]", 950.0), make_result("verify[io=1]", 20000.0)]
+        self.assertEqual(compare_with_baseline(results, self.baseline, 0.10), [])
+
+    def test_unknown_and_empty_references_are_skipped(self):
+        results = [make_result("construct[io=1]", 1.0), make_result("hash[io=1]", 1.0)]
+        self.assertEqual(compare_with_baseline(results, self.baseline, 0.10), [])
+        self.assertEqual(compare_with_baseline(results, {}, 0.10), [])
+
+class TestRunBenchmarks(unittest.TestCase):
+
+    def test_measure_reports_median_of_auto_ranged_series(self):
+        calls = []
+        timing = _measure(lambda: calls.append(None), repeat=3, min_time=0.001)
+        self.assertGreater(timing["number"], 1)
+        self.assertGreaterEqual(len(calls), 3 * timing["number"])
+        self.assertLessEqual(timing["min_seconds"], timing["seconds"])
+        self.assertLessEqual(timing["seconds"], timing["max_seconds"])
+
+    def test_committed_baseline_covers_benchmark_keys(self):
+        with open(os.path.join(BENCHMARKS_DIR, "baseline.json"), encoding="utf-8") as f:
+            baseline = json.load(f)
+        results = run_benchmarks(Fixture(seed=1), io_sizes=[1], batch_sizes=[1], repeat=1, min_time=0.0001)
+        baseline_keys = {result["key"] for result in baseline["results"]}
+        self.assertEqual({result["key"] for result in results} - baseline_keys, set())
+        self.assertTrue(all(result["ops_per_sec"] > 0 for result in results))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput,
+    generate_rsa_keys, serialize_private_key, serialize_public_key
+)
+from blockchain_transaction.binary_format import (
+    encode_recipient, decode_recipient, RECIPIENT_DER, RECIPIENT_TEXT
+)
+
+class TestBinaryFormat(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        alice_private_key, alice_public_key = generate_rsa_keys()
+        cls.alice_private_pem = serialize_private_key(alice_private_key)
+        cls.alice_public_pem = serialize_public_key(alice_public_key)
+        cls.bob_public_pem = serialize_public_key(generate_rsa_keys()[1])
+        cls.fixed_timestamp = 1678886400.0
+
+    def make_tx(self, **kwargs):
+        return Transaction(
+            inputs=[TransactionInput("prev_tx_bin", 0), TransactionInput("prev_tx_bin", 3)],
+            outputs=[TransactionOutput(self.bob_public_pem, 25.0), TransactionOutput(self.alice_public_pem, 74.5)],
+            timestamp=self.fixed_timestamp, **kwargs
+        )
+
+    def test_pem_recipient_is_encoded_as_der(self):
+        tag, data = encode_recipient(self.alice_public_pem)
+        self.assertEqual(tag, RECIPIENT_DER)
+        self.assertLess(len(data), len(self.alice_public_pem))
+        self.assertEqual(decode_recipient(tag, data), self.alice_public_pem)
+
+    def test_text_recipient_is_kept_as_text(self):
+        tag, data = encode_recipient("addr1")
+        self.assertEqual(tag, RECIPIENT_TEXT)
+        self.assertEqual(decode_recipient(tag, data), "addr1")
+
+    def test_unsigned_roundtrip(self):
+        tx = self.make_tx()
+        tx_restored = Transaction.from_bytes(tx.to_bytes())
+        self.assertEqual(tx_restored.to_dict(), tx.to_dict())
+
+    def test_signed_roundtrip_is_smaller_than_json(self):
+        tx = self.make_tx()
+        tx.sign(self.alice_private_pem)
+        data = tx.to_bytes()
+        self.assertLess(len(data), len(json.dumps(tx.to_dict())) * 3 // 5)
+
+        tx_restored = Transaction.from_bytes(data)
+        self.assertEqual(tx_restored.tx_id, tx.tx_id)
+        self.assertEqual(tx_restored.signature, tx.signature)
+        self.assertTrue(tx_restored.verify_signature(self.alice_public_pem))
+
+    def test_integer_timestamp_keeps_type(self):
+        tx = Transaction(inputs=[TransactionInput("prev_tx_bin", 0)],
+                         outputs=[TransactionOutput(self.bob_public_pem, 25.0)], timestamp=1700000000)
+        tx.sign(self.alice_private_pem)
+        for restored in (Transaction.from_bytes(tx.to_bytes()),
+                         Transaction.from_bytes(tx.to_bytes(), trusted=True)):
+            self.assertIs(type(restored.timestamp), int)
+            self.assertEqual(restored.tx_id, tx.tx_id)
+            self.assertTrue(restored.verify_signature(self.alice_public_pem))
+
+        # Двоичный прообраз не зависит от типа метки времени.
+        tx_binary = Transaction(inputs=[TransactionInput("prev_tx_bin", 0)],
+                                outputs=[TransactionOutput(self.bob_public_pem, 25.0)],
+                                timestamp=1700000000, preimage_format="binary")
+        tx_binary_float = Transaction(inputs=[TransactionInput("prev_tx_bin", 0)],
+                                      outputs=[TransactionOutput(self.bob_public_pem, 25.0)],
+                                      timestamp=1700000000.0, preimage_format="binary")
+        self.assertEqual(tx_binary.tx_id, tx_binary_float.tx_id)
+        self.assertEqual(Transaction.from_bytes(tx_binary.to_bytes()).tx_id, tx_binary.tx_id)
+
+    def test_binary_preimage_mode(self):
+        tx_json = self.make_tx()
+        tx_binary = self.make_tx(preimage_format="binary")
+        self.assertNotEqual(tx_binary.tx_id, tx_json.tx_id)
+        self.assertLess(len(tx_binary._get_data_for_signing()), len(tx_json._get_data_for_signing()))
+
+        tx_binary.sign(self.alice_private_pem)
+        tx_restored = Transaction.from_bytes(tx_binary.to_bytes())
+        self.assertEqual(tx_restored.preimage_format, "binary")
+        self.assertEqual(tx_restored.tx_id, tx_binary.tx_id)
+        self.assertTrue(tx_restored.verify_signature(self.alice_public_pem))
+
+        tx_from_dict = Transaction.from_dict(tx_binary.to_dict())
+        self.assertEqual(tx_from_dict.tx_id, tx_binary.tx_id)
+
+    def test_default_preimage_format_is_not_written_to_dict(self):
+        self.assertNotIn("preimage_format", self.make_tx().to_dict())
+        self.assertEqual(self.make_tx(preimage_format="binary").to_dict()["preimage_format"], "binary")
+
+    def test_unknown_preimage_format_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Неизвестный формат данных для подписи"):
+            self.make_tx(preimage_format="xml")
+
+    def test_truncated_data_raises_error(self):
+        data = self.make_tx().to_bytes()
+        with self.assertRaisesRegex(ValueError, "обрезаны или повреждены"):
+            Transaction.from_bytes(data[:-3])
+
+    def test_trailing_bytes_raise_error(self):
+        with self.assertRaisesRegex(ValueError, "Лишние байты"):
+            Transaction.from_bytes(self.make_tx().to_bytes() + b"\x00")
+
+    def test_unknown_version_raises_error(self):
+        data = bytearray(self.make_tx().to_bytes())
+        data[0] = 99
+        with self.assertRaisesRegex(ValueError, "Неподдерживаемая версия"):
+            Transaction.from_bytes(bytes(data))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, UTXOSet, OutputColumns
+)
+
+@unittest.skipUnless(np is not None, "numpy не установлен")
+class TestOutputColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.coinbase = Transaction(inputs=[], outputs=[TransactionOutput("alice", 100.0),
+                                                        TransactionOutput("bob", 0.1)],
+                                    timestamp=1678886400.0)
+        self.spend = Transaction(inputs=[TransactionInput(self.coinbase.tx_id, 0)],
+                                 outputs=[TransactionOutput("bob", 25.0), TransactionOutput("carol", 75.0)],
+                                 timestamp=1678886401.0)
+
+    def test_columns_from_transactions(self):
+        columns = OutputColumns.from_transactions([self.coinbase, self.spend])
+        self.assertEqual(len(columns), 4)
+        self.assertEqual(columns.units.dtype, np.int64)
+        self.assertEqual(int(columns.spent.sum()), 1)
+        self.assertEqual(columns.outpoints[0], (self.coinbase.tx_id, 0))
+        self.assertEqual(columns.addresses[columns.address_ids[0]], "alice")
+
+    def test_balances_and_supply(self):
+        columns = OutputColumns.from_transactions([self.coinbase, self.spend])
+        self.assertEqual(columns.balances(), {"bob": 25.1, "carol": 75.0})
+        self.assertEqual(columns.balance("alice"), 0.0)
+        self.assertEqual(columns.balance("unknown"), 0.0)
+        self.assertEqual(columns.total_supply_units(), 100_10_000_000)
+        self.assertEqual(columns.total_supply(), 100.1)
+
+    def test_columns_match_utxo_set(self):
+        utxo = UTXOSet()
+        utxo.apply_batch([self.coinbase, self.spend])
+        from_utxo = OutputColumns.from_utxo_set(utxo)
+        self.assertFalse(from_utxo.spent.any())
+        self.assertEqual(from_utxo.balances(),
+                         OutputColumns.from_transactions([self.coinbase, self.spend]).balances())
+
+    def test_mark_spent(self):
+        columns = OutputColumns.from_transactions([self.coinbase])
+        self.assertEqual(columns.mark_spent([(self.coinbase.tx_id, 1), ("unknown", 0)]), 1)
+        self.assertEqual(columns.balances(), {"alice": 100.0})
+
+    def test_histogram(self):
+        columns = OutputColumns.from_transactions([self.coinbase, self.spend])
+        counts, edges = columns.histogram(bins=[0, 1, 50, 100])
+        self.assertEqual(counts.tolist(), [1, 1, 1])
+        counts, _ = columns.histogram(bins=[0, 1, 50, 101], include_spent=True)
+        self.assertEqual(counts.tolist(), [1, 1, 2])
+
+    def test_columns_must_have_equal_length(self):
+        with self.assertRaisesRegex(ValueError, "одинаковую длину"):
+            OutputColumns([("tx", 0)], [1, 2], [0], ["alice"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    BloomFilter, CuckooFilter, Transaction, TransactionInput, TransactionOutput,
+    TransactionStore, SQLiteTransactionStore
+)
+from blockchain_transaction.filters import extend_filter
+
+class FilterContract:
+    """Общие проверки для BloomFilter и CuckooFilter."""
+    filter_class = None
+
+    def test_no_false_negatives(self):
+        membership_filter = self.filter_class(2000, 0.01)
+        keys = [f"{i:064x}" for i in range(2000)]
+        membership_filter.add_many(keys)
+        self.assertEqual(len(membership_filter), 2000)
+        self.assertTrue(all(key in membership_filter for key in keys))
+
+    def test_false_positive_rate_is_bounded(self):
+        membership_filter = self.filter_class(5000, 0.01)
+        membership_filter.add_many(f"present_{i}" for i in range(5000))
+        false_positives = sum(f"absent_{i}" in membership_filter for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+    def test_outpoint_keys(self):
+        membership_filter = self.filter_class(100)
+        membership_filter.add(("a" * 64, 1))
+        self.assertIn(("a" * 64, 1), membership_filter)
+        self.assertNotIn(("a" * 64, 2), membership_filter)
+
+    def test_save_and_load(self):
+        membership_filter = self.filter_class(1000, 0.001)
+        membership_filter.add_many(str(i) for i in range(500))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "filter.bin")
+            membership_filter.save(path)
+            restored = self.filter_class.load(path)
+        self.assertEqual(restored.to_bytes(), membership_filter.to_bytes())
+        self.assertEqual(len(restored), 500)
+        self.assertTrue(all(str(i) in restored for i in range(500)))
+
+    def test_corrupted_data(self):
+        data = self.filter_class(100).to_bytes()
+        with self.assertRaisesRegex(ValueError, "обрезаны или повреждены"):
+            self.filter_class.from_bytes(data[:-1])
+        with self.assertRaisesRegex(ValueError, "обрезаны или повреждены"):
+            self.filter_class.from_bytes(data[:10])
+        with self.assertRaisesRegex(ValueError, "не являются"):
+            self.filter_class.from_bytes(b"XXXX" + data[4:])
+
+    def test_invalid_parameters(self):
+        with self.assertRaisesRegex(ValueError, "capacity"):
+            self.filter_class(0)
+        with self.assertRaisesRegex(ValueError, "false_positive_rate"):
+            self.filter_class(10, 1.0)
+        with self.assertRaisesRegex(ValueError, "ключа фильтра"):
+            self.filter_class(10).add(42)
+
+
+class TestBloomFilter(FilterContract, unittest.TestCase):
+    filter_class = BloomFilter
+
+
+class TestCuckooFilter(FilterContract, unittest.TestCase):
+    filter_class = CuckooFilter
+
+    def test_remove(self):
+        cuckoo = CuckooFilter(100)
+        cuckoo.add_many(["a", "b"])
+        self.assertTrue(cuckoo.remove("a"))
+        self.assertNotIn("a", cuckoo)
+        self.assertIn("b", cuckoo)
+        self.assertEqual(len(cuckoo), 1)
+        self.assertFalse(cuckoo.remove("a"))
+
+    def test_full_filter_raises_and_keeps_keys(self):
+        cuckoo = CuckooFilter(8, bucket_size=1, max_kicks=10)
+        added = []
+        with self.assertRaisesRegex(ValueError, "заполнен"):
+            for i in range(1000):
+                cuckoo.add(str(i))
+                added.append(str(i))
+        self.assertTrue(all(key in cuckoo for key in added))
+        self.assertEqual(len(cuckoo), len(added))
+
+    def test_extend_filter_disables_overflowed_filter(self):
+        cuckoo = CuckooFilter(8, bucket_size=1, max_kicks=10)
+        self.assertIsNone(extend_filter(cuckoo, (str(i) for i in range(1000))))
+        bloom = BloomFilter(10)
+        self.assertIs(extend_filter(bloom, ["a"]), bloom)
+        self.assertIsNone(extend_filter(None, ["a"]))
+
+
+class TestStoreFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.coinbase = Transaction(inputs=[], outputs=[TransactionOutput("addr_alice", 100.0)],
+                                    timestamp=1678886400.0)
+        self.spend = Transaction(inputs=[TransactionInput(self.coinbase.tx_id, 0)],
+                                 outputs=[TransactionOutput("addr_bob", 100.0)],
+                                 timestamp=1678886401.0)
+        self.unknown_tx_id = "f" * 64
+
+    def test_transaction_store_filter(self):
+        directory = os.path.join(self.tmp_dir.name, "store")
+        store = TransactionStore(directory, tx_filter=BloomFilter(1000))
+        store.append_many([self.coinbase])
+        self.assertIn(self.coinbase.tx_id, store.tx_filter)
+        self.assertIn(self.coinbase.tx_id, store)
+        self.assertNotIn(self.unknown_tx_id, store)
+        self.assertIsNone(store.get(self.unknown_tx_id))
+        store.close()
+
+        # Пустой фильтр заполняется ключами существующего хранилища.
+        store = TransactionStore(directory, tx_filter=CuckooFilter(1000))
+        self.addCleanup(store.close)
+        self.assertIn(self.coinbase.tx_id, store.tx_filter)
+        self.assertEqual(store.get(self.coinbase.tx_id).to_dict(), self.coinbase.to_dict())
+
+    def test_sqlite_store_filters(self):
+        path = os.path.join(self.tmp_dir.name, "transactions.db")
+        store = SQLiteTransactionStore(path, tx_filter=BloomFilter(1000), spent_filter=CuckooFilter(1000))
+        self.assertEqual(store.add_many([self.coinbase, self.spend]), 2)
+        self.assertFalse(store.add(self.coinbase))
+        self.assertIn(self.spend.tx_id, store)
+        self.assertNotIn(self.unknown_tx_id, store)
+        self.assertIsNone(store.get(self.unknown_tx_id))
+        self.assertEqual(store.spender_of(self.coinbase.tx_id, 0), self.spend.tx_id)
+        self.assertIsNone(store.spender_of(self.spend.tx_id, 0))
+        store.close()
+
+        store = SQLiteTransactionStore(path, tx_filter=BloomFilter(1000), spent_filter=BloomFilter(1000))
+        self.addCleanup(store.close)
+        self.assertIn(self.coinbase.tx_id, store.tx_filter)
+        self.assertIn((self.coinbase.tx_id, 0), store.spent_filter)
+        self.assertEqual(store.spender_of(self.coinbase.tx_id, 0), self.spend.tx_id)
+
+    def test_overflowed_filter_is_disabled(self):
+        path = os.path.join(self.tmp_dir.name, "transactions.db")
+        store = SQLiteTransactionStore(path, tx_filter=CuckooFilter(1, bucket_size=1, max_kicks=1))
+        self.addCleanup(store.close)
+        transactions = [Transaction(inputs=[], outputs=[TransactionOutput("addr_alice", 1.0)],
+                                    timestamp=1678886400.0 + i) for i in range(10)]
+        store.add_many(transactions)
+        self.assertIsNone(store.tx_filter)
+        self.assertTrue(all(tx.tx_id in store for tx in transactions))
+
+
+if __name__ == '__main__':
+    unittest.main()
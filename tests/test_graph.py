@@ -0,0 +1,73 @@
+import unittest
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import Transaction, TransactionInput, TransactionOutput, TransactionGraph
+
+def make_tx(outpoints, n_outputs, timestamp):
+    return Transaction(inputs=[TransactionInput(tx_id, index) for tx_id, index in outpoints],
+                       outputs=[TransactionOutput(f"addr{i}", 1.0 + i) for i in range(n_outputs)],
+                       timestamp=timestamp)
+
+class TestTransactionGraph(unittest.TestCase):
+
+    def setUp(self):
+        # coinbase -> (a, b); a:0 + b:0 -> c; c -> d
+        self.coinbase = make_tx([], 2, 1.0)
+        self.a = make_tx([(self.coinbase.tx_id, 0)], 1, 2.0)
+        self.b = make_tx([(self.coinbase.tx_id, 1)], 1, 3.0)
+        self.c = make_tx([(self.a.tx_id, 0), (self.b.tx_id, 0)], 1, 4.0)
+        self.d = make_tx([(self.c.tx_id, 0)], 1, 5.0)
+        self.graph = TransactionGraph()
+        # Порядок добавления не важен.
+        self.graph.add_many([self.d, self.c, self.b, self.a, self.coinbase])
+
+    def test_parents_and_children(self):
+        self.assertEqual(len(self.graph), 5)
+        self.assertCountEqual(self.graph.parents(self.c.tx_id), [self.a.tx_id, self.b.tx_id])
+        self.assertCountEqual(self.graph.children(self.coinbase.tx_id), [self.a.tx_id, self.b.tx_id])
+        self.assertEqual(self.graph.spender_of(self.coinbase.tx_id, 1), self.b.tx_id)
+        self.assertIsNone(self.graph.spender_of(self.d.tx_id, 0))
+
+    def test_ancestors_with_depth(self):
+        self.assertEqual(self.graph.ancestors(self.d.tx_id), {
+            self.c.tx_id: 1, self.a.tx_id: 2, self.b.tx_id: 2, self.coinbase.tx_id: 3
+        })
+        self.assertEqual(self.graph.ancestors(self.d.tx_id, depth=2), {
+            self.c.tx_id: 1, self.a.tx_id: 2, self.b.tx_id: 2
+        })
+        self.assertEqual(self.graph.ancestors(self.coinbase.tx_id), {})
+
+    def test_descendants_of_output(self):
+        self.assertEqual(self.graph.descendants(self.coinbase.tx_id, output_index=0), {
+            self.a.tx_id: 1, self.c.tx_id: 2, self.d.tx_id: 3
+        })
+        self.assertEqual(set(self.graph.descendants(self.coinbase.tx_id, depth=1)), {self.a.tx_id, self.b.tx_id})
+        self.assertEqual(self.graph.descendants(self.d.tx_id, output_index=0), {})
+
+    def test_unknown_parent_is_reported_but_not_known(self):
+        orphan = make_tx([("missing_tx", 0)], 1, 6.0)
+        self.graph.add(orphan)
+        self.assertEqual(self.graph.ancestors(orphan.tx_id), {"missing_tx": 1})
+        self.assertNotIn("missing_tx", self.graph)
+        with self.assertRaisesRegex(ValueError, "отсутствует в графе"):
+            self.graph.ancestors("missing_tx")
+
+    def test_deep_history_query_is_fast(self):
+        graph = TransactionGraph()
+        previous = make_tx([], 1, 0.0)
+        graph.add(previous)
+        for i in range(1, 20_000):
+            tx = Transaction.from_trusted([TransactionInput.from_trusted(previous.tx_id, 0)], [], float(i),
+                                          tx_id=f"tx{i}")
+            graph.add(tx)
+            previous = tx
+        started = time.perf_counter()
+        ancestors = graph.ancestors(previous.tx_id)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(len(ancestors), 19_999)
+
+if __name__ == '__main__':
+    unittest.main()
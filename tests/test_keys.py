@@ -12,7 +12,13 @@ from blockchain_transaction.keys import (
     serialize_private_key,
     serialize_public_key,
     deserialize_private_key,
-    deserialize_public_key
+    deserialize_public_key,
+    KeyCache,
+    generate_keys,
+    get_scheme,
+    scheme_for_key,
+    SIGNATURE_SCHEMES,
+    SignatureScheme
 )
 
 class TestKeys(unittest.TestCase):
@@ -90,5 +96,100 @@ class TestKeys(unittest.TestCase):
             verified = False
         self.assertTrue(verified, "Signature verification failed with deserialized keys")
 
+class TestKeyCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pems = [serialize_public_key(generate_rsa_keys()[1]) for _ in range(3)]
+
+    def test_key_cache_hits_and_misses(self):
+        cache = KeyCache(deserialize_public_key, capacity=2)
+        first = cache.get(self.pems[0])
+        second = cache.get(self.pems[0])
+        self.assertIs(first, second)
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_key_cache_evicts_least_recently_used(self):
+        cache = KeyCache(deserialize_public_key, capacity=2)
+        cache.get(self.pems[0])
+        cache.get(self.pems[1])
+        cache.get(self.pems[0]) # pems[1] становится самым старым
+        cache.get(self.pems[2])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertFalse(cache.invalidate(self.pems[1]))
+        self.assertTrue(cache.invalidate(self.pems[0]))
+
+    def test_key_cache_zero_capacity_disables_caching(self):
+        cache = KeyCache(deserialize_public_key, capacity=0)
+        cache.get(self.pems[0])
+        cache.get(self.pems[0])
+        self.assertEqual(cache.stats()["misses"], 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_key_cache_resize_evicts(self):
+        cache = KeyCache(deserialize_public_key, capacity=3)
+        for pem in self.pems:
+            cache.get(pem)
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.capacity, 1)
+
+    def test_key_cache_does_not_cache_invalid_pem(self):
+        cache = KeyCache(deserialize_public_key, capacity=2)
+        with self.assertRaises(ValueError):
+            cache.get("invalid pem data")
+        self.assertEqual(len(cache), 0)
+
+    def test_key_cache_invalid_capacity_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "capacity должен быть неотрицательным целым числом"):
+            KeyCache(deserialize_public_key, capacity=-1)
+
+class TestSignatureSchemes(unittest.TestCase):
+
+    def test_sign_verify_for_every_scheme(self):
+        for name, scheme in SIGNATURE_SCHEMES.items():
+            with self.subTest(scheme=name):
+                private_key, public_key = generate_keys(name)
+                self.assertIs(scheme_for_key(private_key), scheme)
+                self.assertIs(scheme_for_key(public_key), scheme)
+                signature = scheme.sign(private_key, b"message")
+                self.assertTrue(scheme.verify(public_key, signature, b"message"))
+                self.assertFalse(scheme.verify(public_key, signature, b"other message"))
+
+    def test_pem_roundtrip_for_every_scheme(self):
+        for name in SIGNATURE_SCHEMES:
+            with self.subTest(scheme=name):
+                private_key, public_key = generate_keys(name)
+                restored_private = deserialize_private_key(serialize_private_key(private_key))
+                restored_public = deserialize_public_key(serialize_public_key(public_key))
+                self.assertIs(scheme_for_key(restored_private), get_scheme(name))
+                self.assertIs(scheme_for_key(restored_public), get_scheme(name))
+
+    def test_verify_with_key_of_other_scheme_returns_false(self):
+        ed_private, _ = generate_keys("ed25519")
+        _, ec_public = generate_keys("ecdsa-secp256k1")
+        signature = get_scheme("ed25519").sign(ed_private, b"message")
+        self.assertFalse(get_scheme("ed25519").verify(ec_public, signature, b"message"))
+
+    def test_incomplete_scheme_cannot_be_instantiated(self):
+        class SignOnlyScheme(SignatureScheme):
+            name = "sign-only"
+
+            def sign(self, private_key, data):
+                return b""
+
+        with self.assertRaisesRegex(TypeError, "abstract"):
+            SignOnlyScheme()
+        with self.assertRaises(TypeError):
+            SignatureScheme()
+
+    def test_unknown_scheme_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Неизвестная схема подписи"):
+            get_scheme("dsa")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
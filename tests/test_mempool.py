@@ -0,0 +1,120 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, UTXOSet,
+    Mempool, FeePriority, transaction_fee
+)
+
+def make_tx(outpoints, amount, timestamp):
+    return Transaction(inputs=[TransactionInput(tx_id, index) for tx_id, index in outpoints],
+                       outputs=[TransactionOutput("addr_recipient", amount)],
+                       timestamp=timestamp)
+
+class TestMempool(unittest.TestCase):
+
+    def setUp(self):
+        self.utxo = UTXOSet()
+        for i in range(5):
+            self.utxo.add("funding_tx", i, TransactionOutput("addr_sender", 10.0))
+
+    def test_admit_and_lookup(self):
+        pool = Mempool()
+        tx = make_tx([("funding_tx", 0)], 9.0, 1.0)
+        self.assertTrue(pool.admit(tx))
+        self.assertFalse(pool.admit(tx)) # Повторный прием
+        self.assertIn(tx.tx_id, pool)
+        self.assertIs(pool.get(tx.tx_id), tx)
+        self.assertEqual(pool.spender_of(("funding_tx", 0)), tx.tx_id)
+        self.assertEqual(len(pool), 1)
+
+    def test_double_spend_is_rejected(self):
+        pool = Mempool()
+        pool.admit(make_tx([("funding_tx", 0)], 9.0, 1.0))
+        with self.assertRaisesRegex(ValueError, "Двойная трата"):
+            pool.admit(make_tx([("funding_tx", 0)], 8.0, 2.0))
+
+    def test_admit_many_reports_rejections(self):
+        pool = Mempool()
+        results = pool.admit_many([
+            make_tx([("funding_tx", 0)], 9.0, 1.0),
+            make_tx([("funding_tx", 0)], 8.0, 2.0),
+            make_tx([("funding_tx", 1)], 9.0, 3.0),
+        ])
+        self.assertEqual(results, [True, False, True])
+
+    def test_age_priority_evicts_newest(self):
+        pool = Mempool(max_size=2)
+        old = make_tx([("funding_tx", 0)], 9.0, 1.0)
+        middle = make_tx([("funding_tx", 1)], 9.0, 2.0)
+        pool.admit_many([old, middle])
+        with self.assertRaisesRegex(ValueError, "Мемпул заполнен"):
+            pool.admit(make_tx([("funding_tx", 2)], 9.0, 3.0))
+        oldest = make_tx([("funding_tx", 3)], 9.0, 0.5)
+        self.assertTrue(pool.admit(oldest))
+        self.assertNotIn(middle.tx_id, pool)
+        self.assertEqual(pool.by_priority(), [oldest, old])
+
+    def test_eviction_keeps_ancestors_of_incoming_transaction(self):
+        pool = Mempool(max_size=3)
+        # Предок с наименьшим приоритетом: его вытеснение удалило бы и child.
+        parent = make_tx([("funding_tx", 0)], 9.0, 5.0)
+        child = make_tx([(parent.tx_id, 0)], 8.0, 0.5)
+        other = make_tx([("funding_tx", 1)], 9.0, 4.0)
+        pool.admit_many([parent, child, other])
+        grandchild = make_tx([(child.tx_id, 0)], 7.0, 0.1)
+        self.assertTrue(pool.admit(grandchild))
+        self.assertNotIn(other.tx_id, pool)
+        self.assertEqual({tx.tx_id for tx in pool.by_priority()},
+                         {parent.tx_id, child.tx_id, grandchild.tx_id})
+
+    def test_full_pool_of_ancestors_rejects_transaction(self):
+        pool = Mempool(max_size=2)
+        parent = make_tx([("funding_tx", 0)], 9.0, 5.0)
+        child = make_tx([(parent.tx_id, 0)], 8.0, 4.0)
+        pool.admit_many([parent, child])
+        with self.assertRaisesRegex(ValueError, "Мемпул заполнен"):
+            pool.admit(make_tx([(child.tx_id, 0)], 7.0, 0.1))
+        self.assertEqual(len(pool), 2)
+        # Пропущенные при поиске записи кучи возвращены на место.
+        self.assertTrue(pool.admit(make_tx([("funding_tx", 1)], 9.0, 0.2)))
+        self.assertNotIn(parent.tx_id, pool)
+
+    def test_fee_priority_evicts_lowest_fee(self):
+        pool = Mempool(max_size=2, priority=FeePriority(self.utxo))
+        low_fee = make_tx([("funding_tx", 0)], 9.9, 1.0)
+        high_fee = make_tx([("funding_tx", 1)], 5.0, 1.0)
+        pool.admit_many([low_fee, high_fee])
+        self.assertTrue(pool.admit(make_tx([("funding_tx", 2)], 8.0, 1.0)))
+        self.assertNotIn(low_fee.tx_id, pool)
+        self.assertAlmostEqual(transaction_fee(high_fee, self.utxo), 5.0)
+
+    def test_remove_cascades_to_descendants(self):
+        pool = Mempool()
+        parent = make_tx([("funding_tx", 0)], 9.0, 1.0)
+        child = make_tx([(parent.tx_id, 0)], 8.0, 2.0)
+        pool.admit_many([parent, child])
+        self.assertEqual(sorted(pool.remove(parent.tx_id)), sorted([parent.tx_id, child.tx_id]))
+        self.assertEqual(len(pool), 0)
+        self.assertIsNone(pool.spender_of(("funding_tx", 0)))
+
+    def test_remove_confirmed_drops_conflicts_and_keeps_children(self):
+        pool = Mempool()
+        parent = make_tx([("funding_tx", 0)], 9.0, 1.0)
+        child = make_tx([(parent.tx_id, 0)], 8.0, 2.0)
+        pending_conflict = make_tx([("funding_tx", 1)], 9.0, 3.0)
+        pool.admit_many([parent, child, pending_conflict])
+
+        confirmed_conflict = make_tx([("funding_tx", 1)], 7.0, 4.0)
+        removed = pool.remove_confirmed([parent, confirmed_conflict])
+        self.assertEqual(sorted(removed), sorted([parent.tx_id, pending_conflict.tx_id]))
+        self.assertIn(child.tx_id, pool)
+
+    def test_invalid_max_size_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "max_size должен быть положительным целым числом"):
+            Mempool(max_size=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import MerkleTree
+
+class TestMerkleTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tx_ids = [f"tx_{i:03d}" for i in range(11)]
+
+    def test_empty_tree_has_no_root(self):
+        tree = MerkleTree()
+        self.assertIsNone(tree.root)
+        self.assertEqual(len(tree), 0)
+
+    def test_root_depends_on_order(self):
+        self.assertNotEqual(MerkleTree(["a", "b"]).root, MerkleTree(["b", "a"]).root)
+
+    def test_incremental_append_matches_full_build(self):
+        tree = MerkleTree()
+        for count, tx_id in enumerate(self.tx_ids, start=1):
+            self.assertEqual(tree.append(tx_id), count - 1)
+            self.assertEqual(tree.root, MerkleTree(self.tx_ids[:count]).root)
+
+    def test_replace_matches_full_build(self):
+        tree = MerkleTree(self.tx_ids)
+        tree.replace(6, "replaced")
+        expected = list(self.tx_ids)
+        expected[6] = "replaced"
+        self.assertEqual(tree.root_hex, MerkleTree(expected).root_hex)
+
+    def test_proofs_verify_for_every_leaf(self):
+        tree = MerkleTree(self.tx_ids)
+        for index, tx_id in enumerate(self.tx_ids):
+            proof = tree.proof(index)
+            self.assertLessEqual(len(proof), 4)
+            self.assertTrue(MerkleTree.verify_proof(tx_id, proof, tree.root))
+
+    def test_proof_rejects_wrong_leaf_or_root(self):
+        tree = MerkleTree(self.tx_ids)
+        proof = tree.proof(3)
+        self.assertFalse(MerkleTree.verify_proof(self.tx_ids[4], proof, tree.root))
+        self.assertFalse(MerkleTree.verify_proof(self.tx_ids[3], proof, MerkleTree(["x"]).root))
+
+    def test_proof_index_out_of_range_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Индекс листа вне диапазона"):
+            MerkleTree(self.tx_ids).proof(11)
+
+if __name__ == '__main__':
+    unittest.main()
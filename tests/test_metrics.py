@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput,
+    generate_rsa_keys, serialize_private_key, serialize_public_key,
+    Instrumentation, metrics
+)
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_disabled_stage_records_nothing(self):
+        instrumentation = Instrumentation()
+        with instrumentation.stage("sha256"):
+            pass
+        instrumentation.increment("verify_ok")
+        self.assertEqual(instrumentation.snapshot(), {"counters": {}, "stages": {}})
+
+    def test_enabled_stage_records_histogram(self):
+        instrumentation = Instrumentation(buckets=(0.001, 1.0))
+        instrumentation.enable()
+        with instrumentation.stage("sha256"):
+            pass
+        instrumentation.observe("sha256", 0.5)
+        instrumentation.observe("sha256", 5.0)
+        instrumentation.increment("verify_ok", 2)
+
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot["counters"], {"verify_ok": 2})
+        stage = snapshot["stages"]["sha256"]
+        self.assertEqual(stage["count"], 3)
+        self.assertEqual(stage["buckets"], {"0.001": 1, "1.0": 2, "+Inf": 3})
+
+    def test_prometheus_export(self):
+        instrumentation = Instrumentation(buckets=(1.0,))
+        instrumentation.enable()
+        instrumentation.observe("sign", 0.25)
+        instrumentation.increment("sign")
+        text = instrumentation.to_prometheus()
+        self.assertIn('blockchain_tx_events_total{event="sign"} 1', text)
+        self.assertIn('blockchain_tx_stage_seconds_bucket{stage="sign",le="1.0"} 1', text)
+        self.assertIn('blockchain_tx_stage_seconds_count{stage="sign"} 1', text)
+        self.assertIn("# TYPE blockchain_tx_stage_seconds histogram", text)
+
+class TestTransactionInstrumentation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        private_key, public_key = generate_rsa_keys()
+        cls.private_pem = serialize_private_key(private_key)
+        cls.public_pem = serialize_public_key(public_key)
+
+    def setUp(self):
+        metrics.reset()
+        metrics.enable()
+        self.addCleanup(metrics.reset)
+        self.addCleanup(metrics.disable)
+
+    def test_transaction_stages_are_recorded(self):
+        tx = Transaction(inputs=[TransactionInput("prev_tx_metrics", 0)],
+                         outputs=[TransactionOutput(self.public_pem, 1.0)])
+        tx.sign(self.private_pem)
+        self.assertTrue(tx.verify_signature(self.public_pem))
+        Transaction.from_dict(tx.to_dict())
+
+        snapshot = metrics.snapshot()
+        for stage in ("get_data_for_signing", "sha256", "sign", "pem_parse_private", "crypto_sign",
+                      "verify_signature", "pem_parse_public", "crypto_verify", "from_dict"):
+            self.assertIn(stage, snapshot["stages"])
+        self.assertEqual(snapshot["counters"]["sign"], 1)
+        self.assertEqual(snapshot["counters"]["verify_ok"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
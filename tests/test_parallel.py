@@ -0,0 +1,155 @@
+import unittest
+import subprocess
+import sys
+import os
+import textwrap
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput,
+    generate_rsa_keys, serialize_private_key, serialize_public_key,
+    verify_many, iter_verify_many, sign_many, Signer, generate_keys, verification_cache,
+    shutdown_pools
+)
+from blockchain_transaction import parallel
+
+class TestVerifyMany(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        alice_private_key, alice_public_key = generate_rsa_keys()
+        cls.alice_private_pem = serialize_private_key(alice_private_key)
+        cls.alice_public_pem = serialize_public_key(alice_public_key)
+        _, bob_public_key = generate_rsa_keys()
+        cls.bob_public_pem = serialize_public_key(bob_public_key)
+
+        cls.pairs = []
+        for i in range(6):
+            tx = Transaction(inputs=[TransactionInput(f"prev_tx_{i}", 0)],
+                             outputs=[TransactionOutput(cls.bob_public_pem, 1.0 + i)],
+                             timestamp=1678886400.0)
+            tx.sign(cls.alice_private_pem)
+            # Каждая третья пара проверяется неверным ключом
+            key = cls.bob_public_pem if i % 3 == 2 else cls.alice_public_pem
+            cls.pairs.append((tx, key))
+        cls.expected = [i % 3 != 2 for i in range(6)]
+
+    def test_verify_many_serial_fallback(self):
+        self.assertEqual(verify_many(self.pairs, workers=4), self.expected)
+
+    def test_verify_many_process_pool_preserves_order(self):
+        results = verify_many(self.pairs, workers=2, serial_threshold=0, chunk_size=2)
+        self.assertEqual(results, self.expected)
+
+    def test_process_pool_uses_parent_verification_cache(self):
+        verification_cache.clear()
+        self.addCleanup(verification_cache.clear)
+        self.assertEqual(verify_many(self.pairs, workers=2, serial_threshold=0), self.expected)
+        # Успешные проверки рабочих процессов запомнены в текущем процессе.
+        self.assertEqual(len(verification_cache), sum(self.expected))
+        self.assertEqual(verify_many(self.pairs, workers=2, serial_threshold=0), self.expected)
+        self.assertEqual(verification_cache.stats()["hits"], sum(self.expected))
+
+    def test_iter_verify_many_streams_every_index(self):
+        streamed = dict(iter_verify_many(self.pairs, workers=2, serial_threshold=0))
+        self.assertEqual([streamed[i] for i in range(len(self.pairs))], self.expected)
+
+    def test_fingerprint_addresses_with_spawn_workers(self):
+        # В рабочих процессах spawn реестр адресов пуст: адреса должны
+        # разрешаться в родительском процессе.
+        script = textwrap.dedent("""
+            import multiprocessing
+            from blockchain_transaction import (
+                Transaction, TransactionInput, TransactionOutput, default_registry,
+                generate_keys, serialize_private_key, serialize_public_key, verify_many
+            )
+            multiprocessing.set_start_method("spawn")
+            private_key, public_key = generate_keys("ed25519")
+            address = default_registry.register(serialize_public_key(public_key))
+            private_pem = serialize_private_key(private_key)
+            pairs = []
+            for i in range(4):
+                tx = Transaction([TransactionInput("a" * 64, i)], [TransactionOutput(address, 1.0)],
+                                 timestamp=1678886400.0, scheme="ed25519")
+                tx.sign(private_pem)
+                pairs.append((tx, address))
+            print(verify_many(pairs, workers=2, serial_threshold=0))
+        """)
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        completed = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True,
+                                   text=True, timeout=120)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stdout.strip(), "[True, True, True, True]")
+
+    def test_process_pool_is_reused_between_calls(self):
+        self.addCleanup(shutdown_pools)
+        verify_many(self.pairs, workers=2, serial_threshold=0)
+        executor = parallel._get_verify_pool(2)
+        # Брошенный на середине пакет не ломает общий пул.
+        next(iter_verify_many(self.pairs, workers=2, serial_threshold=0, chunk_size=1))
+        self.assertEqual(verify_many(self.pairs, workers=2, serial_threshold=0), self.expected)
+        self.assertIs(parallel._get_verify_pool(2), executor)
+        shutdown_pools()
+        self.assertIsNot(parallel._get_verify_pool(2), executor)
+
+    def test_verify_many_empty_batch(self):
+        self.assertEqual(verify_many([]), [])
+
+    def test_verify_many_invalid_workers_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "workers должен быть положительным целым числом"):
+            verify_many(self.pairs, workers=0)
+
+class TestSignMany(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        private_key, public_key = generate_rsa_keys()
+        cls.signer = Signer(serialize_private_key(private_key))
+        cls.public_pem = serialize_public_key(public_key)
+
+    def make_batch(self, count, scheme="rsa-pss"):
+        return [Transaction(inputs=[TransactionInput(f"prev_tx_{i}", 0)],
+                            outputs=[TransactionOutput("addr_recipient", 1.0 + i)],
+                            timestamp=1678886400.0, scheme=scheme)
+                for i in range(count)]
+
+    def assert_signed(self, batch):
+        for tx in batch:
+            self.assertTrue(tx.verify_signature(self.public_pem))
+            self.assertEqual(Transaction.from_dict(tx.to_dict()).tx_id, tx.tx_id)
+
+    def test_sign_many_serial(self):
+        batch = self.make_batch(3)
+        self.assertIs(sign_many(batch, self.signer, workers=4)[0], batch[0])
+        self.assert_signed(batch)
+
+    def test_sign_many_process_pool(self):
+        batch = self.make_batch(6)
+        sign_many(batch, self.signer, workers=2, serial_threshold=0, chunk_size=2)
+        self.assert_signed(batch)
+
+    def test_signer_signature_matches_pem_signing(self):
+        tx = self.make_batch(1)[0]
+        tx.sign(self.signer)
+        self.assert_signed([tx])
+        self.assertEqual(repr(self.signer), "Signer(scheme='rsa-pss')")
+
+    def test_sign_many_rejects_signed_or_mismatched_transactions(self):
+        batch = self.make_batch(2)
+        batch[1].sign(self.signer)
+        with self.assertRaisesRegex(ValueError, "уже подписана"):
+            sign_many(batch, self.signer)
+        self.assertIsNone(batch[0].signature) # Проверка выполняется до подписи
+        with self.assertRaisesRegex(ValueError, "Ключ не соответствует схеме"):
+            sign_many(self.make_batch(1, scheme="ed25519"), self.signer)
+
+    def test_signer_for_other_scheme(self):
+        private_key, public_key = generate_keys("ed25519")
+        signer = Signer.from_private_key(private_key)
+        batch = self.make_batch(4, scheme="ed25519")
+        sign_many(batch, signer, workers=2, serial_threshold=0)
+        public_pem = serialize_public_key(public_key)
+        self.assertTrue(all(tx.verify_signature(public_pem) for tx in batch))
+
+if __name__ == '__main__':
+    unittest.main()
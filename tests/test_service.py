@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput,
+    generate_rsa_keys, serialize_private_key, serialize_public_key,
+    ValidationService, run_load_test
+)
+
+class TestValidationService(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        private_key, public_key = generate_rsa_keys()
+        cls.private_pem = serialize_private_key(private_key)
+        cls.public_pem = serialize_public_key(public_key)
+        cls.other_public_pem = serialize_public_key(generate_rsa_keys()[1])
+        cls.tx_dicts = []
+        for i in range(10):
+            tx = Transaction(inputs=[TransactionInput(f"prev_tx_{i}", 0)],
+                             outputs=[TransactionOutput("addr_recipient", 1.0 + i)],
+                             timestamp=1678886400.0 + i)
+            tx.sign(cls.private_pem)
+            cls.tx_dicts.append(tx.to_dict())
+
+    async def test_validate_valid_and_invalid(self):
+        async with ValidationService(batch_size=4) as service:
+            valid, wrong_key, malformed = await asyncio.gather(
+                service.validate(self.tx_dicts[0], self.public_pem),
+                service.validate(self.tx_dicts[1], self.other_public_pem),
+                service.validate({"inputs": [], "outputs": []}),
+            )
+        self.assertTrue(valid.valid)
+        self.assertEqual(valid.transaction.tx_id, self.tx_dicts[0]["tx_id"])
+        self.assertFalse(wrong_key.valid)
+        self.assertEqual(wrong_key.error, "Подпись транзакции неверна")
+        self.assertFalse(malformed.valid)
+        self.assertIsNone(malformed.transaction)
+
+    async def test_bad_request_does_not_fail_batch(self):
+        async with ValidationService(batch_size=8, max_batch_delay=0.05) as service:
+            results = await asyncio.gather(
+                service.validate(self.tx_dicts[0], self.public_pem),
+                service.validate(self.tx_dicts[1], "not a pem"),
+                service.validate(["not", "a", "dict"]),
+                service.validate(self.tx_dicts[2], self.public_pem),
+            )
+        good, bad_key, bad_payload, good_again = results
+        self.assertTrue(good.valid)
+        self.assertTrue(good_again.valid)
+        self.assertFalse(bad_key.valid)
+        self.assertIsNotNone(bad_key.transaction)
+        self.assertFalse(bad_payload.valid)
+        self.assertIsNone(bad_payload.transaction)
+        self.assertEqual(service.metrics()["batches"], 1)
+
+    async def test_validate_nowait_raises_when_queue_is_full(self):
+        service = ValidationService(max_queue=1)
+        await service.start()
+        # Батчер еще не успел забрать первый элемент, очередь заполнена
+        first = service.validate_nowait(self.tx_dicts[0], self.public_pem)
+        with self.assertRaises(asyncio.QueueFull):
+            service.validate_nowait(self.tx_dicts[1], self.public_pem)
+        self.assertTrue((await first).valid)
+        await service.stop()
+
+    async def test_validate_before_start_raises_error(self):
+        with self.assertRaisesRegex(RuntimeError, "не запущен"):
+            await ValidationService().validate(self.tx_dicts[0])
+
+    async def test_load_test_reports_metrics(self):
+        requests = [(tx_dict, self.public_pem) for tx_dict in self.tx_dicts] * 3
+        async with ValidationService(max_queue=8, batch_size=4) as service:
+            metrics = await run_load_test(service, requests, concurrency=16)
+        self.assertEqual(metrics["requests"], 30)
+        self.assertEqual(metrics["valid"], 30)
+        self.assertEqual(metrics["processed"], 30)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertGreater(metrics["batches"], 1)
+        self.assertLessEqual(metrics["latency_p50"], metrics["latency_p99"])
+        self.assertGreater(metrics["tx_per_second"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, SQLiteTransactionStore,
+    generate_rsa_keys, serialize_private_key, serialize_public_key
+)
+
+class TestSQLiteTransactionStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        private_key, public_key = generate_rsa_keys()
+        cls.private_pem = serialize_private_key(private_key)
+        cls.public_pem = serialize_public_key(public_key)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "transactions.db")
+        self.coinbase = Transaction(inputs=[], outputs=[TransactionOutput(self.public_pem, 100.0),
+                                                        TransactionOutput("addr_bob", 0.1)],
+                                    timestamp=1678886400.0)
+        self.spend = Transaction(inputs=[TransactionInput(self.coinbase.tx_id, 0)],
+                                 outputs=[TransactionOutput("addr_bob", 60.0), TransactionOutput(self.public_pem, 40.0)],
+                                 timestamp=1678886401.0)
+        self.spend.sign(self.private_pem)
+
+    def open_store(self):
+        store = SQLiteTransactionStore(self.path)
+        self.addCleanup(store.close)
+        return store
+
+    def test_add_and_get_round_trip(self):
+        store = self.open_store()
+        self.assertEqual(store.add_many([self.coinbase, self.spend]), 2)
+        self.assertEqual(len(store), 2)
+        self.assertIn(self.spend.tx_id, store)
+        restored = store.get(self.spend.tx_id)
+        self.assertEqual(restored.to_dict(), self.spend.to_dict())
+        self.assertTrue(restored.verify_signature(self.public_pem))
+        self.assertIsNone(store.get("unknown"))
+
+    def test_duplicates_are_skipped(self):
+        store = self.open_store()
+        self.assertTrue(store.add(self.coinbase))
+        self.assertFalse(store.add(self.coinbase))
+        self.assertEqual(store.add_many([self.spend, self.spend, self.coinbase]), 1)
+        self.assertEqual(len(store), 2)
+
+    def test_amounts_finer_than_base_unit_round_trip(self):
+        store = self.open_store()
+        tx = Transaction(inputs=[TransactionInput(self.coinbase.tx_id, 1)],
+                         outputs=[TransactionOutput(self.public_pem, 100 / 3), TransactionOutput("addr_bob", 1e-9)],
+                         timestamp=1678886402.0)
+        tx.sign(self.private_pem)
+        store.add(tx)
+        restored = store.get(tx.tx_id)
+        self.assertEqual(restored.to_dict(), tx.to_dict())
+        self.assertTrue(restored.verify_signature(self.public_pem))
+        self.assertEqual([output.amount for _, output in store.unspent_outputs("addr_bob")], [1e-9])
+
+    def test_integer_timestamp_round_trip(self):
+        store = self.open_store()
+        tx = Transaction(inputs=[TransactionInput(self.coinbase.tx_id, 1)],
+                         outputs=[TransactionOutput("addr_bob", 0.1)], timestamp=1700000000)
+        tx.sign(self.private_pem)
+        store.add_many([tx, self.coinbase])
+        restored = store.get(tx.tx_id)
+        self.assertIs(type(restored.timestamp), int)
+        self.assertIs(type(store.get(self.coinbase.tx_id).timestamp), float)
+        self.assertEqual(Transaction.from_dict(restored.to_dict()).tx_id, tx.tx_id)
+        self.assertTrue(restored.verify_signature(self.public_pem))
+
+    def test_spender_of(self):
+        store = self.open_store()
+        store.add_many([self.coinbase, self.spend])
+        self.assertEqual(store.spender_of(self.coinbase.tx_id, 0), self.spend.tx_id)
+        self.assertIsNone(store.spender_of(self.coinbase.tx_id, 1))
+
+    def test_unspent_outputs_for_address(self):
+        store = self.open_store()
+        store.add_many([self.coinbase, self.spend])
+        unspent = store.unspent_outputs("addr_bob")
+        self.assertEqual(sorted(output.amount for _, output in unspent), [0.1, 60.0])
+        self.assertEqual([output.amount for _, output in store.unspent_outputs(self.public_pem)], [40.0])
+        self.assertEqual(store.unspent_outputs("addr_unknown"), [])
+
+    def test_data_persists_and_uses_wal(self):
+        store = SQLiteTransactionStore(self.path)
+        store.add_many([self.coinbase, self.spend])
+        store.close()
+        store = self.open_store()
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.get(self.coinbase.tx_id).to_dict(), self.coinbase.to_dict())
+        mode = store._connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_queries_use_indexes(self):
+        store = self.open_store()
+        plan = " ".join(row[-1] for row in store._connection.execute(
+            "EXPLAIN QUERY PLAN SELECT tx_row FROM inputs WHERE previous_tx_id = ? AND output_index = ?",
+            ("tx", 0)))
+        self.assertIn("inputs_outpoint", plan)
+
+if __name__ == '__main__':
+    unittest.main()
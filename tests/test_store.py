@@ -0,0 +1,193 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, TransactionStore
+)
+from blockchain_transaction.store import DATA_FILE, INDEX_FILE
+
+def make_tx(i):
+    return Transaction(inputs=[TransactionInput(f"prev_tx_{i}", 0)],
+                       outputs=[TransactionOutput("addr_recipient", 1.0 + i)],
+                       timestamp=1678886400.0 + i)
+
+class TestTransactionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.directory = self.tmp_dir.name
+        self.transactions = [make_tx(i) for i in range(20)]
+
+    def test_append_and_get(self):
+        with TransactionStore(self.directory) as store:
+            store.append_many(self.transactions)
+            self.assertEqual(len(store), 20)
+            for tx in self.transactions:
+                self.assertIn(tx.tx_id, store)
+                self.assertEqual(store.get(tx.tx_id).to_dict(), tx.to_dict())
+            self.assertIsNone(store.get("0" * 64))
+            self.assertNotIn("not_a_tx_id", store)
+
+    def test_trusted_get(self):
+        with TransactionStore(self.directory) as store:
+            store.append_many(self.transactions)
+            for tx in self.transactions:
+                self.assertEqual(store.get(tx.tx_id, trusted=True).to_dict(), tx.to_dict())
+
+    def test_get_bytes_returns_memoryview(self):
+        with TransactionStore(self.directory) as store:
+            store.append(self.transactions[0])
+            data = store.get_bytes(self.transactions[0].tx_id)
+            self.assertIsInstance(data, memoryview)
+            self.assertEqual(bytes(data), self.transactions[0].to_bytes())
+
+    def test_duplicates_are_not_stored_twice(self):
+        with TransactionStore(self.directory) as store:
+            first = store.append(self.transactions[0])
+            self.assertEqual(store.append_many([self.transactions[0], self.transactions[0]]), [first, first])
+            self.assertEqual(len(store), 1)
+
+    def test_reopen_uses_index_and_tail(self):
+        with TransactionStore(self.directory) as store:
+            store.append_many(self.transactions[:10])
+        store = TransactionStore(self.directory)
+        store.append_many(self.transactions[10:])
+        # Индекс не сохранен: новые записи должны восстановиться из хвоста сегмента
+        store._data_file.close()
+        with TransactionStore(self.directory) as reopened:
+            self.assertEqual(len(reopened), 20)
+            for tx in self.transactions:
+                self.assertEqual(reopened.get(tx.tx_id).tx_id, tx.tx_id)
+
+    def test_truncated_tail_is_recovered(self):
+        with TransactionStore(self.directory) as store:
+            store.append_many(self.transactions[:5])
+        store = TransactionStore(self.directory)
+        store.append(self.transactions[5])
+        store._data_file.close()
+        data_path = os.path.join(self.directory, DATA_FILE)
+        with open(data_path, "r+b") as f:
+            f.truncate(os.path.getsize(data_path) - 3) # Сбой посреди записи
+
+        with TransactionStore(self.directory) as recovered:
+            self.assertEqual(len(recovered), 5)
+            self.assertNotIn(self.transactions[5].tx_id, recovered)
+            recovered.append(self.transactions[5])
+            self.assertEqual(recovered.get(self.transactions[5].tx_id).tx_id, self.transactions[5].tx_id)
+
+    def test_index_is_flushed_when_pending_limit_is_reached(self):
+        store = TransactionStore(self.directory, max_pending=8)
+        for tx in self.transactions:
+            store.append(tx)
+            self.assertLess(len(store._pending), 8)
+        self.assertEqual(store._index_count, 16)
+        self.assertEqual(len(store), 20)
+        # Без close(): непроиндексированы только последние записи.
+        store._data_file.close()
+        with TransactionStore(self.directory, max_pending=8) as reopened:
+            self.assertEqual(len(reopened._pending), 4)
+            for tx in self.transactions:
+                self.assertEqual(reopened.get(tx.tx_id).tx_id, tx.tx_id)
+
+    def test_large_tail_is_flushed_on_open(self):
+        store = TransactionStore(self.directory)
+        store.append_many(self.transactions)
+        store._data_file.close()
+        with TransactionStore(self.directory, max_pending=10) as reopened:
+            self.assertEqual(reopened._index_count, 20)
+            self.assertEqual(len(reopened._pending), 0)
+
+    def index_files(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".idx"))
+
+    def test_index_runs_are_merged_in_tiers(self):
+        transactions = [make_tx(i) for i in range(64)]
+        store = TransactionStore(self.directory, max_pending=2)
+        self.addCleanup(store.close)
+        written = []
+        real_write_run = store._write_run
+
+        def counting_write_run(entries, start, end):
+            run = real_write_run(entries, start, end)
+            written.append(run.count)
+            return run
+
+        with mock.patch.object(store, "_write_run", counting_write_run):
+            for tx in transactions:
+                store.append(tx)
+        # Полная перезапись индекса при каждом сохранении записала бы 2 + 4 + ... + 64 = 1056 записей.
+        self.assertLessEqual(sum(written), 64 * 4)
+        self.assertLessEqual(len(store._runs), 2 * 3)
+        self.assertEqual(len(self.index_files()), len(store._runs))
+        self.assertTrue(all(store.get(tx.tx_id).tx_id == tx.tx_id for tx in transactions))
+
+        store.compact_index()
+        self.assertEqual(len(store._runs), 1)
+        self.assertEqual(len(store), 64)
+        self.assertTrue(all(tx.tx_id in store for tx in transactions))
+
+    def test_single_file_index_is_read(self):
+        with TransactionStore(self.directory) as store:
+            store.append_many(self.transactions[:10])
+            store.compact_index()
+            run_path = store._runs[0].path
+        os.replace(run_path, os.path.join(self.directory, INDEX_FILE))
+
+        with TransactionStore(self.directory) as store:
+            self.assertEqual((store._index_count, len(store._pending)), (10, 0))
+            store.append_many(self.transactions[10:])
+        with TransactionStore(self.directory) as store:
+            self.assertEqual(len(store), 20)
+            self.assertTrue(all(store.get(tx.tx_id).tx_id == tx.tx_id for tx in self.transactions))
+            store.compact_index()
+        self.assertNotIn(INDEX_FILE, self.index_files())
+
+    def test_interrupted_merge_is_cleaned_up_on_open(self):
+        backup = os.path.join(self.directory, "backup")
+        os.mkdir(backup)
+        with TransactionStore(self.directory) as store:
+            for tx in self.transactions[:3]:
+                store.append(tx)
+                store.flush_index()
+            runs = self.index_files()
+            for name in runs:
+                shutil.copy(os.path.join(self.directory, name), backup)
+            store.compact_index()
+        # Сбой после записи слитого прогона, но до удаления исходных; недописанный прогон.
+        for name in runs:
+            shutil.copy(os.path.join(backup, name), self.directory)
+        with open(os.path.join(self.directory, "transactions.0-1.idx.tmp"), "wb") as f:
+            f.write(b"TXIX")
+
+        with TransactionStore(self.directory) as store:
+            self.assertEqual(len(store._runs), 1)
+            self.assertEqual(len(store), 3)
+            self.assertTrue(all(tx.tx_id in store for tx in self.transactions[:3]))
+        self.assertEqual(len(self.index_files()), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "transactions.0-1.idx.tmp")))
+
+    def test_invalid_max_pending_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "max_pending"):
+            TransactionStore(self.directory, max_pending=0)
+
+    def test_integer_timestamp_round_trip(self):
+        tx = Transaction(inputs=[TransactionInput("prev_tx_int", 0)],
+                         outputs=[TransactionOutput("addr_recipient", 1.0)], timestamp=1700000000)
+        with TransactionStore(self.directory) as store:
+            store.append(tx)
+            self.assertEqual(store.get(tx.tx_id).tx_id, tx.tx_id)
+            self.assertEqual(store.view(tx.tx_id).timestamp, 1700000000)
+
+    def test_invalid_tx_id_raises_error(self):
+        with TransactionStore(self.directory) as store:
+            with self.assertRaisesRegex(ValueError, "tx_id должен быть SHA256"):
+                store.get_bytes("xyz")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,13 +2,14 @@ import unittest
 import time
 import hashlib
 import json
+import pickle
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from blockchain_transaction import (
     Transaction, TransactionInput, TransactionOutput,
-    generate_rsa_keys, serialize_private_key, serialize_public_key
+    generate_rsa_keys, generate_keys, serialize_private_key, serialize_public_key
 )
 
 class CommonTestSetup(unittest.TestCase):
@@ -262,5 +263,194 @@ class TestTransactionSerialization(CommonTestSetup):
         self.assertEqual(tx_reconstructed.tx_id, original_tx_id)
         self.assertNotEqual(tx_reconstructed.tx_id, "tampered_tx_id_12345")
 
+    def test_from_dict_transaction_signed_before_base_units(self):
+        # Транзакция подписана до перехода на базовые единицы: суммы точнее
+        # 1/AMOUNT_SCALE (100/3 и 1e-9) не должны менять tx_id и подпись.
+        public_pem = ("-----BEGIN PUBLIC KEY-----\n"
+                      "MCowBQYDK2VwAyEAcaKmqNj3eZ+If5AQV/22kB4YaZq3QbW1VikrfolcNNo=\n"
+                      "-----END PUBLIC KEY-----\n")
+        tx_dict = {
+            "tx_id": "5edb1b4c240664685736c15e5fdabbc3ab123c669579006f9d3fdcfcb9fd82ce",
+            "timestamp": 1678886400.0,
+            "inputs": [{"previous_tx_id": "a" * 64, "output_index": 0}],
+            "outputs": [{"recipient_address_pubkey_pem": public_pem, "amount": 33.333333333333336},
+                        {"recipient_address_pubkey_pem": "addr_bob", "amount": 1e-09}],
+            "signature": "22bcc76a6579cd3da4063e6bcd2b2e32f0c0665b26f196ab33b63e656075935d"
+                         "0af94e6f99521fdb63c8b7acdfd4c8e8375da947b429b74486bef10343548109",
+            "scheme": "ed25519",
+        }
+        for tx in (Transaction.from_dict(tx_dict), Transaction.from_dict(tx_dict, frozen=True),
+                   Transaction.from_bytes(Transaction.from_dict(tx_dict).to_bytes())):
+            self.assertEqual(tx.tx_id, tx_dict["tx_id"])
+            self.assertEqual(tx.to_dict(), tx_dict)
+            self.assertTrue(tx.verify_signature(public_pem))
+
+class TestTransactionFrozen(CommonTestSetup):
+    """
+    Тесты неизменяемого режима транзакции (freeze).
+    """
+    def setUp(self):
+        self.inp = TransactionInput("prev_tx_for_frozen", 0)
+        self.out = TransactionOutput(self.bob_public_pem, 10.0)
+
+    def test_frozen_transaction_has_same_tx_id(self):
+        tx = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp)
+        tx_frozen = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp, frozen=True)
+        self.assertTrue(tx_frozen.is_frozen)
+        self.assertFalse(tx.is_frozen)
+        self.assertEqual(tx_frozen.tx_id, tx.tx_id)
+        self.assertEqual(tx_frozen._get_data_for_signing(), tx._get_data_for_signing())
+
+    def test_frozen_transaction_rejects_mutation(self):
+        tx = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp).freeze()
+        with self.assertRaisesRegex(AttributeError, "Транзакция заморожена"):
+            tx.timestamp = 0.0
+        with self.assertRaisesRegex(AttributeError, "Транзакция заморожена"):
+            tx.outputs = [self.out]
+        with self.assertRaises(AttributeError):
+            tx.inputs.append(self.inp) # inputs хранятся в кортеже
+
+    def test_unfrozen_transaction_has_no_setattr_hook(self):
+        tx = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp)
+        self.assertIs(type(tx).__setattr__, object.__setattr__)
+        tx.freeze()
+        self.assertIsInstance(tx, Transaction)
+        restored = pickle.loads(pickle.dumps(tx))
+        self.assertTrue(restored.is_frozen)
+        self.assertEqual(restored.tx_id, tx.tx_id)
+        with self.assertRaisesRegex(AttributeError, "Транзакция заморожена"):
+            restored.timestamp = 0.0
+
+    def test_frozen_transaction_rejects_element_mutation(self):
+        tx = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp, frozen=True)
+        tx.sign(self.alice_private_pem)
+        with self.assertRaisesRegex(AttributeError, "замороженной транзакции"):
+            tx.outputs[0].amount = 1000.0
+        with self.assertRaisesRegex(AttributeError, "замороженной транзакции"):
+            tx.inputs[0].output_index = 1
+        self.assertEqual(tx.outputs[0].amount, 10.0)
+        self.assertEqual(tx.outputs[0], self.out)
+        self.assertTrue(tx.verify_signature(self.alice_public_pem))
+
+    def test_frozen_trusted_transaction_keeps_tx_id(self):
+        tx = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp)
+        tx.sign(self.alice_private_pem)
+        tx_dict = dict(tx.to_dict(), tx_id="trusted_tx_id")
+        self.assertEqual(Transaction.from_dict(tx_dict, frozen=True, trust_tx_id=True).tx_id, "trusted_tx_id")
+        restored = Transaction.from_bytes(tx.to_bytes(), frozen=True, trusted=True, tx_id="trusted_tx_id")
+        self.assertEqual(restored.tx_id, "trusted_tx_id")
+        self.assertTrue(restored.verify_signature(self.alice_public_pem))
+
+    def test_frozen_transaction_is_isolated_from_external_outputs(self):
+        tx = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp, frozen=True)
+        tx.sign(self.alice_private_pem)
+        self.out.amount = 20.0 # Исходный объект не влияет на замороженную транзакцию
+        self.assertTrue(tx.verify_signature(self.alice_public_pem))
+
+    def test_frozen_transaction_sign_and_verify(self):
+        tx = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp, frozen=True)
+        initial_tx_id = tx.tx_id
+        tx.sign(self.alice_private_pem)
+        expected_final_id = hashlib.sha256((initial_tx_id + tx.signature.hex()).encode('utf-8')).hexdigest()
+        self.assertEqual(tx.tx_id, expected_final_id)
+        self.assertEqual(tx._calculate_final_tx_id(), expected_final_id)
+        self.assertTrue(tx.verify_signature(self.alice_public_pem))
+        self.assertFalse(tx.verify_signature(self.bob_public_pem))
+
+    def test_from_dict_frozen(self):
+        tx_orig = Transaction(inputs=[self.inp], outputs=[self.out], timestamp=self.fixed_timestamp)
+        tx_orig.sign(self.alice_private_pem)
+        tx_reconstructed = Transaction.from_dict(tx_orig.to_dict(), frozen=True)
+        self.assertTrue(tx_reconstructed.is_frozen)
+        self.assertEqual(tx_reconstructed.tx_id, tx_orig.tx_id)
+        self.assertTrue(tx_reconstructed.verify_signature(self.alice_public_pem))
+
+class TestTransactionTrusted(CommonTestSetup):
+    """
+    Тесты быстрого доверенного создания транзакций (from_trusted).
+    """
+    def setUp(self):
+        self.tx = Transaction(inputs=[TransactionInput("prev_tx_b", 1), TransactionInput("prev_tx_a", 0)],
+                              outputs=[TransactionOutput(self.bob_public_pem, 10.0)],
+                              timestamp=self.fixed_timestamp)
+        self.tx.sign(self.alice_private_pem)
+
+    def test_from_trusted_dict_matches_from_dict(self):
+        tx_trusted = Transaction.from_trusted_dict(self.tx.to_dict())
+        self.assertEqual(tx_trusted.to_dict(), self.tx.to_dict())
+        self.assertTrue(tx_trusted.verify_signature(self.alice_public_pem))
+
+    def test_tx_id_is_computed_lazily(self):
+        tx_data = self.tx.to_dict()
+        del tx_data['tx_id']
+        tx_trusted = Transaction.from_trusted_dict(tx_data)
+        self.assertIsNone(tx_trusted._tx_id)
+        self.assertEqual(tx_trusted.tx_id, self.tx.tx_id)
+        self.assertEqual(tx_trusted._tx_id, self.tx.tx_id)
+
+    def test_unsigned_trusted_transaction_gets_initial_hash(self):
+        tx = Transaction(inputs=[TransactionInput("prev_tx_a", 0)],
+                         outputs=[TransactionOutput(self.bob_public_pem, 10.0)],
+                         timestamp=self.fixed_timestamp)
+        tx_trusted = Transaction.from_trusted(tx.inputs, tx.outputs, tx.timestamp)
+        self.assertEqual(tx_trusted.tx_id, tx.tx_id)
+        tx_trusted.sign(self.alice_private_pem)
+        self.assertTrue(tx_trusted.verify_signature(self.alice_public_pem))
+
+    def test_from_trusted_skips_validation(self):
+        # Доверенный путь не проверяет данные: ответственность на вызывающей стороне.
+        tx = Transaction.from_trusted([], [], self.fixed_timestamp, tx_id="known_id")
+        self.assertEqual(tx.tx_id, "known_id")
+
+    def test_from_bytes_trusted(self):
+        tx_trusted = Transaction.from_bytes(self.tx.to_bytes(), trusted=True)
+        self.assertEqual(tx_trusted.to_dict(), self.tx.to_dict())
+        tx_frozen = Transaction.from_bytes(self.tx.to_bytes(), trusted=True, tx_id=self.tx.tx_id, frozen=True)
+        self.assertTrue(tx_frozen.is_frozen)
+        self.assertEqual(tx_frozen.tx_id, self.tx.tx_id)
+
+class TestTransactionSchemes(CommonTestSetup):
+    """
+    Тесты подписи транзакций разными схемами.
+    """
+    def make_tx(self, scheme):
+        return Transaction(inputs=[TransactionInput("prev_tx_scheme", 0)],
+                           outputs=[TransactionOutput(self.bob_public_pem, 10.0)],
+                           timestamp=self.fixed_timestamp, scheme=scheme)
+
+    def test_default_scheme_keeps_tx_id(self):
+        tx = Transaction(inputs=[TransactionInput("prev_tx_scheme", 0)],
+                         outputs=[TransactionOutput(self.bob_public_pem, 10.0)],
+                         timestamp=self.fixed_timestamp)
+        self.assertEqual(tx.scheme, "rsa-pss")
+        self.assertEqual(self.make_tx("rsa-pss").tx_id, tx.tx_id)
+        self.assertNotIn("scheme", tx.to_dict())
+        self.assertNotEqual(self.make_tx("ed25519").tx_id, tx.tx_id)
+
+    def test_sign_and_verify_with_each_scheme(self):
+        for scheme in ("ed25519", "ecdsa-secp256k1"):
+            with self.subTest(scheme=scheme):
+                private_key, public_key = generate_keys(scheme)
+                private_pem = serialize_private_key(private_key)
+                public_pem = serialize_public_key(public_key)
+                tx = self.make_tx(scheme)
+                tx.sign(private_pem)
+                self.assertTrue(tx.verify_signature(public_pem))
+                self.assertFalse(tx.verify_signature(self.alice_public_pem))
+
+                for restored in (Transaction.from_dict(tx.to_dict()), Transaction.from_bytes(tx.to_bytes())):
+                    self.assertEqual(restored.scheme, scheme)
+                    self.assertEqual(restored.tx_id, tx.tx_id)
+                    self.assertTrue(restored.verify_signature(public_pem))
+
+    def test_sign_with_key_of_other_scheme_raises_error(self):
+        tx = self.make_tx("ed25519")
+        with self.assertRaisesRegex(ValueError, "Ключ не соответствует схеме подписи"):
+            tx.sign(self.alice_private_pem)
+
+    def test_unknown_scheme_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Неизвестная схема подписи"):
+            self.make_tx("dsa")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -61,5 +61,24 @@ class TestTransactionInput(unittest.TestCase):
         
         self.assertEqual(sorted_inputs, [input3, input1, input2])
 
+    def test_transaction_input_is_hashable(self):
+        inputs = {TransactionInput("tx1", 0), TransactionInput("tx1", 0), TransactionInput("tx1", 1)}
+        self.assertEqual(len(inputs), 2)
+        self.assertIn(TransactionInput("tx1", 1), inputs)
+
+    def test_transaction_input_outpoint(self):
+        self.assertEqual(TransactionInput("tx1", 3).outpoint, ("tx1", 3))
+
+    def test_transaction_input_has_no_instance_dict(self):
+        tx_input = TransactionInput("tx1", 0)
+        self.assertFalse(hasattr(tx_input, '__dict__'))
+        with self.assertRaises(AttributeError):
+            tx_input.extra = 1 # type: ignore
+
+    def test_transaction_input_interns_tx_id(self):
+        tx_input1 = TransactionInput("".join(["shared", "_tx_id"]), 0)
+        tx_input2 = TransactionInput("".join(["shared", "_tx", "_id"]), 1)
+        self.assertIs(tx_input1.previous_tx_id, tx_input2.previous_tx_id)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
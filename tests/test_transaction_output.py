@@ -3,7 +3,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from blockchain_transaction.transaction_output import TransactionOutput
+from blockchain_transaction.transaction_output import TransactionOutput, AMOUNT_SCALE
 
 class TestTransactionOutput(unittest.TestCase):
 
@@ -32,6 +32,16 @@ class TestTransactionOutput(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "amount должен быть положительным числом"):
             TransactionOutput("recipient_pem", 0)
 
+    def test_create_transaction_output_non_finite_amount(self):
+        for amount in (float('inf'), float('-inf'), float('nan'), 1e308):
+            with self.subTest(amount=amount):
+                with self.assertRaisesRegex(ValueError, "amount должен быть положительным числом"):
+                    TransactionOutput("addr_recipient", amount)
+        tx_output = TransactionOutput("addr_recipient", 1.0)
+        with self.assertRaisesRegex(ValueError, "amount должен быть конечным числом"):
+            tx_output.amount = float('inf')
+        self.assertEqual((tx_output.amount, tx_output.units), (1.0, 100_000_000))
+
     def test_create_transaction_output_negative_amount(self):
         with self.assertRaisesRegex(ValueError, "amount должен быть положительным числом"):
             TransactionOutput("recipient_pem", -5.0)
@@ -71,6 +81,46 @@ class TestTransactionOutput(unittest.TestCase):
 
         self.assertEqual(sorted_outputs, [output3, output2, output1])
 
+    def test_transaction_output_is_hashable(self):
+        outputs = {TransactionOutput("addr1", 10.0), TransactionOutput("addr1", 10.0), TransactionOutput("addr1", 5.0)}
+        self.assertEqual(len(outputs), 2)
+
+    def test_transaction_output_has_no_instance_dict(self):
+        tx_output = TransactionOutput("addr1", 10.0)
+        self.assertFalse(hasattr(tx_output, '__dict__'))
+
+    def test_amount_is_stored_in_base_units(self):
+        tx_output = TransactionOutput("addr1", 0.1)
+        self.assertEqual(tx_output.units, 10_000_000)
+        self.assertEqual(tx_output.amount, 0.1)
+        tx_output.amount = 0.2
+        self.assertEqual(tx_output.units, 2 * AMOUNT_SCALE // 10)
+
+    def test_sum_of_units_is_exact(self):
+        outputs = [TransactionOutput("addr1", 0.1) for _ in range(10)]
+        self.assertNotEqual(sum(out.amount for out in outputs), 1.0) # float накапливает ошибку
+        self.assertEqual(sum(out.units for out in outputs), AMOUNT_SCALE)
+
+    def test_from_units(self):
+        tx_output = TransactionOutput.from_units("addr1", 150_000_000)
+        self.assertEqual(tx_output, TransactionOutput("addr1", 1.5))
+        with self.assertRaisesRegex(ValueError, "units должен быть положительным целым числом"):
+            TransactionOutput.from_units("addr1", 1.5)
+
+    def test_amount_is_kept_exactly(self):
+        # Суммы точнее 1/AMOUNT_SCALE не округляются: они входят в прообраз подписи.
+        tx_output = TransactionOutput("addr1", 100 / 3)
+        self.assertEqual(tx_output.amount, 100 / 3)
+        self.assertEqual(tx_output.to_dict()['amount'], 100 / 3)
+        self.assertEqual(tx_output.units, 3_333_333_333)
+        self.assertFalse(tx_output.has_exact_units())
+        self.assertTrue(TransactionOutput("addr1", 0.1).has_exact_units())
+
+    def test_amount_below_base_unit(self):
+        tx_output = TransactionOutput("addr1", 1e-9)
+        self.assertEqual(tx_output.amount, 1e-9)
+        self.assertEqual(tx_output.units, 0)
+        self.assertNotEqual(tx_output, TransactionOutput("addr1", 2e-9))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, UTXOSet,
+    generate_rsa_keys, serialize_public_key
+)
+
+class TestUTXOSet(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alice_public_pem = serialize_public_key(generate_rsa_keys()[1])
+        cls.bob_public_pem = serialize_public_key(generate_rsa_keys()[1])
+
+    def setUp(self):
+        self.coinbase = Transaction(inputs=[], outputs=[TransactionOutput(self.alice_public_pem, 100.0)],
+                                    timestamp=1678886400.0)
+        self.spend = Transaction(
+            inputs=[TransactionInput(self.coinbase.tx_id, 0)],
+            outputs=[TransactionOutput(self.bob_public_pem, 25.0), TransactionOutput(self.alice_public_pem, 75.0)],
+            timestamp=1678886401.0
+        )
+        self.utxo = UTXOSet()
+
+    def test_apply_coinbase_adds_outputs(self):
+        self.utxo.apply(self.coinbase)
+        self.assertEqual(len(self.utxo), 1)
+        self.assertIn((self.coinbase.tx_id, 0), self.utxo)
+        self.assertEqual(self.utxo.get(self.coinbase.tx_id, 0), self.coinbase.outputs[0])
+
+    def test_apply_spends_inputs(self):
+        self.utxo.apply_batch([self.coinbase, self.spend])
+        self.assertIsNone(self.utxo.get_for_input(self.spend.inputs[0]))
+        self.assertEqual(len(self.utxo), 2)
+
+    def test_apply_missing_outpoint_raises_error_and_keeps_state(self):
+        with self.assertRaisesRegex(ValueError, "отсутствует или уже потрачен"):
+            self.utxo.apply(self.spend)
+        self.assertEqual(len(self.utxo), 0)
+
+    def test_double_spend_inside_transaction_raises_error(self):
+        self.utxo.apply(self.coinbase)
+        tx = Transaction(inputs=[TransactionInput(self.coinbase.tx_id, 0), TransactionInput(self.coinbase.tx_id, 0)],
+                         outputs=[TransactionOutput(self.bob_public_pem, 1.0)])
+        with self.assertRaisesRegex(ValueError, "тратит один выход дважды"):
+            self.utxo.apply(tx)
+
+    def test_apply_batch_rolls_back_on_error(self):
+        double_spend = Transaction(inputs=[TransactionInput(self.coinbase.tx_id, 0)],
+                                   outputs=[TransactionOutput(self.bob_public_pem, 99.0)],
+                                   timestamp=1678886402.0)
+        with self.assertRaises(ValueError):
+            self.utxo.apply_batch([self.coinbase, self.spend, double_spend])
+        self.assertEqual(len(self.utxo), 0)
+
+    def test_undo_batch_restores_state(self):
+        self.utxo.apply(self.coinbase)
+        records = self.utxo.apply_batch([self.spend])
+        self.utxo.undo_batch(records)
+        self.assertEqual(dict(self.utxo), {(self.coinbase.tx_id, 0): self.coinbase.outputs[0]})
+
+    def test_snapshot_roundtrip(self):
+        self.utxo.apply_batch([self.coinbase, self.spend])
+        self.utxo.add("text_tx", 7, TransactionOutput("addr1", 3.5))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "utxo.snapshot")
+            self.utxo.save_snapshot(path)
+            restored = UTXOSet.load_snapshot(path)
+        self.assertEqual(dict(restored), dict(self.utxo))
+
+    def test_load_snapshot_invalid_file_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "utxo.snapshot")
+            with open(path, "wb") as f:
+                f.write(b"NOPE\x01" + b"\x00" * 8)
+            with self.assertRaisesRegex(ValueError, "не является снимком UTXO"):
+                UTXOSet.load_snapshot(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import sys
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput,
+    generate_rsa_keys, serialize_private_key, serialize_public_key,
+    VerificationCache, verification_cache
+)
+
+class TestVerificationCache(unittest.TestCase):
+
+    def test_lookup_and_remember(self):
+        cache = VerificationCache(capacity=2)
+        self.assertFalse(cache.lookup("tx1", "pem_a"))
+        cache.remember("tx1", "pem_a")
+        self.assertTrue(cache.lookup("tx1", "pem_a"))
+        self.assertFalse(cache.lookup("tx1", "pem_b"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+
+    def test_capacity_is_bounded(self):
+        cache = VerificationCache(capacity=2)
+        for tx_id in ("tx1", "tx2", "tx3"):
+            cache.remember(tx_id, "pem")
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(cache.lookup("tx1", "pem"))
+
+    def test_disable_clears_and_bypasses(self):
+        cache = VerificationCache()
+        cache.remember("tx1", "pem")
+        cache.disable()
+        self.assertFalse(cache.lookup("tx1", "pem"))
+        cache.remember("tx1", "pem")
+        self.assertEqual(len(cache), 0)
+
+class TestTransactionVerificationCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        private_key, public_key = generate_rsa_keys()
+        cls.private_pem = serialize_private_key(private_key)
+        cls.public_pem = serialize_public_key(public_key)
+        cls.other_public_pem = serialize_public_key(generate_rsa_keys()[1])
+
+    def setUp(self):
+        verification_cache.clear()
+        self.addCleanup(verification_cache.enable)
+        self.tx = Transaction(inputs=[TransactionInput("prev_tx_cache", 0)],
+                              outputs=[TransactionOutput(self.public_pem, 1.0)])
+        self.tx.sign(self.private_pem)
+
+    def test_repeat_verification_hits_cache(self):
+        self.assertTrue(self.tx.verify_signature(self.public_pem))
+        self.assertTrue(self.tx.verify_signature(self.public_pem))
+        self.assertEqual(verification_cache.stats()["hits"], 1)
+
+    def test_failed_verification_is_not_cached(self):
+        self.assertFalse(self.tx.verify_signature(self.other_public_pem))
+        self.assertFalse(self.tx.verify_signature(self.other_public_pem))
+        self.assertEqual(verification_cache.stats()["hits"], 0)
+
+    def test_tampering_after_cached_verification_is_detected(self):
+        self.assertTrue(self.tx.verify_signature(self.public_pem))
+        self.tx.outputs[0].amount = 2.0
+        self.assertFalse(self.tx.verify_signature(self.public_pem))
+
+    def test_trusted_tx_id_of_tampered_transaction_misses_cache(self):
+        self.assertTrue(self.tx.verify_signature(self.public_pem))
+        tx_data = self.tx.to_dict()
+        tx_data["outputs"][0]["amount"] = 1000.0
+        for frozen in (False, True):
+            tampered = Transaction.from_dict(tx_data, frozen=frozen, trust_tx_id=True)
+            self.assertEqual(tampered.tx_id, self.tx.tx_id)
+            self.assertFalse(tampered.verify_signature(self.public_pem))
+        self.assertTrue(Transaction.from_trusted_dict(self.tx.to_dict()).verify_signature(self.public_pem))
+
+    def test_cache_miss_serializes_data_once(self):
+        with mock.patch.object(Transaction, "_build_data_for_signing",
+                               autospec=True, side_effect=Transaction._build_data_for_signing) as build:
+            self.assertTrue(self.tx.verify_signature(self.public_pem))
+        self.assertEqual(build.call_count, 1)
+
+    def test_disabled_cache_always_verifies(self):
+        verification_cache.disable()
+        self.assertTrue(self.tx.verify_signature(self.public_pem))
+        self.assertTrue(self.tx.verify_signature(self.public_pem))
+        self.assertEqual(verification_cache.stats()["hits"], 0)
+
+    def test_cache_enabled_during_verification(self):
+        # Кэш включают из другого потока, пока идет проверка подписи.
+        from blockchain_transaction import transaction as transaction_module
+        real_cache = transaction_module.public_key_cache
+
+        class EnablingKeyCache:
+            def get(self, public_key_pem):
+                verification_cache.enable()
+                return real_cache.get(public_key_pem)
+
+        verification_cache.disable()
+        with mock.patch.object(transaction_module, "public_key_cache", EnablingKeyCache()):
+            self.assertTrue(self.tx.verify_signature(self.public_pem))
+
+if __name__ == '__main__':
+    unittest.main()
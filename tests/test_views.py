@@ -0,0 +1,93 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blockchain_transaction import (
+    Transaction, TransactionInput, TransactionOutput, TransactionView, TransactionStore,
+    generate_keys, generate_rsa_keys, serialize_private_key, serialize_public_key
+)
+
+class TestTransactionView(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        private_key, public_key = generate_rsa_keys()
+        cls.private_pem = serialize_private_key(private_key)
+        cls.public_pem = serialize_public_key(public_key)
+
+    def setUp(self):
+        self.tx = Transaction(inputs=[TransactionInput("prev_tx_a", 1), TransactionInput("prev_tx_b", 0)],
+                              outputs=[TransactionOutput(self.public_pem, 10.0), TransactionOutput("addr_text", 2.5)],
+                              timestamp=1678886400.0)
+        self.tx.sign(self.private_pem)
+
+    def test_view_exposes_transaction_attributes(self):
+        view = TransactionView(self.tx.to_bytes())
+        self.assertEqual(view.timestamp, self.tx.timestamp)
+        self.assertEqual(view.scheme, self.tx.scheme)
+        self.assertEqual(view.preimage_format, self.tx.preimage_format)
+        self.assertEqual(view.signature, self.tx.signature)
+        self.assertEqual([inp.outpoint for inp in view.inputs], [inp.outpoint for inp in self.tx.inputs])
+        self.assertEqual([out.amount for out in view.outputs], [out.amount for out in self.tx.outputs])
+        self.assertEqual([out.recipient_address_pubkey_pem for out in view.outputs],
+                         [out.recipient_address_pubkey_pem for out in self.tx.outputs])
+        self.assertEqual(view.outputs[0].to_output(), self.tx.outputs[0])
+        self.assertEqual(view.inputs[-1].to_input(), self.tx.inputs[-1])
+        self.assertFalse(view.is_coinbase())
+
+    def test_view_computes_tx_id_on_demand(self):
+        view = TransactionView(self.tx.to_bytes())
+        self.assertEqual(view.tx_id, self.tx.tx_id)
+        self.assertEqual(TransactionView(self.tx.to_bytes(), tx_id="stored").tx_id, "stored")
+
+    def test_to_transaction(self):
+        restored = TransactionView(memoryview(self.tx.to_bytes())).to_transaction()
+        self.assertEqual(restored.to_dict(), self.tx.to_dict())
+        self.assertTrue(restored.verify_signature(self.public_pem))
+
+    def test_view_with_integer_timestamp(self):
+        tx = Transaction(inputs=[TransactionInput("prev_tx_a", 1)],
+                         outputs=[TransactionOutput(self.public_pem, 10.0)], timestamp=1700000000)
+        tx.sign(self.private_pem)
+        view = TransactionView(tx.to_bytes())
+        self.assertIs(type(view.timestamp), int)
+        self.assertEqual(view.tx_id, tx.tx_id)
+
+    def test_view_with_scheme_and_unsigned(self):
+        _, public_key = generate_keys("ed25519")
+        tx = Transaction(inputs=[], outputs=[TransactionOutput(serialize_public_key(public_key), 1.0)],
+                         timestamp=1.0, scheme="ed25519", preimage_format="binary")
+        view = TransactionView(tx.to_bytes())
+        self.assertEqual(view.scheme, "ed25519")
+        self.assertEqual(view.preimage_format, "binary")
+        self.assertIsNone(view.signature)
+        self.assertTrue(view.is_coinbase())
+        self.assertEqual(view.tx_id, tx.tx_id)
+
+    def test_corrupted_buffer_raises_error(self):
+        data = self.tx.to_bytes()
+        view = TransactionView(data[:-10]) # Заголовок читается, тело - при обращении
+        with self.assertRaisesRegex(ValueError, "обрезаны или повреждены"):
+            view.inputs
+        with self.assertRaisesRegex(ValueError, "Лишние байты"):
+            TransactionView(data + b"\x00").outputs
+        with self.assertRaisesRegex(ValueError, "обрезаны или повреждены"):
+            TransactionView(data[:3])
+
+    def test_store_views(self):
+        with tempfile.TemporaryDirectory() as directory:
+            other = Transaction(inputs=[TransactionInput("prev_tx_c", 0)],
+                                outputs=[TransactionOutput("addr_text", 1.0)], timestamp=1.0)
+            with TransactionStore(directory) as store:
+                store.append_many([self.tx, other])
+                self.assertEqual([view.tx_id for view in store.iter_views()], [self.tx.tx_id, other.tx_id])
+                large = [view.tx_id for view in store.iter_views()
+                         if any(out.amount > 5 for out in view.outputs)]
+                self.assertEqual(large, [self.tx.tx_id])
+                self.assertEqual(store.view(other.tx_id).inputs[0].previous_tx_id, "prev_tx_c")
+                self.assertIsNone(store.view("00" * 32))
+
+if __name__ == '__main__':
+    unittest.main()